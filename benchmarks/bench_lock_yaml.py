@@ -0,0 +1,68 @@
+"""Benchmark mcp.lock.yaml parse and dump times, libyaml vs pure Python.
+
+Usage::
+
+    python benchmarks/bench_lock_yaml.py [ENTRIES ...]   # with mcpt installed (pip install -e .)
+
+Builds a lock file with the given numbers of tool records (default 1000,
+5000 and 20000) and reports the best of several runs of each backend.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import Any, Callable
+
+import yaml
+
+from mcpt.workspace.yamlio import yaml_backend
+
+REPEAT = 5
+
+
+def make_lock(entries: int) -> dict[str, Any]:
+    """A lock document shaped like the ones `mcpt install` writes."""
+    return {
+        "tools": {
+            f"tool-{i:05d}": {
+                "ref": f"v{i % 7}.{i % 13}.0",
+                "source": f"git+https://github.com/mcp-tool-shop-org/tool-{i:05d}@v1.0.0",
+                "installed_at": "2025-01-01T00:00:00+00:00",
+                "venv": f"/home/user/.venvs/tool-{i:05d}",
+                "grants": ["network", "filesystem_write"][: i % 3],
+            }
+            for i in range(entries)
+        }
+    }
+
+
+def best(fn: Callable[[], Any]) -> float:
+    """Best wall time of REPEAT runs, in milliseconds."""
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(a) for a in argv] or [1000, 5000, 20000]
+    backends = {"pure": (yaml.SafeLoader, yaml.SafeDumper), "libyaml": yaml_backend()}
+    if backends["libyaml"] == backends["pure"]:
+        print("libyaml not available (or failed the probe): only the pure-Python backend runs")
+        del backends["libyaml"]
+
+    print(f"{'entries':>8} {'backend':>8} {'bytes':>10} {'parse ms':>10} {'dump ms':>10}")
+    for n in sizes:
+        data = make_lock(n)
+        for name, (loader, dumper) in backends.items():
+            text = yaml.dump(data, Dumper=dumper, default_flow_style=False, sort_keys=False)
+            parse = best(lambda: yaml.load(text, Loader=loader))
+            dump = best(lambda: yaml.dump(data, Dumper=dumper, default_flow_style=False, sort_keys=False))
+            print(f"{n:>8} {name:>8} {len(text):>10} {parse:>10.1f} {dump:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
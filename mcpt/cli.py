@@ -10,16 +10,19 @@ from typing import Annotated, List, Optional
 
 import typer
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
 from mcpt import __version__
 from mcpt.registry import (
+    RANK_MODES,
     RegistryConfig,
+    RegistrySet,
     get_registry,
     get_registry_status,
     get_tool,
+    index_registry,
+    load_registry,
     search_tools,
+    suggest_tools,
     load_cached_artifact,
     get_featured,
     FeaturedData,
@@ -29,6 +32,8 @@ from mcpt.registry import (
 from mcpt.workspace import (
     MCP_YAML_FILENAME,
     add_tool as workspace_add_tool,
+    edit_workspace,
+    load_workspace,
     read_config,
     remove_tool as workspace_remove_tool,
     write_default,
@@ -37,38 +42,44 @@ from mcpt.workspace import (
     get_grants,
     write_lock_record,
     read_lock,
+    get_registry_config,
 )
-from mcpt.runner import generate_run_plan, stub_run
 
 app = typer.Typer(
     help="CLI for discovering and running MCP Tool Shop tools.",
     no_args_is_help=True,
 )
 
+# Results shown by `mcpt search --rank bm25` unless --limit is given
+BM25_DEFAULT_LIMIT = 20
 
-def fuzzy_match_tools(query: str, limit: int = 5) -> list[dict]:
-    """Find tools with similar names using simple fuzzy matching."""
-    from difflib import SequenceMatcher
 
-    registry = get_registry()
-    tools = registry.get("tools", [])
-    query_lower = query.lower()
+def workspace_registry() -> RegistryConfig | RegistrySet:
+    """Get the registry configured by the workspace in the current directory.
 
-    scored = []
-    for tool in tools:
-        tool_id = tool.get("id", "")
-        # Score based on: substring match, sequence similarity, starts-with
-        score = 0
-        if query_lower in tool_id.lower():
-            score += 0.5
-        if tool_id.lower().startswith(query_lower):
-            score += 0.3
-        score += SequenceMatcher(None, query_lower, tool_id.lower()).ratio() * 0.5
-        if score > 0.2:
-            scored.append((score, tool))
+    Every registry call of a command goes through this, so the workspace pin
+    (or registries list) is honored everywhere. mcp.yaml is read once per
+    process while it is unchanged.
+    """
+    return get_registry_config(Path.cwd() / MCP_YAML_FILENAME)
 
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return [t for _, t in scored[:limit]]
+
+def fuzzy_match_tools(query: str, limit: int = 5) -> list[dict]:
+    """Find tools with similar IDs or names ("did you mean")."""
+    try:
+        cfg = workspace_registry()
+        return suggest_tools(query, cfg, limit=limit, data=get_registry(cfg))
+    except Exception:
+        return []
+
+
+def print_suggestions(tool_id: str) -> None:
+    """Print "did you mean" suggestions for an unknown tool ID."""
+    similar = fuzzy_match_tools(tool_id)
+    if similar:
+        console.print("[dim]Did you mean:[/dim]")
+        for t in similar:
+            console.print(f"  [cyan]{t.get('id')}[/cyan] - {t.get('name', '')}")
 
 
 console = Console()
@@ -101,12 +112,11 @@ def main(
 # ============================================================================
 
 
-from mcpt.ui.render import render_search_table, render_tool_header
-from mcpt.ui.risk import calculate_risk_score, get_risk_tier, RISK_LEVEL_EXTREME, RISK_LEVEL_HIGH, RISK_LEVEL_MED, RISK_LEVEL_LOW
-from mcpt.ui.caps import get_cap_info, get_risk_color, RISK_CRITICAL, RISK_HIGH, RISK_MED, RISK_LOW, RISK_NONE
 from mcpt.workspace import (
     MCP_YAML_FILENAME,
     add_tool as workspace_add_tool,
+    edit_workspace,
+    load_workspace,
     read_config,
     remove_tool as workspace_remove_tool,
     write_default,
@@ -117,10 +127,12 @@ from mcpt.workspace import (
     read_lock,
     get_ui_config,
 )
-from mcpt.registry.client import get_bundle_membership
+from mcpt.registry.client import get_bundle_membership, get_tool_bundles
+from mcpt.registry.client import list_tools as registry_list_tools
 
 def render_tools(
     tools: list[dict[str, Any]], 
+    bundle_map: dict[str, list[str]],
     title: str = "Search Results", 
     deprecated: bool = False,
     plain: bool = False,
@@ -129,10 +141,11 @@ def render_tools(
     explain: bool = False,
 ) -> None:
     """Helper to render tools using unified UI."""
+    from mcpt.ui.render import render_search_table
     
     # Enrich tools with bundle info for trust calculation
-    # We do this here to keep it centralized for all lists/searches
-    bundle_map = get_bundle_membership()
+    # We do this here to keep it centralized for all lists/searches.
+    # bundle_map comes from the caller's registry (tool ID -> bundles).
     for tool in tools:
         if "id" in tool and tool["id"] in bundle_map:
             tool["_bundles"] = bundle_map[tool["id"]]
@@ -172,39 +185,25 @@ def list_tools(
         elif not sys.stdout.isatty() and not force_rich:
             plain = True
 
+    cfg = workspace_registry()
     try:
-        registry = get_registry(force_refresh=refresh)
+        tools = registry_list_tools(
+            cfg, bundle=bundle, tag=tag, include_deprecated=include_deprecated, force_refresh=refresh,
+        )
     except Exception as e:
         console.print(f"[red]Error fetching registry:[/red] {e}")
         raise typer.Exit(1)
 
-    tools = registry.get("tools", [])
-
-    # Filter deprecated
-    if not include_deprecated:
-        tools = [t for t in tools if not t.get("deprecated")]
-
-    # Filter by tag
-    if tag:
-        tools = [t for t in tools if tag.lower() in [x.lower() for x in t.get("tags", [])]]
-
-    # Filter by bundle
-    if bundle:
-        cfg = RegistryConfig()
+    # An empty bundle filter is either an unknown bundle or a missing index
+    if bundle and not tools:
         index = load_cached_artifact(cfg, "registry.index.json")
-        if index and "bundles" in index and bundle in index["bundles"]:
-            allowed = set(index["bundles"][bundle])
-            tools = [t for t in tools if t.get("id") in allowed]
-        else:
-            if index:
-                 console.print(f"[yellow]Bundle '{bundle}' not found.[/yellow]")
-            else:
-                 console.print("[yellow]Bundle index not available.[/yellow]")
-            tools = []
+        if not isinstance(index, dict) or not isinstance(index.get("bundles"), dict):
+            console.print("[yellow]Bundle index not available.[/yellow]")
+        elif bundle not in index["bundles"]:
+            console.print(f"[yellow]Bundle '{bundle}' not found.[/yellow]")
 
     # Filter by featured / collection
     if featured or collection:
-        cfg = RegistryConfig()
         f_data = get_featured(cfg)
         if f_data:
             allowed = set()
@@ -283,11 +282,12 @@ def list_tools(
     
     render_tools(
         tools, 
+        get_bundle_membership(cfg),
         title="MCP Tools", 
         deprecated=include_deprecated,
         plain=plain, 
         no_badges=no_badges or (badges_setting == "off"),
-        sigil_style=sigil_style
+        sigil_style=sigil_style,
     )
 
 
@@ -302,6 +302,7 @@ def featured(
     force_rich: Annotated[bool, typer.Option("--force-rich", help="Force rich output even if non-TTY")] = False,
 ) -> None:
     """Browse featured tools and collections."""
+    from rich.panel import Panel
     from mcpt.ui.featured import render_featured_view
     from dataclasses import asdict
     import os
@@ -314,13 +315,13 @@ def featured(
             plain = True
 
     try:
-        cfg = RegistryConfig()
+        cfg = workspace_registry()
         tools_map = {}
         
         # Load registry for tool details
         try:
             full_registry = get_registry(cfg, force_refresh=refresh)
-            tools_map = {t["id"]: t for t in full_registry.get("tools", [])}
+            tools_map = index_registry(full_registry, cfg).by_id
         except Exception as e:
             console.print(f"[yellow]Warning: Could not fetch registry: {e}[/yellow]")
 
@@ -393,10 +394,17 @@ def info(
     json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
 ) -> None:
     """Show detailed information about a tool."""
-    tool = get_tool(tool_id)
+    from rich.panel import Panel
+    from rich.table import Table
+    from mcpt.ui.caps import get_cap_info, get_risk_color, RISK_CRITICAL, RISK_HIGH, RISK_MED
+    from mcpt.ui.render import render_tool_header
+    from mcpt.ui.risk import calculate_risk_score, get_risk_tier, RISK_LEVEL_EXTREME, RISK_LEVEL_HIGH, RISK_LEVEL_MED
+    cfg = workspace_registry()
+    tool = get_tool(tool_id, cfg)
 
     if tool is None:
         console.print(f"[red]Tool not found:[/red] {tool_id}")
+        print_suggestions(tool_id)
         console.print("[dim]Stale registry? Try: mcpt list --refresh[/dim]")
         raise typer.Exit(1)
 
@@ -419,15 +427,8 @@ def info(
     table.add_column("Value")
     
     # Try to load bundle info from index
-
-    cfg = RegistryConfig()
     try:
-        index = load_cached_artifact(cfg, "registry.index.json")
-        bundles = []
-        if index and "bundles" in index:
-            for b_name, b_tools in index["bundles"].items():
-                if tool_id in b_tools:
-                    bundles.append(b_name)
+        bundles = get_tool_bundles(tool_id, cfg)
         if bundles:
              tool["_bundles"] = bundles
     except Exception:
@@ -550,6 +551,14 @@ def search(
         bool,
         typer.Option("--explain", help="Show match reasons and scores"),
     ] = False,
+    rank: Annotated[
+        str,
+        typer.Option("--rank", help="Ranking: score (match weights) or bm25 (word relevance)"),
+    ] = "score",
+    limit: Annotated[
+        Optional[int],
+        typer.Option("--limit", "-n", min=1, help=f"Show at most N results (bm25 default: {BM25_DEFAULT_LIMIT})"),
+    ] = None,
     json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
     plain: Annotated[bool, typer.Option("--plain", help="No color, no glyphs")] = False,
     no_badges: Annotated[bool, typer.Option("--no-badges", help="Hide risk badges")] = False,
@@ -557,47 +566,46 @@ def search(
 ) -> None:
     """Search for tools in the registry with ranking."""
     import os
+    if rank not in RANK_MODES:
+        console.print(f"[red]Unknown rank mode:[/red] {rank} (choose from: {', '.join(RANK_MODES)})")
+        raise typer.Exit(1)
+    if limit is None and rank == "bm25":
+        limit = BM25_DEFAULT_LIMIT
     if not plain:
         if "NO_COLOR" in os.environ:
             plain = True
         elif not sys.stdout.isatty() and not force_rich:
             plain = True
             
-    # Pre-filter for collections/featured logic
-    # search_tools doesn't support featured/collection filters natively, 
-    # but we can filter the result set or pre-filter if we pass a allow-list.
-    # search_tools signature: (query, bundle, tag) -> list[dict]
-    
-    tools = search_tools(query, bundle=bundle, tag=tag)
-
-    # Apply featured filters
+    # Featured/collection filters become an ID allow-list for search_tools,
+    # so a --limit applies after filtering
+    cfg = workspace_registry()
+    allowed = None
     if featured or collection:
-        cfg = RegistryConfig()
         f_data = get_featured(cfg)
+        allowed = set()
         if f_data:
-            allowed = set()
             if featured:
                 allowed.update(f_data.featured)
                 for s in f_data.sections:
                     if "week" in s.title.lower() or "featured" in s.title.lower():
                         allowed.update(s.tool_ids)
-            
+
             if collection:
                 if collection in f_data.collections:
                     allowed.update(f_data.collections[collection].tool_ids)
                 else:
                     console.print(f"[yellow]Collection '{collection}' not found.[/yellow]")
-                    tools = [] # Force empty results
-            
-            if allowed:
-                tools = [t for t in tools if t.get("id") in allowed]
-            elif (featured or collection):
-                # Filter requested but no criteria matched
-                tools = []
+                    allowed = set() # Force empty results
         else:
-            tools = []
             console.print("[dim]Featured data unavailable -- skipping filter results[/dim]")
 
+    if allowed is not None and not allowed:
+        # Filter requested but no criteria matched
+        tools = []
+    else:
+        tools = search_tools(query, cfg, bundle=bundle, tag=tag, rank=rank, limit=limit, ids=allowed)
+
     if json_output:
         # Strip internal fields unless specifically requested, but for now output clean tools
         clean_tools = [{k: v for k, v in t.items() if not k.startswith("_")} for t in tools]
@@ -617,6 +625,7 @@ def search(
 
     render_tools(
         tools,
+        get_bundle_membership(cfg),
         title=f"Search Results: {query}" if query else "Search Results",
         plain=plain,
         no_badges=no_badges or (badges_setting == "off"),
@@ -631,7 +640,8 @@ def bundles(
     json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
 ) -> None:
     """List available tool bundles."""
-    cfg = RegistryConfig()
+    from rich.table import Table
+    cfg = workspace_registry()
     try:
         index = load_cached_artifact(cfg, "registry.index.json")
     except Exception:
@@ -667,7 +677,8 @@ def facets(
     json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
 ) -> None:
     """Show registry facets and statistics."""
-    cfg = RegistryConfig()
+    from rich.panel import Panel
+    cfg = workspace_registry()
     try:
         report = load_cached_artifact(cfg, "registry.report.json")
     except Exception:
@@ -737,17 +748,63 @@ def init(
     console.print(f"[green]Created[/green] {config_path}")
 
 
+def _read_id_file(file: Path) -> list[str]:
+    """Read tool IDs from a file: one per line, blank lines and # comments ignored."""
+    try:
+        text = file.read_text(encoding="utf-8")
+    except OSError as e:
+        console.print(f"[red]Cannot read {file}:[/red] {e}")
+        raise typer.Exit(1)
+    return [line.split("#", 1)[0].strip() for line in text.splitlines() if line.split("#", 1)[0].strip()]
+
+
+def _collect_tool_ids(
+    tool_ids: Optional[list[str]],
+    from_file: Optional[Path],
+    cfg: RegistryConfig | RegistrySet,
+    bundle: Optional[str] = None,
+    collection: Optional[str] = None,
+) -> list[str]:
+    """Gather the tool IDs a bulk command was given, in order, without duplicates."""
+    ids = list(tool_ids or [])
+    if from_file is not None:
+        ids.extend(_read_id_file(from_file))
+    if bundle is not None:
+        members = load_registry(cfg).ids_in_bundle(bundle)
+        if members is None:
+            console.print(f"[red]Bundle not found:[/red] {bundle}")
+            raise typer.Exit(1)
+        ids.extend(members)
+    if collection is not None:
+        f_data = get_featured(cfg)
+        coll = f_data.collections.get(collection) if f_data else None
+        if coll is None:
+            console.print(f"[red]Collection not found:[/red] {collection}")
+            raise typer.Exit(1)
+        ids.extend(coll.tool_ids)
+    return list(dict.fromkeys(ids))
+
+
 @app.command()
 def add(
-    tool_id: Annotated[str, typer.Argument(help="Tool ID to add")],
-    ref: Annotated[Optional[str], typer.Option("--ref", help="Git ref to use")] = None,
+    tool_ids: Annotated[Optional[list[str]], typer.Argument(help="Tool IDs to add")] = None,
+    ref: Annotated[Optional[str], typer.Option("--ref", help="Git ref to use (one tool only)")] = None,
     path: Annotated[
         Optional[Path],
         typer.Option("--path", "-p", help="Path to mcp.yaml"),
     ] = None,
+    from_file: Annotated[
+        Optional[Path],
+        typer.Option("--from-file", help="Read tool IDs from a file (one per line)"),
+    ] = None,
+    bundle: Annotated[Optional[str], typer.Option("--bundle", help="Add every tool in a bundle")] = None,
+    collection: Annotated[
+        Optional[str],
+        typer.Option("--collection", help="Add every tool in a featured collection"),
+    ] = None,
     allow_deprecated: Annotated[bool, typer.Option("--allow-deprecated", help="Allow adding deprecated tools")] = False,
 ) -> None:
-    """Add a tool to the workspace configuration."""
+    """Add one or more tools to the workspace configuration."""
     if path is None:
         path = Path.cwd() / MCP_YAML_FILENAME
 
@@ -755,57 +812,79 @@ def add(
         console.print(f"[red]{MCP_YAML_FILENAME} not found.[/red] Run 'mcpt init' first.")
         raise typer.Exit(1)
 
-    # Verify tool exists in registry
-    tool = get_tool(tool_id)
-    if tool is None:
-        console.print(f"[red]Tool not found in registry:[/red] {tool_id}")
-        # Show fuzzy matches
-        similar = fuzzy_match_tools(tool_id)
-        if similar:
-            console.print("[dim]Did you mean:[/dim]")
-            for t in similar:
-                console.print(f"  [cyan]{t.get('id')}[/cyan] - {t.get('name', '')}")
+    cfg = get_registry_config(path)
+    ids = _collect_tool_ids(tool_ids, from_file, cfg, bundle, collection)
+    if not ids:
+        console.print("[red]No tools given.[/red] Pass tool IDs, --from-file, --bundle or --collection.")
+        raise typer.Exit(1)
+    if ref and len(ids) > 1:
+        console.print("[red]--ref can only be used when adding a single tool.[/red]")
+        raise typer.Exit(1)
+
+    # Verify every tool exists in registry, against one load of it
+    if len(ids) == 1:
+        tools = {ids[0]: get_tool(ids[0], cfg)}
+    else:
+        reg = load_registry(cfg)
+        tools = {tool_id: reg.get(tool_id) for tool_id in ids}
+    missing = [tool_id for tool_id, tool in tools.items() if tool is None]
+    if missing:
+        console.print(f"[red]Tool not found in registry:[/red] {', '.join(missing)}")
+        if len(missing) == 1:
+            print_suggestions(missing[0])
         console.print("[dim]Stale registry? Try: mcpt list --refresh[/dim]")
         raise typer.Exit(1)
 
     # Check deprecation
-    if tool.get("deprecated"):
+    deprecated = [tool_id for tool_id, tool in tools.items() if tool.get("deprecated")]
+    for tool_id in deprecated:
         console.print(f"[bold red]Warning: {tool_id} is deprecated[/bold red]")
-        if tool.get("deprecation_reason"):
-            console.print(f"[dim]{tool.get('deprecation_reason')}[/dim]")
-        
-        if not allow_deprecated:
-            if not typer.confirm("Do you want to continue adding this tool?"):
-                 console.print("[red]Aborted.[/red]")
-                 raise typer.Exit(1)
-                 
+        if tools[tool_id].get("deprecation_reason"):
+            console.print(f"[dim]{tools[tool_id].get('deprecation_reason')}[/dim]")
+    if deprecated and not allow_deprecated:
+        noun = "this tool" if len(ids) == 1 else "these tools"
+        if not typer.confirm(f"Do you want to continue adding {noun}?"):
+            console.print("[red]Aborted.[/red]")
+            raise typer.Exit(1)
+
     # Warn about capabilities
-    needed = tool.get("capabilities", [])
-    if needed:
-        console.print(f"[yellow]Note: {tool_id} requires the following capabilities to run:[/yellow]")
-        for cap in needed:
-            console.print(f"  - {cap}")
-        console.print("You can grant these later with 'mcpt grant'")
-
-    if workspace_add_tool(path, tool_id, ref):
-        console.print(f"[green]Added[/green] {tool_id} to {path}")
-        # Show capability hints if tool has side effects
-        defaults = tool.get("defaults", {})
-        if not defaults.get("safe_run", True):
-            console.print("[dim]Note: This tool has side effects. Check its documentation for capability env vars.[/dim]")
-    else:
-        console.print(f"[yellow]{tool_id} already in workspace.[/yellow]")
+    for tool_id, tool in tools.items():
+        needed = tool.get("capabilities", [])
+        if needed:
+            console.print(f"[yellow]Note: {tool_id} requires the following capabilities to run:[/yellow]")
+            for cap in needed:
+                console.print(f"  - {cap}")
+    if any(tool.get("capabilities") for tool in tools.values()):
+        console.print("You can grant these later with 'mcpt grant' (or 'mcpt grant --all-required')")
+
+    # One write for every tool
+    with edit_workspace(path) as ws:
+        added = {tool_id for tool_id in ids if ws.add_tool(tool_id, ref)}
+
+    for tool_id, tool in tools.items():
+        if tool_id in added:
+            console.print(f"[green]Added[/green] {tool_id} to {path}")
+            # Show capability hints if tool has side effects
+            defaults = tool.get("defaults", {})
+            if not defaults.get("safe_run", True):
+                console.print(f"[dim]Note: {tool_id} has side effects. Check its documentation for capability env vars.[/dim]")
+        else:
+            console.print(f"[yellow]{tool_id} already in workspace.[/yellow]")
 
 
 @app.command()
 def remove(
-    tool_id: Annotated[str, typer.Argument(help="Tool ID to remove")],
+    tool_ids: Annotated[Optional[list[str]], typer.Argument(help="Tool IDs to remove")] = None,
     path: Annotated[
         Optional[Path],
         typer.Option("--path", "-p", help="Path to mcp.yaml"),
     ] = None,
+    from_file: Annotated[
+        Optional[Path],
+        typer.Option("--from-file", help="Read tool IDs from a file (one per line)"),
+    ] = None,
 ) -> None:
-    """Remove a tool from the workspace configuration."""
+    """Remove one or more tools from the workspace configuration."""
     if path is None:
         path = Path.cwd() / MCP_YAML_FILENAME
 
@@ -813,46 +892,108 @@ def remove(
         console.print(f"[red]{MCP_YAML_FILENAME} not found.[/red]")
         raise typer.Exit(1)
 
-    if workspace_remove_tool(path, tool_id):
-        console.print(f"[green]Removed[/green] {tool_id} from {path}")
-    else:
-        console.print(f"[yellow]{tool_id} not found in workspace.[/yellow]")
+    ids = list(dict.fromkeys([*(tool_ids or []), *(_read_id_file(from_file) if from_file else [])]))
+    if not ids:
+        console.print("[red]No tools given.[/red] Pass tool IDs or --from-file.")
+        raise typer.Exit(1)
+
+    with edit_workspace(path) as ws:
+        removed = {tool_id for tool_id in ids if ws.remove_tool(tool_id)}
+    for tool_id in ids:
+        if tool_id in removed:
+            console.print(f"[green]Removed[/green] {tool_id} from {path}")
+        else:
+            console.print(f"[yellow]{tool_id} not found in workspace.[/yellow]")
 
 
 @app.command()
 def grant(
-    tool_id: Annotated[str, typer.Argument(help="Tool ID")],
-    capability: Annotated[str, typer.Argument(help="Capability to grant (e.g. network, filesystem_write)")],
+    tool_id: Annotated[Optional[str], typer.Argument(help="Tool ID (optional with --all-required)")] = None,
+    capabilities: Annotated[
+        Optional[list[str]],
+        typer.Argument(help="Capabilities to grant (e.g. network filesystem_write)"),
+    ] = None,
+    all_required: Annotated[
+        bool,
+        typer.Option("--all-required", help="Grant the capabilities the registry lists for the tool (or every tool)"),
+    ] = False,
     path: Annotated[
         Optional[Path],
         typer.Option("--path", "-p", help="Path to mcp.yaml"),
     ] = None,
 ) -> None:
-    """Grant a capability to a tool."""
+    """Grant one or more capabilities to a tool."""
     if path is None:
         path = Path.cwd() / MCP_YAML_FILENAME
     
     if not path.exists():
         console.print(f"[red]{MCP_YAML_FILENAME} not found.[/red]")
         raise typer.Exit(1)
-        
-    if grant_capability(path, tool_id, capability):
-        console.print(f"[green]Granted[/green] {capability} to {tool_id}")
+
+    if all_required:
+        if capabilities:
+            console.print("[red]Pass either capabilities or --all-required, not both.[/red]")
+            raise typer.Exit(1)
+        _grant_all_required(path, tool_id)
+        return
+
+    if tool_id is None or not capabilities:
+        console.print("[red]Missing capabilities.[/red] Usage: mcpt grant <tool> <cap>... (or --all-required)")
+        raise typer.Exit(1)
+
+    # One write for every capability
+    with edit_workspace(path) as ws:
+        found = tool_id in ws
+        for cap in capabilities:
+            ws.grant(tool_id, cap)
+    if found:
+        console.print(f"[green]Granted[/green] {', '.join(capabilities)} to {tool_id}")
     else:
         console.print(f"[red]Failed:[/red] Tool {tool_id} not found in workspace.")
         raise typer.Exit(1)
 
 
+def _grant_all_required(path: Path, tool_id: Optional[str]) -> None:
+    """Grant every tool (or just ``tool_id``) the capabilities the registry lists for it."""
+    reg = load_registry(get_registry_config(path))
+    granted: dict[str, list[str]] = {}
+    unknown: list[str] = []
+
+    # One registry load and one write for every tool
+    with edit_workspace(path) as ws:
+        if tool_id is not None and tool_id not in ws:
+            console.print(f"[red]Failed:[/red] Tool {tool_id} not found in workspace.")
+            raise typer.Exit(1)
+        targets = [tool_id] if tool_id is not None else ws.tool_ids
+        for target in targets:
+            tool = reg.get(target)
+            if tool is None:
+                unknown.append(target)
+                continue
+            new = [cap for cap in tool.get("capabilities", []) if cap not in ws.grants(target)]
+            for cap in new:
+                ws.grant(target, cap)
+            if new:
+                granted[target] = new
+
+    for target, caps in granted.items():
+        console.print(f"[green]Granted[/green] {', '.join(caps)} to {target}")
+    for target in unknown:
+        console.print(f"[yellow]Skipped {target}:[/yellow] not found in registry.")
+    if not granted:
+        console.print("[dim]No change: every required capability is already granted.[/dim]")
+
+
 @app.command()
 def revoke(
     tool_id: Annotated[str, typer.Argument(help="Tool ID")],
-    capability: Annotated[str, typer.Argument(help="Capability to revoke")],
+    capabilities: Annotated[list[str], typer.Argument(help="Capabilities to revoke")],
     path: Annotated[
         Optional[Path],
         typer.Option("--path", "-p", help="Path to mcp.yaml"),
     ] = None,
 ) -> None:
-    """Revoke a capability from a tool."""
+    """Revoke one or more capabilities from a tool."""
     if path is None:
         path = Path.cwd() / MCP_YAML_FILENAME
     
@@ -860,8 +1001,10 @@ def revoke(
         console.print(f"[red]{MCP_YAML_FILENAME} not found.[/red]")
         raise typer.Exit(1)
         
-    if revoke_capability(path, tool_id, capability):
-        console.print(f"[green]Revoked[/green] {capability} from {tool_id}")
+    with edit_workspace(path) as ws:
+        revoked = [cap for cap in capabilities if ws.revoke(tool_id, cap)]
+    if revoked:
+        console.print(f"[green]Revoked[/green] {', '.join(revoked)} from {tool_id}")
     else:
         console.print(f"[yellow]No change:[/yellow] Capability not found or tool missing.")
 
@@ -882,10 +1025,12 @@ def install(
     allow_deprecated: Annotated[bool, typer.Option("--allow-deprecated", help="Allow installing deprecated tools")] = False,
 ) -> None:
     """Install a tool via git into a virtual environment."""
-    tool = get_tool(tool_id)
+    cfg = workspace_registry()
+    tool = get_tool(tool_id, cfg)
 
     if tool is None:
         console.print(f"[red]Tool not found:[/red] {tool_id}")
+        print_suggestions(tool_id)
         raise typer.Exit(1)
         
     # Check deprecation
@@ -971,14 +1116,18 @@ def run(
     dry_run: Annotated[bool, typer.Option("--dry-run", help="Print plan but do not execute")] = False,
 ) -> None:
     """Run a tool (stub by default)."""
+    from rich.panel import Panel
+    from mcpt.runner import generate_run_plan, stub_run
     # Backwards compatibility for --real
     if real and mode == "stub":
         mode = "restricted"
 
-    tool = get_tool(tool_id)
+    cfg = workspace_registry()
+    tool = get_tool(tool_id, cfg)
 
     if tool is None:
         console.print(f"[red]Tool not found:[/red] {tool_id}")
+        print_suggestions(tool_id)
         raise typer.Exit(1)
         
     # Execution checks for non-stub modes
@@ -1039,19 +1188,30 @@ def run(
 # ============================================================================
 
 
-@app.command()
+registry_app = typer.Typer(help="Show registry status and manage offline bundles.")
+app.add_typer(registry_app, name="registry")
+
+
+@registry_app.callback(invoke_without_command=True)
 def registry(
+    ctx: typer.Context,
     json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
 ) -> None:
     """Show detailed registry status and provenance."""
-    status = get_registry_status()
-    dist = status.cache_path.parent / "dist"
-    
+    if ctx.invoked_subcommand is not None:
+        return
+    from datetime import datetime
+    from rich.panel import Panel
+    from mcpt.registry.client import cached_artifact_path
+
+    cfg = workspace_registry()
+    status = get_registry_status(cfg)
+
     artifacts = {
-        "index": (dist / "registry.index.json").exists(),
-        "capabilities": (dist / "capabilities.json").exists(),
-        "report": (dist / "registry.report.json").exists(),
-        "llms": (dist / "registry.llms.txt").exists(),
+        "index": cached_artifact_path(cfg, "registry.index.json") is not None,
+        "capabilities": cached_artifact_path(cfg, "capabilities.json") is not None,
+        "report": cached_artifact_path(cfg, "registry.report.json") is not None,
+        "llms": cached_artifact_path(cfg, "registry.llms.txt") is not None,
     }
     
     if json_output:
@@ -1062,17 +1222,42 @@ def registry(
             "artifacts": artifacts,
             "tool_count": status.tool_count,
             "last_fetched": status.cache_mtime.isoformat() if status.cache_mtime else None,
+            "freshness": {
+                "checked_at": status.checked_at.isoformat() if status.checked_at else None,
+                "age_seconds": (
+                    round((datetime.now() - status.checked_at).total_seconds())
+                    if status.checked_at else None
+                ),
+                "max_age_seconds": status.max_age,
+                "stale": status.stale,
+                "revalidating": status.revalidating,
+            },
         }
+        if status.members:
+            out["registries"] = [
+                {"source": m.source, "ref": m.ref, "cache_path": str(m.cache_path), "tool_count": m.tool_count}
+                for m in status.members
+            ]
         console.print(json.dumps(out, indent=2))
         return
 
     console.print(Panel(f"[bold cyan]MCP Tool Registry[/bold cyan]", subtitle=f"Ref: {status.ref}"))
     console.print(f"  [bold]Source:[/bold] {status.source}")
     console.print(f"  [bold]Tools:[/bold]  {status.tool_count}")
+    for m in status.members:
+        console.print(f"    [dim]{m.source} @ {m.ref}:[/dim] {m.tool_count} tools")
     if status.cache_mtime:
         console.print(f"  [bold]Cached:[/bold] {status.cache_mtime.strftime('%Y-%m-%d %H:%M:%S')}")
     else:
         console.print("  [bold]Cached:[/bold] [yellow]Never[/yellow]")
+    if status.checked_at:
+        if status.revalidating:
+            state = "[yellow]refreshing in background[/yellow]"
+        elif status.stale:
+            state = "[yellow]stale, refreshed on next use[/yellow]"
+        else:
+            state = "[green]fresh[/green]"
+        console.print(f"  [bold]Checked:[/bold] {status.checked_at.strftime('%Y-%m-%d %H:%M:%S')} ({state})")
         
     console.print("\n[bold]Artifacts[/bold]")
     for art, exists in artifacts.items():
@@ -1080,18 +1265,60 @@ def registry(
         console.print(f"  {state} {art}")
 
 
+@registry_app.command("export")
+def registry_export(
+    file: Annotated[Path, typer.Argument(help="Bundle to write (.tar.gz; .tar.xz or .tar.bz2 by suffix)")],
+) -> None:
+    """Export the cached registry, dist artifacts and indexes as one offline bundle."""
+    from mcpt.registry import RegistryFetchError
+    from mcpt.registry.bundle import export_bundle
+
+    try:
+        configs = export_bundle(workspace_registry(), file)
+    except (RegistryFetchError, OSError) as e:
+        console.print(f"[red]Export failed:[/red] {e}")
+        raise typer.Exit(1)
+    console.print(
+        f"[green]Exported[/green] {len(configs)} registry cache(s) to {file} "
+        f"({_format_size(file.stat().st_size)})"
+    )
+
+
+@registry_app.command("import")
+def registry_import(
+    file: Annotated[Path, typer.Argument(help="Bundle written by `mcpt registry export`")],
+) -> None:
+    """Import an offline bundle into the registry cache (no network needed)."""
+    from mcpt.registry.bundle import import_bundle
+
+    try:
+        configs = import_bundle(file)
+    except (ValueError, OSError) as e:
+        console.print(f"[red]Import failed:[/red] {e}")
+        raise typer.Exit(1)
+    for cfg in configs:
+        if isinstance(cfg, RegistrySet):
+            console.print(f"[green]Imported[/green] merged view of {len(cfg.members)} registries")
+        else:
+            console.print(f"[green]Imported[/green] {cfg.source} @ {cfg.ref}")
+
+
 @app.command()
 def check(
     tool_id: Annotated[str, typer.Argument(help="Tool ID to check")],
     json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
 ) -> None:
     """Pre-flight check for tool execution."""
-    tool = get_tool(tool_id)
+    from rich.panel import Panel
+    from mcpt.ui.caps import get_cap_info, RISK_CRITICAL, RISK_HIGH, RISK_MED
+    from mcpt.ui.risk import calculate_risk_score, get_risk_tier, RISK_LEVEL_EXTREME, RISK_LEVEL_HIGH
+    tool = get_tool(tool_id, workspace_registry())
     if not tool:
         if json_output:
              console.print(json.dumps({"error": "Tool not found"}, indent=2))
         else:
              console.print(f"[red]Tool not found:[/red] {tool_id}")
+             print_suggestions(tool_id)
         raise typer.Exit(1)
         
     path = Path.cwd() / MCP_YAML_FILENAME
@@ -1126,14 +1353,7 @@ def check(
     lock_data = read_lock(path)
     installed_record = lock_data.get("tools", {}).get(tool_id)
     
-    config = read_config(path) if workspace_exists else {}
-    tools_list = config.get("tools", [])
-    is_added = False
-    for t in tools_list:
-        if isinstance(t, str) and t == tool_id:
-            is_added = True
-        elif isinstance(t, dict) and t.get("id") == tool_id:
-            is_added = True
+    is_added = workspace_exists and tool_id in load_workspace(path)
     
     checks["added_to_workspace"] = is_added
     checks["installed"] = bool(installed_record)
@@ -1208,6 +1428,95 @@ def check(
         raise typer.Exit(1)
 
 
+@app.command()
+def serve(
+    socket_file: Annotated[
+        Optional[Path],
+        typer.Option("--socket", help="Socket path (default: mcpt.sock in the user cache dir)"),
+    ] = None,
+) -> None:
+    """Keep the registry warm in a local server for fast lookups.
+
+    Runs until interrupted. While it is up, info, check, install, run and
+    search answer through it; set MCPT_NO_DAEMON=1 to bypass it.
+    """
+    from mcpt import daemon
+
+    try:
+        server = daemon.create_server(socket_file)
+    except daemon.DaemonError as e:
+        console.print(f"[red]Cannot start server:[/red] {e}")
+        raise typer.Exit(1)
+
+    try:
+        count = daemon.warm(workspace_registry())
+        console.print(f"[green]Serving[/green] {count} tools on {server.path} (Ctrl+C to stop)")
+    except Exception as e:
+        console.print(f"[yellow]Registry not loaded yet:[/yellow] {e}")
+        console.print(f"[green]Serving[/green] on {server.path} (Ctrl+C to stop)")
+
+    daemon.serve_until_stopped(server)
+
+
+cache_app = typer.Typer(help="Manage the local registry cache.", no_args_is_help=True)
+app.add_typer(cache_app, name="cache")
+
+
+def _format_size(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+@cache_app.command("gc")
+def cache_gc(
+    max_size: Annotated[
+        Optional[str],
+        typer.Option(
+            "--max-size",
+            help="Evict least recently used refs above this size, e.g. 500M or 2G "
+            "(default: MCPT_CACHE_MAX_SIZE or 256M)",
+        ),
+    ] = None,
+    json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
+) -> None:
+    """Remove unused cache objects and keep the cache under a size cap."""
+    import os
+    from mcpt.registry.client import cache_root
+    from mcpt.registry.store import DEFAULT_MAX_SIZE, collect_garbage, parse_size
+
+    setting = max_size or os.environ.get("MCPT_CACHE_MAX_SIZE")
+    try:
+        limit = parse_size(setting) if setting else DEFAULT_MAX_SIZE
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+    root = cache_root()
+    result = collect_garbage(root, limit)
+
+    if json_output:
+        out = {
+            "size_before": result.size_before,
+            "size_after": result.size_after,
+            "max_size": limit,
+            "removed_objects": result.removed_objects,
+            "removed_refs": [str(p.relative_to(root)) for p in result.removed_refs],
+        }
+        console.print(json.dumps(out, indent=2))
+        return
+
+    console.print(
+        f"Cache: {_format_size(result.size_before)} -> {_format_size(result.size_after)} "
+        f"(cap {_format_size(limit)})"
+    )
+    console.print(f"  Removed {result.removed_objects} unused objects")
+    for p in result.removed_refs:
+        console.print(f"  [yellow]Evicted[/yellow] {p.relative_to(root)}")
+
+
 @app.command()
 def doctor() -> None:
     """Check MCPT CLI configuration and connectivity."""
@@ -1221,10 +1530,12 @@ def doctor() -> None:
     # Registry provenance
     console.print()
     console.print("[bold]Registry Status[/bold]")
-    status = get_registry_status()
+    cfg = workspace_registry()
+    status = get_registry_status(cfg)
+    refs = [m.ref for m in status.members] or [status.ref]
     console.print(f"  [dim]Source:[/dim] {status.source}")
     console.print(f"  [dim]Ref:[/dim] {status.ref}")
-    if status.ref == "main":
+    if "main" in refs:
         console.print("  [yellow]Tip:[/yellow] Pin to a tagged release (e.g., v0.3.0) for reproducibility.")
     console.print(f"  [dim]Cache:[/dim] {status.cache_path}")
 
@@ -1245,7 +1556,7 @@ def doctor() -> None:
     console.print()
     console.print("[dim]Checking remote connectivity...[/dim]")
     try:
-        registry = get_registry(force_refresh=True)
+        registry = get_registry(cfg, force_refresh=True)
         tool_count = len(registry.get("tools", []))
         console.print(f"[green]Remote OK[/green] - {tool_count} tools fetched")
     except Exception as e:
@@ -1258,13 +1569,10 @@ def doctor() -> None:
     config_path = Path.cwd() / MCP_YAML_FILENAME
     workspace_exists = config_path.exists()
     workspace_tools = 0
-    workspace_ref = None
 
     if workspace_exists:
         try:
-            config = read_config(config_path)
-            workspace_tools = len(config.get("tools", []))
-            workspace_ref = config.get("registry", {}).get("ref")
+            workspace_tools = len(load_workspace(config_path).tools)
             console.print(f"[green]Workspace OK[/green] - {workspace_tools} tools configured")
         except Exception as e:
             console.print(f"[yellow]Workspace config error:[/yellow] {e}")
@@ -1281,7 +1589,7 @@ def doctor() -> None:
     elif workspace_tools == 0:
         next_steps.append("Run [cyan]mcpt add <tool-id>[/cyan] to add a tool")
 
-    if workspace_ref == "main":
+    if workspace_exists and "main" in refs:
         next_steps.append("Edit mcp.yaml to pin [cyan]ref: v0.3.0[/cyan] for reproducibility")
 
     if not status.cache_exists:
@@ -0,0 +1,245 @@
+"""Background server that keeps the registry warm between mcpt invocations.
+
+``mcpt serve`` listens on a Unix socket in the user cache directory and answers
+newline-delimited JSON-RPC 2.0 requests:
+
+    ping     -> {"pid", "version"}
+    info     {"tool_id"} -> tool record or null
+    search   {"query", "bundle", "tag", "rank", "limit", "ids"} -> ranked tools
+    list     {"bundle", "tag", "include_deprecated"} -> tools
+
+Every request may also carry "source" and "ref" to select the registry, or
+"registries" (a list of [source, ref] pairs, highest priority first) to select
+a federated view.
+
+The server answers from the same in-process caches the CLI uses, so the
+registry, its indexes and the dist artifacts are parsed once and reloaded only
+when their files change on disk.
+
+While a daemon is running, get_tool and search_tools (and so ``mcpt info``,
+``check``, ``install``, ``run`` and ``search``) send their lookups to it. Any
+failure falls back to answering locally. Set MCPT_NO_DAEMON=1 to bypass it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from platformdirs import user_cache_dir
+
+SOCKET_FILENAME = "mcpt.sock"
+
+# Client-side bound on one round trip (seconds)
+CALL_TIMEOUT = 2.0
+
+# Requests handled by the daemon must not be forwarded back to it
+_local = threading.local()
+
+
+class DaemonError(Exception):
+    """The daemon could not be reached or returned an error."""
+
+
+def socket_path() -> Path:
+    """Get the path of the daemon's Unix socket."""
+    override = os.environ.get("MCPT_SOCKET")
+    if override:
+        return Path(override)
+    return Path(user_cache_dir("mcp", "mcp-tool-shop")) / SOCKET_FILENAME
+
+
+def enabled() -> bool:
+    """Whether lookups should be offered to a running daemon."""
+    if getattr(_local, "serving", False) or os.environ.get("MCPT_NO_DAEMON"):
+        return False
+    return hasattr(socket, "AF_UNIX") and socket_path().exists()
+
+
+def call(method: str, params: dict[str, Any] | None = None, timeout: float = CALL_TIMEOUT) -> Any:
+    """Send one request to the daemon and return its result.
+
+    Raises DaemonError if no daemon answers or the request fails.
+    """
+    request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path()))
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except (OSError, ValueError) as e:
+        raise DaemonError(f"Daemon unavailable: {e}") from e
+    try:
+        response = json.loads(line)
+    except ValueError as e:
+        raise DaemonError("Malformed daemon response") from e
+    if "error" in response:
+        raise DaemonError(response["error"].get("message", "Daemon error"))
+    return response.get("result")
+
+
+def _cfg(params: dict[str, Any]):
+    from mcpt.registry.client import _config_from_target
+
+    return _config_from_target(params)
+
+
+def _ping(params: dict[str, Any]) -> dict[str, Any]:
+    from mcpt import __version__
+
+    return {"pid": os.getpid(), "version": __version__}
+
+
+def _info(params: dict[str, Any]) -> dict[str, Any] | None:
+    from mcpt.registry.client import get_tool
+
+    return get_tool(params["tool_id"], _cfg(params))
+
+
+def _search(params: dict[str, Any]) -> list[dict[str, Any]]:
+    from mcpt.registry.client import search_tools
+
+    return search_tools(
+        params.get("query", ""),
+        _cfg(params),
+        bundle=params.get("bundle"),
+        tag=params.get("tag"),
+        rank=params.get("rank", "score"),
+        limit=params.get("limit"),
+        ids=params.get("ids"),
+    )
+
+
+def _list(params: dict[str, Any]) -> list[dict[str, Any]]:
+    from mcpt.registry.client import list_tools
+
+    return list_tools(
+        _cfg(params),
+        bundle=params.get("bundle"),
+        tag=params.get("tag"),
+        include_deprecated=params.get("include_deprecated", False),
+    )
+
+
+METHODS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    "ping": _ping,
+    "info": _info,
+    "search": _search,
+    "list": _list,
+}
+
+
+def handle_request(line: bytes) -> dict[str, Any]:
+    """Answer one JSON-RPC request line."""
+    try:
+        request = json.loads(line)
+        method = request["method"]
+        params = request.get("params") or {}
+    except (ValueError, KeyError, TypeError):
+        return {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}}
+
+    rid = request.get("id")
+    handler = METHODS.get(method)
+    if handler is None:
+        return {"jsonrpc": "2.0", "id": rid, "error": {"code": -32601, "message": f"Unknown method: {method}"}}
+    try:
+        result = handler(params)
+    except Exception as e:
+        return {"jsonrpc": "2.0", "id": rid, "error": {"code": -32000, "message": str(e)}}
+    return {"jsonrpc": "2.0", "id": rid, "result": result}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        _local.serving = True
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            # The registry caches are shared; answer one request at a time
+            with self.server.dispatch_lock:
+                response = handle_request(line)
+            try:
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # The client gave up (e.g. its call timed out)
+                return
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded JSON-RPC server on a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.dispatch_lock = threading.Lock()
+        super().__init__(str(self.path), _Handler)
+        os.chmod(self.path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+def create_server(path: Path | None = None) -> DaemonServer:
+    """Bind the daemon socket, replacing a stale one left by a dead daemon.
+
+    Raises DaemonError if another daemon is already answering on it.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonError("mcpt serve needs Unix domain sockets")
+    path = Path(path) if path is not None else socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()
+        else:
+            raise DaemonError(f"A daemon is already running on {path}")
+        finally:
+            probe.close()
+    return DaemonServer(path)
+
+
+def serve_until_stopped(server: DaemonServer) -> None:
+    """Serve until interrupted (Ctrl+C or SIGTERM), then remove the socket."""
+
+    def _stop(signum, frame):
+        raise KeyboardInterrupt
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, _stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def warm(cfg=None) -> int:
+    """Load the registry and its indexes so the first request is fast.
+
+    Returns the number of tools loaded.
+    """
+    from mcpt.registry.client import load_registry, search_tools
+    from mcpt.registry.featured import get_featured
+
+    reg = load_registry(cfg)
+    search_tools("mcp", cfg, limit=1)
+    get_featured(cfg)
+    return len(reg)
@@ -0,0 +1,197 @@
+"""Crash-safe file writes and cross-process advisory locks."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from platformdirs import user_cache_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking degrades to a no-op
+    fcntl = None
+
+# Default bounded wait for a lock (seconds)
+LOCK_TIMEOUT = 10.0
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` atomically.
+
+    The bytes go to a temp file in the same directory, are fsynced, and the
+    temp file is renamed over ``path`` with ``os.replace``. Readers (including
+    other processes) see either the old or the new content, never a partial
+    file.
+    """
+    tmp = write_temp(path, (data,))
+    try:
+        replace_atomic(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_temp(path: Path, chunks: Iterable[bytes]) -> Path:
+    """Write ``chunks`` to a fsynced temp file next to ``path``.
+
+    For content that arrives in pieces (a download): nothing is held in
+    memory. Publish the file with replace_atomic; the caller deletes it
+    otherwise. A failure while writing removes the temp file.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return Path(tmp)
+
+
+def replace_atomic(tmp: Path, path: Path) -> None:
+    """Rename a temp file written by write_temp over ``path``.
+
+    ``path`` keeps its permissions if it exists.
+    """
+    path = Path(path)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except OSError:
+        mode = 0o644
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+    _fsync_dir(path.parent)
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    """Write ``text`` to ``path`` atomically (see atomic_write_bytes)."""
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename by syncing its directory (POSIX only, best effort)."""
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class LockTimeout(TimeoutError):
+    """A file lock could not be acquired within the allowed wait."""
+
+
+# Locks held by each thread: key -> [exclusive, depth]. Nested acquisitions of
+# a lock the thread already holds are granted without touching the OS lock.
+# Other threads open their own descriptor, and flock arbitrates between
+# descriptors of one process just as it does between processes.
+_local = threading.local()
+
+
+def _held() -> dict[str, list]:
+    held = getattr(_local, "held", None)
+    if held is None:
+        held = _local.held = {}
+    return held
+
+
+def lock_path(path: Path) -> Path:
+    """Get the lock file guarding ``path``.
+
+    Lock files live in a shared directory under the user cache rather than next
+    to the file, so workspaces are not littered with them, and they survive the
+    rename that atomic writes perform on the file itself.
+    """
+    resolved = str(Path(path).resolve())
+    digest = hashlib.sha256(resolved.encode("utf-8")).hexdigest()[:16]
+    base = Path(user_cache_dir("mcp", "mcp-tool-shop")) / "locks"
+    return base / f"{Path(path).name}-{digest}.lock"
+
+
+@contextmanager
+def file_lock(
+    path: Path,
+    shared: bool = False,
+    timeout: float | None = LOCK_TIMEOUT,
+) -> Iterator[None]:
+    """Hold an advisory lock on ``path`` for the duration of the block.
+
+    Shared locks are for readers and do not block each other; an exclusive lock
+    is for writers and waits for every other holder. Waits are bounded by
+    ``timeout`` (None waits forever) and raise LockTimeout when exceeded.
+
+    Locks are reentrant within a thread; threads of one process exclude each
+    other like separate processes do. Taking an exclusive lock while only
+    holding a shared one is not supported and will wait for the timeout.
+    Uses fcntl.flock; on platforms without fcntl this is a no-op.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    lp = lock_path(path)
+    key = str(lp)
+    held = _held()
+    entry = held.get(key)
+    if entry is not None and (entry[0] or shared):
+        entry[1] += 1
+        try:
+            yield
+        finally:
+            entry[1] -= 1
+        return
+
+    lp.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lp, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _acquire(fd, shared, timeout, path)
+        held[key] = [not shared, 1]
+        try:
+            yield
+        finally:
+            del held[key]
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def _acquire(fd: int, shared: bool, timeout: float | None, path: Path) -> None:
+    """Poll a non-blocking flock with backoff until it succeeds or times out."""
+    op = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = 0.005
+    while True:
+        try:
+            fcntl.flock(fd, op)
+            return
+        except BlockingIOError:
+            pass
+        if deadline is not None and time.monotonic() >= deadline:
+            mode = "shared" if shared else "exclusive"
+            raise LockTimeout(f"Timed out waiting for {mode} lock on {path}")
+        time.sleep(delay)
+        delay = min(delay * 2, 0.1)
@@ -1,33 +1,71 @@
 """Registry client for MCP tool registry."""
 
 from .client import (
+    RANK_MODES,
     RegistryConfig,
     RegistryFetchError,
+    RegistrySet,
     RegistryStatus,
     fetch_registry,
     get_registry,
     get_registry_status,
     get_tool,
+    get_tool_bundles,
+    index_registry,
+    list_tools,
+    load_registry,
+    clear_registry_cache,
     load_cached_registry,
     save_cached_registry,
     search_tools,
+    suggest_tools,
     load_cached_artifact,
     get_bundle_membership,
 )
+from .bundle import export_bundle, import_bundle
+from .delta import build_manifest, tool_digest
+from .federation import fetch_federated, merge_registries, registry_set
 from .featured import get_featured, FeaturedData, Section, Collection
+from .model import Registry
 
 __all__ = [
+    "RANK_MODES",
+    "AsyncRegistryClient",
+    "Registry",
     "RegistryConfig",
     "RegistryFetchError",
+    "RegistrySet",
     "RegistryStatus",
     "fetch_registry",
     "get_registry",
     "get_registry_status",
     "get_tool",
+    "get_tool_bundles",
+    "index_registry",
+    "list_tools",
+    "load_registry",
+    "clear_registry_cache",
     "load_cached_registry",
     "save_cached_registry",
     "search_tools",
+    "suggest_tools",
     "load_cached_artifact",
     "get_bundle_membership",
     "get_featured",
+    "fetch_federated",
+    "merge_registries",
+    "registry_set",
+    "build_manifest",
+    "tool_digest",
+    "export_bundle",
+    "import_bundle",
 ]
+
+
+def __getattr__(name: str):
+    # Loaded on first use so importing mcpt.registry does not pull in asyncio
+    if name == "AsyncRegistryClient":
+        from .async_client import AsyncRegistryClient
+
+        return AsyncRegistryClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
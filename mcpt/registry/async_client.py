@@ -0,0 +1,325 @@
+"""Asyncio registry client for embedding mcpt in async services."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+from . import client as _client
+from .client import (
+    ARTIFACT_TIMEOUT,
+    ARTIFACTS,
+    REGISTRY_TIMEOUT,
+    RegistryConfig,
+    RegistryFetchError,
+    RegistrySet,
+    _claim_if_stale,
+    _delta_base_refs,
+    _delta_generation,
+    _fetch_error,
+    _load_delta_bases,
+    _new_generation,
+    _pending,
+    _request_state,
+    github_raw_registry_url,
+    index_registry,
+    load_cached_registry,
+    load_local_registry,
+    registry_cache_path,
+    save_cached_registry,
+)
+from .delta import MANIFEST_FILENAME, apply_delta, plan_delta, tool_path
+from .federation import stage_merged
+from .freshness import release_revalidation
+from .model import Registry
+
+if TYPE_CHECKING:
+    import httpx
+
+
+def _async_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client owned by an AsyncRegistryClient."""
+    # Imported here: httpx is only needed when actually fetching
+    import httpx
+
+    return httpx.AsyncClient()
+
+
+class AsyncRegistryClient:
+    """Async counterpart of the mcpt.registry functions.
+
+    Downloads go through one pooled ``httpx.AsyncClient``; cache reads and
+    writes run in worker threads, so the event loop is never blocked. The
+    cache on disk is shared with the synchronous API and other mcpt processes,
+    with the same locking, atomic writes and conditional requests.
+
+    Use it as an async context manager, or call aclose() when done::
+
+        async with AsyncRegistryClient() as registry:
+            a, b = await registry.get_registries([cfg_a, cfg_b])
+
+    An ``http_client`` passed in is used as-is and not closed.
+    """
+
+    def __init__(self, http_client: httpx.AsyncClient | None = None) -> None:
+        self._http = http_client
+        self._owns_http = http_client is None
+        # One refresh in flight per config; concurrent callers share it
+        self._refreshing: dict[RegistryConfig | RegistrySet, asyncio.Future[dict[str, Any]]] = {}
+
+    async def __aenter__(self) -> AsyncRegistryClient:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Wait for background refreshes, then close the HTTP client if this
+        instance created it."""
+        if self._refreshing:
+            await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+        if self._http is not None and self._owns_http:
+            await self._http.aclose()
+            self._http = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = _async_http_client()
+        return self._http
+
+    async def fetch_registry(self, cfg: RegistryConfig | RegistrySet) -> dict[str, Any]:
+        """Fetch registry from GitHub or local file.
+
+        Same contract as mcpt.registry.fetch_registry: registry.json and the
+        dist artifacts are requested concurrently and conditionally, and
+        nothing is written until the result is passed to save_cached_registry.
+        """
+        if isinstance(cfg, RegistrySet):
+            return await self._fetch_federated(cfg, force_refresh=True)
+
+        # Support local file paths
+        source_path = Path(cfg.source)
+        if source_path.is_file():
+            return await asyncio.to_thread(load_local_registry, source_path)
+
+        url = github_raw_registry_url(cfg.source, cfg.ref)
+        base_url = url.rsplit("/", 1)[0]
+        cached, headers, artifact_headers = await asyncio.to_thread(_request_state, cfg)
+        base_refs = await asyncio.to_thread(_delta_base_refs, cfg) if cached is None else []
+
+        http = self._client()
+        downloads = {
+            art: asyncio.ensure_future(
+                http.get(f"{base_url}/dist/{art}", headers=artifact_headers[art], timeout=ARTIFACT_TIMEOUT)
+            )
+            for art in ARTIFACTS
+        }
+        delta = head = None
+        if base_refs:
+            manifest_request = asyncio.ensure_future(
+                http.get(f"{base_url}/dist/{MANIFEST_FILENAME}", timeout=ARTIFACT_TIMEOUT)
+            )
+            head_request = asyncio.ensure_future(http.head(url, timeout=ARTIFACT_TIMEOUT))
+            delta = await self._fetch_delta(base_url, manifest_request, base_refs)
+            if delta is None:
+                head_request.cancel()
+            (head,) = await asyncio.gather(head_request, return_exceptions=True)
+            if isinstance(head, BaseException):
+                head = None
+        if delta is None:
+            try:
+                r = await http.get(url, headers=headers, timeout=REGISTRY_TIMEOUT)
+                if r.status_code != 304 or cached is None:
+                    r.raise_for_status()
+            except BaseException:
+                for task in downloads.values():
+                    task.cancel()
+                await asyncio.gather(*downloads.values(), return_exceptions=True)
+                raise
+
+        # Artifacts are best effort: a failed download keeps the cached copy
+        results = await asyncio.gather(*downloads.values(), return_exceptions=True)
+        responses = {
+            art: resp for art, resp in zip(downloads, results) if not isinstance(resp, BaseException)
+        }
+
+        if delta is not None:
+            gen = _delta_generation(delta, head, responses)
+        else:
+            gen = _new_generation(r, cached, responses)
+        _pending[cfg] = gen
+        return gen.data
+
+    async def _fetch_delta(
+        self,
+        base_url: str,
+        manifest_request: asyncio.Future[httpx.Response],
+        base_refs: list[RegistryConfig],
+    ) -> dict[str, Any] | None:
+        """Build a ref's registry from cached refs plus the tools that changed.
+
+        The cached refs are only read once the manifest turns out to exist.
+        """
+        http = self._client()
+        try:
+            resp = await manifest_request
+            if resp.status_code != 200:
+                return None
+            manifest = resp.json()
+            plan = await asyncio.to_thread(lambda: plan_delta(manifest, _load_delta_bases(base_refs)))
+            if plan is None:
+                return None
+            known, missing = plan
+
+            # As many requests at a time as the sync client's thread pool
+            slots = asyncio.Semaphore(len(ARTIFACTS) + 1)
+
+            async def fetch(tool_id: str) -> httpx.Response:
+                async with slots:
+                    return await http.get(f"{base_url}/dist/{tool_path(tool_id)}", timeout=ARTIFACT_TIMEOUT)
+
+            responses = await asyncio.gather(*(fetch(tool_id) for tool_id in missing))
+            fetched = {}
+            for tool_id, resp in zip(missing, responses):
+                resp.raise_for_status()
+                fetched[tool_id] = resp.json()
+            return apply_delta(manifest, known, fetched)
+        except Exception:
+            return None
+
+    async def get_registry(
+        self,
+        cfg: RegistryConfig | RegistrySet | None = None,
+        force_refresh: bool = False,
+    ) -> dict[str, Any]:
+        """Get registry, using cache if available unless force_refresh is True.
+
+        A cache past its max age is returned at once and refreshed by a
+        background task, as get_registry does with a background process.
+
+        On network failure the stale cache is returned if there is one,
+        otherwise RegistryFetchError is raised, as in get_registry.
+        """
+        if cfg is None:
+            cfg = RegistryConfig()
+
+        cached = await asyncio.to_thread(load_cached_registry, cfg)
+        if not force_refresh and cached is not None:
+            if cfg not in self._refreshing and await asyncio.to_thread(_claim_if_stale, cfg):
+                self._start(cfg, self._revalidate(cfg, cached))
+            return cached
+
+        refresh = self._refreshing.get(cfg) or self._start(cfg, self._refresh(cfg, cached, force_refresh))
+        # A cancelled caller must not cancel the refresh others are waiting on
+        return await asyncio.shield(refresh)
+
+    def _start(
+        self,
+        cfg: RegistryConfig | RegistrySet,
+        refresh: Any,
+    ) -> asyncio.Future[dict[str, Any]]:
+        """Run a refresh of ``cfg`` that concurrent callers can join."""
+        task = asyncio.ensure_future(refresh)
+        self._refreshing[cfg] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(cfg, None))
+        return task
+
+    async def _revalidate(
+        self,
+        cfg: RegistryConfig | RegistrySet,
+        cached: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Background refresh of a stale cache; never raises."""
+        try:
+            if isinstance(cfg, RegistrySet):
+                data = await self._fetch_federated(cfg, force_refresh=True)
+            else:
+                data = await self.fetch_registry(cfg)
+            await asyncio.to_thread(save_cached_registry, cfg, data)
+        except Exception:
+            # The claim is left to expire, spacing out retries
+            return cached
+        await asyncio.to_thread(release_revalidation, registry_cache_path(cfg).parent)
+        return data
+
+    async def _refresh(
+        self,
+        cfg: RegistryConfig | RegistrySet,
+        cached: dict[str, Any] | None,
+        force_refresh: bool,
+    ) -> dict[str, Any]:
+        import httpx
+
+        try:
+            if isinstance(cfg, RegistrySet):
+                data = await self._fetch_federated(cfg, force_refresh)
+            else:
+                data = await self.fetch_registry(cfg)
+            await asyncio.to_thread(save_cached_registry, cfg, data)
+            return data
+        except (httpx.RequestError, httpx.HTTPStatusError) as e:
+            if cached is not None:
+                # Graceful degradation - return stale cache
+                return cached
+            raise _fetch_error(e) from e
+        except RegistryFetchError:
+            # No member of a RegistrySet could be loaded
+            if cached is not None:
+                return cached
+            raise
+
+    async def _fetch_federated(self, rset: RegistrySet, force_refresh: bool) -> dict[str, Any]:
+        """Load every member concurrently and stage the merged document."""
+        results = await asyncio.gather(
+            *(self.get_registry(cfg, force_refresh=force_refresh) for cfg in rset.members),
+            return_exceptions=True,
+        )
+        docs: list[dict[str, Any] | None] = []
+        errors: list[Exception] = []
+        for result in results:
+            if isinstance(result, RegistryFetchError):
+                docs.append(None)
+                errors.append(result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                docs.append(result)
+        return await asyncio.to_thread(stage_merged, rset, docs, errors)
+
+    async def get_registries(
+        self,
+        cfgs: Iterable[RegistryConfig | RegistrySet],
+        force_refresh: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Get several registries (sources and/or refs) concurrently, in order."""
+        return list(
+            await asyncio.gather(*(self.get_registry(cfg, force_refresh=force_refresh) for cfg in cfgs))
+        )
+
+    async def load_registry(
+        self,
+        cfg: RegistryConfig | RegistrySet | None = None,
+        force_refresh: bool = False,
+    ) -> Registry:
+        """Get the shared indexed registry, as load_registry does."""
+        if cfg is None:
+            cfg = RegistryConfig()
+        data = await self.get_registry(cfg, force_refresh=force_refresh)
+        return await asyncio.to_thread(index_registry, data, cfg)
+
+    async def get_tool(
+        self,
+        tool_id: str,
+        cfg: RegistryConfig | RegistrySet | None = None,
+    ) -> dict[str, Any] | None:
+        """Get a specific tool by ID.
+
+        The registry is downloaded first if nothing is cached yet; the lookup
+        itself uses the compact cache like get_tool.
+        """
+        if cfg is None:
+            cfg = RegistryConfig()
+        if not await asyncio.to_thread(registry_cache_path(cfg).exists):
+            await self.get_registry(cfg)
+        return await asyncio.to_thread(_client.get_tool, tool_id, cfg)
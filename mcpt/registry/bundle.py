@@ -0,0 +1,262 @@
+"""Offline registry bundles for machines without network access.
+
+A bundle is one compressed tar archive with everything the cache of a
+registry holds, so importing it gives the same cache a fetch would:
+
+    mcpt-bundle.json
+             {"version": 1, "registries": [{"source": ..., "ref": ..., "path": "0"}, ...]}
+    0/dist/<artifact>.gz
+    0/validators.json
+    0/registry.bin           prebuilt compact cache
+    0/registry.search.idx    prebuilt search index
+    0/registry.json.gz
+    1/...
+
+Files are copied as cached, so registry.json and the artifacts are gzip
+files. The manifest comes first and each registry's registry.json.gz comes
+last in its group. Import is therefore a single streaming pass, writing in the same order
+as save_cached_registry. A RegistrySet is exported with its members first,
+then the merged view (its entry has "registries" instead of "source"/"ref").
+The compression (gzip, or xz/bz2 by file suffix) is detected on import.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+from itertools import groupby
+from pathlib import Path
+from typing import IO, Any, Iterable
+
+from mcpt.fileio import atomic_write_bytes, file_lock
+
+from .client import (
+    ARTIFACTS,
+    GZ_SUFFIX,
+    VALIDATORS_FILENAME,
+    RegistryConfig,
+    RegistrySet,
+    _config_from_target,
+    _ensure_compact,
+    _indexed,
+    _parsed,
+    _search_index,
+    _source_key,
+    _store,
+    _target,
+    cache_root,
+    compact_cache_path,
+    load_compact_registry,
+    load_registry,
+    load_search_index,
+    registry_cache_path,
+    search_index_path,
+)
+from .compact import COMPACT_FILENAME, restamp_compact
+from .freshness import mark_checked
+from .search import SEARCH_FILENAME, restamp_search_index
+from .store import REGISTRY_FILENAME
+from .store import read_store_manifest, write_store_manifest
+
+BUNDLE_MANIFEST = "mcpt-bundle.json"
+BUNDLE_VERSION = 1
+
+_COMPRESSION = {".xz": "xz", ".bz2": "bz2"}
+
+# Files a bundle may carry for each registry, in the order they are written.
+# Plain dist artifacts are only found in caches written by earlier versions.
+_FILES = (
+    *(f"dist/{art}{GZ_SUFFIX}" for art in ARTIFACTS),
+    *(f"dist/{art}" for art in ARTIFACTS),
+    VALIDATORS_FILENAME,
+    COMPACT_FILENAME,
+    SEARCH_FILENAME,
+    REGISTRY_FILENAME,
+)
+
+
+def _configs(cfg: RegistryConfig | RegistrySet) -> list[RegistryConfig | RegistrySet]:
+    return [*cfg.members, cfg] if isinstance(cfg, RegistrySet) else [cfg]
+
+
+def _cached_files(cfg: RegistryConfig | RegistrySet) -> list[str]:
+    """Load (fetching if needed) a registry and list its cache files to export.
+
+    The compact cache and search index are built if missing, and left out if
+    they do not match the registry document.
+    """
+    reg = load_registry(cfg)
+    _ensure_compact(cfg, reg.raw)
+    _search_index(reg, cfg)
+
+    ref_dir = registry_cache_path(cfg).parent
+    files = []
+    for name in _FILES:
+        if name == COMPACT_FILENAME and load_compact_registry(cfg) is None:
+            continue
+        if name == SEARCH_FILENAME and load_search_index(cfg) is None:
+            continue
+        if (ref_dir / name).is_file():
+            files.append(name)
+    return files
+
+
+def export_bundle(cfg: RegistryConfig | RegistrySet, path: Path) -> list[RegistryConfig | RegistrySet]:
+    """Write the cache of a registry (or of every member of a set) to ``path``.
+
+    A registry that is not cached yet is fetched first. Returns the exported
+    configs. The archive is written to a temp file and renamed into place.
+    """
+    # Imported here: only export and import need tarfile
+    import tarfile
+
+    configs = _configs(cfg)
+    plan = [(c, _cached_files(c)) for c in configs]
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "registries": [{**_target(c), "path": str(i)} for i, c in enumerate(configs)],
+    }
+
+    def add_bytes(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+
+    def anonymize(info: tarfile.TarInfo) -> tarfile.TarInfo:
+        info.uid = info.gid = 0
+        info.uname = info.gname = ""
+        return info
+
+    mode = "w:" + _COMPRESSION.get(path.suffix, "gz")
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        # dereference: files shared through the object store are hard links,
+        # and must go in as regular members, not as links to another member
+        with tarfile.open(tmp, mode, dereference=True) as tar:
+            add_bytes(tar, BUNDLE_MANIFEST, (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+            for i, (c, files) in enumerate(plan):
+                p = registry_cache_path(c)
+                with file_lock(p, shared=True):
+                    for name in files:
+                        tar.add(p.parent / name, arcname=f"{i}/{name}", recursive=False, filter=anonymize)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    return configs
+
+
+def _read_manifest(f: IO[bytes] | None) -> dict[str, RegistryConfig | RegistrySet]:
+    """Parse a bundle manifest into the config of each registry, by path."""
+    try:
+        manifest = json.load(f) if f is not None else None
+    except ValueError:
+        manifest = None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("registries"), list):
+        raise ValueError("Invalid bundle manifest")
+    if manifest.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported bundle version: {manifest.get('version')}")
+    targets = {}
+    for entry in manifest["registries"]:
+        if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+            raise ValueError("Invalid bundle manifest")
+        targets[entry["path"]] = _entry_config(entry)
+    return targets
+
+
+def _entry_config(entry: dict[str, Any]) -> RegistryConfig | RegistrySet:
+    """Build the config of a manifest entry, refusing malformed fields and unsafe refs."""
+    members = entry.get("registries")
+    if members is not None:
+        if not isinstance(members, list) or not members or not all(
+            isinstance(m, list) and len(m) == 2 and all(isinstance(v, str) for v in m) for m in members
+        ):
+            raise ValueError("Invalid bundle manifest")
+    elif not all(isinstance(entry.get(k, ""), str) for k in ("source", "ref")):
+        raise ValueError("Invalid bundle manifest")
+    cfg = _config_from_target(entry)
+    for c in _configs(cfg):
+        if isinstance(c, RegistryConfig) and not _safe_ref(c.ref):
+            raise ValueError(f"Unsafe ref in bundle manifest: {c.ref!r}")
+    return cfg
+
+
+def _safe_ref(ref: str) -> bool:
+    """Whether a ref names a directory under the cache (no absolute path, no ``..``)."""
+    if not ref or ref[0] in "/\\" or ":" in ref:
+        return False
+    return all(part not in ("", ".", "..") for part in re.split(r"[/\\]", ref))
+
+
+def _import_registry(tar: Any, cfg: RegistryConfig | RegistrySet, members: Iterable[Any]) -> None:
+    """Write one registry's files from the archive stream into the cache."""
+    p = registry_cache_path(cfg)
+    if not p.resolve().is_relative_to(cache_root().resolve()):
+        raise ValueError(f"Bundle registry path is outside the cache: {p}")
+    ref_dir = p.parent
+    ref_dir.mkdir(parents=True, exist_ok=True)
+    written: set[str] = set()
+    stored: dict[str, str] = {}
+
+    with file_lock(p):
+        for member in members:
+            name = member.name.partition("/")[2]
+            if not member.isfile() or name not in _FILES:
+                raise ValueError(f"Unexpected file in bundle: {member.name}")
+            target = ref_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Drop our own mapping first; a mapped file cannot be replaced on Windows
+            hit = _parsed.pop(target, None)
+            if hit is not None and name in (COMPACT_FILENAME, SEARCH_FILENAME):
+                hit[1].close()
+            atomic_write_bytes(target, tar.extractfile(member).read())
+            if name == REGISTRY_FILENAME or name.startswith("dist/"):
+                _store(target, name, stored)
+            written.add(name)
+
+        if REGISTRY_FILENAME not in written:
+            raise ValueError(f"Bundle has no {REGISTRY_FILENAME} for {p.parent.name}")
+        # The prebuilt files are stamped with the registry on the exporting machine
+        key = _source_key(p)
+        if COMPACT_FILENAME in written:
+            restamp_compact(compact_cache_path(cfg), key)
+        if SEARCH_FILENAME in written:
+            restamp_search_index(search_index_path(cfg), key)
+        write_store_manifest(ref_dir, {**read_store_manifest(ref_dir), **stored})
+        mark_checked(ref_dir)
+    _indexed.pop(cfg, None)
+
+
+def import_bundle(path: Path) -> list[RegistryConfig | RegistrySet]:
+    """Extract a bundle written by export_bundle into the cache.
+
+    The archive is read as a stream, in one pass. Returns the imported
+    configs. Raises ValueError if the file is not a valid bundle. Registries
+    imported before the problem was found are kept.
+    """
+    # Imported here: only export and import need tarfile
+    import tarfile
+
+    imported: list[RegistryConfig | RegistrySet] = []
+    try:
+        with tarfile.open(path, "r|*") as tar:
+            members = iter(tar)
+            first = next(members, None)
+            if first is None or first.name != BUNDLE_MANIFEST or not first.isfile():
+                raise ValueError("Not an mcpt registry bundle")
+            targets = _read_manifest(tar.extractfile(first))
+
+            for prefix, group in groupby(members, key=lambda m: m.name.partition("/")[0]):
+                cfg = targets.get(prefix)
+                if cfg is None:
+                    raise ValueError(f"Unexpected file in bundle: {prefix}")
+                _import_registry(tar, cfg, group)
+                imported.append(cfg)
+    except (tarfile.TarError, EOFError) as e:
+        raise ValueError(f"Invalid bundle: {e}") from e
+    return imported
@@ -2,20 +2,84 @@
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
 import os
-from dataclasses import dataclass
+import weakref
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
-import httpx
 from platformdirs import user_cache_dir
 
+from mcpt.fileio import LockTimeout, atomic_write_bytes, atomic_write_text, file_lock, replace_atomic, write_temp
+
+from .compact import COMPACT_FILENAME, CompactRegistry, write_compact
+from .delta import MANIFEST_FILENAME, apply_delta, plan_delta, tool_path
+from .freshness import (
+    checked_at,
+    claim_revalidation,
+    is_revalidating,
+    is_stale,
+    mark_checked,
+    registry_max_age,
+    release_revalidation,
+)
+from .model import Registry
+from .search import (
+    SEARCH_FILENAME,
+    SearchIndex,
+    build_search_index,
+    matched_fields,
+    tokenize,
+    write_search_index,
+)
+from .store import (
+    LEGACY_REGISTRY_FILENAME,
+    REGISTRY_FILENAME,
+    link_into_store,
+    mark_used,
+    read_store_manifest,
+    write_store_manifest,
+)
+
+if TYPE_CHECKING:
+    import httpx
+
 # Registry defaults - pin to stable release for new workspaces
 DEFAULT_REGISTRY_SOURCE = "https://github.com/mcp-tool-shop-org/mcp-tool-registry"
 DEFAULT_REF = "v0.3.0"
 
+# HTTP validators (ETag / Last-Modified) for cached files, stored next to the cache
+VALIDATORS_FILENAME = "validators.json"
+
+# Supplementary artifacts published under <ref>/dist/
+ARTIFACTS = (
+    "registry.index.json",
+    "capabilities.json",
+    "featured.json",
+    "registry.report.json",
+    "registry.llms.txt",
+)
+
+# Per-request timeout budgets (seconds)
+REGISTRY_TIMEOUT = 20.0
+ARTIFACT_TIMEOUT = 10.0
+
+# registry.json is written to disk in chunks of this size as it downloads
+DOWNLOAD_CHUNK = 64 * 1024
+
+# registry.json and dist artifacts are cached gzip-compressed at this level,
+# under their name plus GZ_SUFFIX (registry.json.gz, dist/featured.json.gz).
+# Readers also accept the plain files written by earlier versions.
+COMPRESS_LEVEL = 6
+GZ_SUFFIX = ".gz"
+_GZIP_MAGIC = b"\x1f\x8b"
+
 
 def github_raw_registry_url(source: str, ref: str) -> str:
     """Convert GitHub repo URL to raw registry.json URL."""
@@ -32,42 +96,469 @@ class RegistryConfig:
     ref: str = DEFAULT_REF
 
 
-def registry_cache_path(cfg: RegistryConfig) -> Path:
-    """Get the cache path for the registry."""
-    base = Path(user_cache_dir("mcp", "mcp-tool-shop"))
-    return base / "registry" / cfg.ref / "registry.json"
+@dataclass(frozen=True)
+class RegistrySet:
+    """Several registries used as one, highest priority first.
+
+    Each member is fetched and cached on its own; the merged view (first
+    member wins on a tool ID) is cached separately and accepted anywhere a
+    RegistryConfig is.
+    """
+
+    members: tuple[RegistryConfig, ...]
+
+    @property
+    def key(self) -> str:
+        """Stable identifier of this combination of registries."""
+        spec = json.dumps([[m.source, m.ref] for m in self.members])
+        return hashlib.sha256(spec.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class _Generation:
+    """What one fetch_registry call downloaded, waiting to be committed.
+
+    save_cached_registry writes it to the cache as a unit: dist artifacts
+    first, then registry.json, then the validators describing them.
+    """
+
+    data: dict[str, Any]
+    not_modified: bool = False
+    validators: dict[str, str] = field(default_factory=dict)
+    artifacts: dict[str, bytes] = field(default_factory=dict)
+    artifact_validators: dict[str, dict[str, str]] = field(default_factory=dict)
+    # registry.json as downloaded, gzip-compressed (a temp file under the
+    # cache root), renamed into place instead of re-serializing ``data``;
+    # deleted if the generation is dropped without being committed
+    body: Path | None = None
+    _discard: Any = field(default=None, repr=False)
+
+    def keep_body(self, body: Path) -> None:
+        self.body = body
+        self._discard = weakref.finalize(self, _unlink_quietly, body)
+
+
+def _unlink_quietly(p: Path) -> None:
+    try:
+        p.unlink()
+    except OSError:
+        pass
+
+
+def cache_root() -> Path:
+    """Get the root of the registry cache (ref directories and object store)."""
+    return Path(user_cache_dir("mcp", "mcp-tool-shop"))
+
+
+def registry_cache_path(cfg: RegistryConfig | RegistrySet) -> Path:
+    """Get the cache path for the registry (the gzip-compressed registry.json.gz).
+
+    The default source keeps its historical location; other sources get a
+    directory of their own so two sources pinned to the same ref do not share
+    a cache, and a RegistrySet caches its merged view apart from its members.
+    """
+    base = cache_root() / "registry"
+    if isinstance(cfg, RegistrySet):
+        return base / "federated" / cfg.key / REGISTRY_FILENAME
+    if cfg.source != DEFAULT_REGISTRY_SOURCE:
+        digest = hashlib.sha256(cfg.source.encode("utf-8")).hexdigest()[:16]
+        return base / "sources" / digest / cfg.ref / REGISTRY_FILENAME
+    return base / cfg.ref / REGISTRY_FILENAME
+
+
+def cached_artifact_path(cfg: RegistryConfig | RegistrySet, filename: str) -> Path | None:
+    """Get the cached copy of a dist artifact, or None if it is not cached.
+
+    Artifacts are stored as ``dist/<filename>.gz``; a plain ``dist/<filename>``
+    left by an earlier version is returned if there is no compressed one.
+    """
+    dist = registry_cache_path(cfg).parent / "dist"
+    for p in (dist / (filename + GZ_SUFFIX), dist / filename):
+        if p.is_file():
+            return p
+    return None
+
+
+def compact_cache_path(cfg: RegistryConfig) -> Path:
+    """Get the path of the compact binary cache written alongside registry.json."""
+    return registry_cache_path(cfg).with_name(COMPACT_FILENAME)
+
+
+def search_index_path(cfg: RegistryConfig) -> Path:
+    """Get the path of the search index written alongside registry.json."""
+    return registry_cache_path(cfg).with_name(SEARCH_FILENAME)
+
+
+# Process-level state.
+# _parsed memoizes parsed cache files as path -> (stat key, value); an entry is
+# only reused while the file's (st_mtime_ns, st_size, st_ino) are unchanged.
+# _indexed holds the indexed view of the current registry document per config.
+_parsed: dict[Path, tuple[tuple[int, int, int], Any]] = {}
+_indexed: dict[RegistryConfig, Registry] = {}
+# Fetched generations, committed once that exact document is saved to the cache.
+_pending: dict[RegistryConfig, _Generation] = {}
+# Ref directories this process has read, for the object store's LRU eviction
+_used: set[Path] = set()
+
+
+def _stat_key(p: Path) -> tuple[int, int, int]:
+    st = p.stat()
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _load_parsed(p: Path, parse: Callable[[str], Any]) -> Any:
+    """Read and parse a cache file, reusing the previous result if unchanged.
+
+    Raises OSError if the file is missing and whatever ``parse`` raises.
+    """
+    return _load_memoized(p, lambda path: parse(_read_cache_text(path)))
+
+
+def _read_cache_text(p: Path) -> str:
+    """Read a cache file, decompressing it if it is stored gzip-compressed."""
+    data = p.read_bytes()
+    if data[:2] == _GZIP_MAGIC:
+        data = zlib.decompress(data, wbits=31)
+    return data.decode("utf-8")
+
 
+def _compress_chunks(chunks: Iterable[bytes]) -> Iterable[bytes]:
+    """Gzip a stream of chunks for the cache.
 
-def load_cached_registry(cfg: RegistryConfig) -> dict[str, Any] | None:
+    The header carries no timestamp, so identical content always compresses
+    to identical bytes and is still shared by the object store.
+    """
+    c = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        out = c.compress(chunk)
+        if out:
+            yield out
+    yield c.flush()
+
+
+def _compress(data: bytes) -> bytes:
+    return b"".join(_compress_chunks((data,)))
+
+
+def _load_memoized(p: Path, load: Callable[[Path], Any]) -> Any:
+    """Load a cache file with ``load``, reusing the previous result if unchanged."""
+    key = _stat_key(p)
+    hit = _parsed.get(p)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    value = load(p)
+    _parsed[p] = (key, value)
+    return value
+
+
+def _remember_parsed(p: Path, value: Any) -> None:
+    """Record the parsed value of a file we just wrote, so it is not re-read."""
+    try:
+        _parsed[p] = (_stat_key(p), value)
+    except OSError:
+        _parsed.pop(p, None)
+
+
+def _parse_registry(text: str) -> dict[str, Any]:
+    data = json.loads(text)
+    # Validate basic structure
+    if not isinstance(data, dict) or "tools" not in data:
+        raise ValueError("Invalid registry structure")
+    return data
+
+
+def load_cached_registry(cfg: RegistryConfig | RegistrySet) -> dict[str, Any] | None:
     """Load registry from local cache if available.
 
     Returns None if cache doesn't exist or is corrupted.
     Corrupted cache files are automatically deleted for self-healing.
+    Repeated calls return the same parsed object while the file is unchanged.
+    Raises LockTimeout if a writer holds the cache for too long; that is not
+    a sign of corruption.
     """
     p = registry_cache_path(cfg)
-    if not p.exists():
+    if not p.exists() and not _migrate_legacy(p):
         return None
 
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
-        # Validate basic structure
-        if not isinstance(data, dict) or "tools" not in data:
-            raise ValueError("Invalid registry structure")
+        with file_lock(p, shared=True):
+            data = _load_parsed(p, _parse_registry)
+        _mark_used(p.parent)
         return data
-    except (json.JSONDecodeError, ValueError, OSError) as e:
-        # Corrupted cache - delete and return None for self-healing
+    except LockTimeout:
+        raise
+    except (json.JSONDecodeError, ValueError, OSError):
+        pass
+
+    # Corrupted cache - delete and return None for self-healing, unless a
+    # writer replaced it in the meantime
+    _parsed.pop(p, None)
+    with file_lock(p):
+        try:
+            return _load_parsed(p, _parse_registry)
+        except (json.JSONDecodeError, ValueError, OSError):
+            pass
         try:
             p.unlink()
         except OSError:
             pass
+    return None
+
+
+def _migrate_legacy(p: Path) -> bool:
+    """Move a plain registry.json from an earlier version to ``p``, compressed.
+
+    Returns whether ``p`` exists afterwards. The compact cache and search
+    index of the old file no longer match and are rebuilt when next used.
+    The ref keeps the age it had, so a stale cache is still refreshed.
+    """
+    legacy = p.with_name(LEGACY_REGISTRY_FILENAME)
+    if not legacy.is_file():
+        return False
+    try:
+        with file_lock(p):
+            if not p.exists():
+                # Read before p exists, so this is registry.checked or the old file
+                checked = checked_at(p.parent)
+                data = legacy.read_bytes()
+                atomic_write_bytes(p, data if data[:2] == _GZIP_MAGIC else _compress(data))
+                stored: dict[str, str] = {}
+                _store(p, REGISTRY_FILENAME, stored)
+                files = read_store_manifest(p.parent)
+                files.pop(LEGACY_REGISTRY_FILENAME, None)
+                write_store_manifest(p.parent, {**files, **stored})
+                mark_checked(p.parent, checked)
+            legacy.unlink()
+    except LockTimeout:
+        raise
+    except OSError:
+        pass
+    return p.exists()
+
+
+def save_cached_registry(cfg: RegistryConfig | RegistrySet, data: dict[str, Any]) -> None:
+    """Save registry to local cache.
+
+    Every file is written atomically (temp file, fsync, rename). If ``data``
+    was just returned by fetch_registry, the dist artifacts downloaded with it
+    are committed in the same step, before registry.json, so a reader that
+    sees the new registry also sees its artifacts.
+
+    Concurrent writers (other mcpt processes) are serialized by an exclusive
+    lock on the cache.
+    """
+    p = registry_cache_path(cfg)
+    p.parent.mkdir(parents=True, exist_ok=True)
+
+    gen = _pending.pop(cfg, None)
+    if gen is not None and gen.data is not data:
+        gen = None
+
+    with file_lock(p):
+        _commit_generation(cfg, p, data, gen)
+
+
+def _commit_generation(
+    cfg: RegistryConfig,
+    p: Path,
+    data: dict[str, Any],
+    gen: _Generation | None,
+) -> None:
+    """Write a registry (and its fetched artifacts) into the cache; lock held."""
+    validators = load_validators(cfg)
+    validators_before = dict(validators)
+    # Files written now, shared through the object store: name -> digest
+    stored: dict[str, str] = {}
+
+    if gen is not None:
+        dist = p.parent / "dist"
+        dist.mkdir(parents=True, exist_ok=True)
+        for art, content in gen.artifacts.items():
+            ap = dist / (art + GZ_SUFFIX)
+            atomic_write_bytes(ap, _compress(content))
+            _store(ap, f"dist/{ap.name}", stored)
+            _unlink_quietly(dist / art)
+            validators.pop(f"dist/{art}", None)
+        for art, entry in gen.artifact_validators.items():
+            validators[f"dist/{art}"] = entry
+
+    if gen is not None and gen.not_modified and p.exists():
+        # Unchanged files keep their mtime: they may be hard links shared
+        # with other refs (see mcpt.registry.store), whose compact caches and
+        # search indexes are stamped with it. mark_checked records the check.
+        if load_compact_registry(cfg) is None:
+            _write_compact(cfg, p, data)
+    else:
+        if gen is not None and gen.body is not None:
+            replace_atomic(gen.body, p)
+            gen._discard.detach()
+            gen.body = None
+        else:
+            atomic_write_bytes(p, _compress(json.dumps(data).encode("utf-8")))
+        _store(p, REGISTRY_FILENAME, stored)
+        if p.name != LEGACY_REGISTRY_FILENAME:
+            _unlink_quietly(p.with_name(LEGACY_REGISTRY_FILENAME))
+        _remember_parsed(p, data)
+        _write_compact(cfg, p, data)
+        # Only keep validators that describe exactly what was just written
+        if gen is not None and gen.validators:
+            validators["registry.json"] = gen.validators
+        else:
+            validators.pop("registry.json", None)
+    _indexed.pop(cfg, None)
+
+    if stored:
+        write_store_manifest(p.parent, {**read_store_manifest(p.parent), **stored})
+    if validators != validators_before:
+        save_validators(cfg, validators)
+    mark_checked(p.parent)
+
+
+def _mark_used(ref_dir: Path) -> None:
+    """Record the first read of a ref in this process (see mcpt.registry.store)."""
+    if ref_dir not in _used:
+        _used.add(ref_dir)
+        mark_used(ref_dir)
+
+
+def _store(p: Path, name: str, stored: dict[str, str]) -> None:
+    """Share a file just written to the cache through the object store."""
+    digest = link_into_store(cache_root(), p)
+    if digest is not None:
+        stored[name] = digest
+
+
+def _source_key(p: Path) -> tuple[int, int]:
+    st = p.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _write_compact(cfg: RegistryConfig, p: Path, data: dict[str, Any]) -> None:
+    """Write the compact cache for the registry.json at ``p`` (best effort)."""
+    cp = compact_cache_path(cfg)
+    # Drop our own mapping first; a mapped file cannot be replaced on Windows
+    hit = _parsed.pop(cp, None)
+    if hit is not None:
+        hit[1].close()
+    try:
+        write_compact(cp, data, _source_key(p))
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def load_compact_registry(cfg: RegistryConfig) -> CompactRegistry | None:
+    """Open the compact cache if it matches the current registry.json.
+
+    The file is memory-mapped, so single-tool lookups do not read the registry
+    into memory. Returns None if it is missing, unreadable or stale.
+    """
+    p = registry_cache_path(cfg)
+    cp = compact_cache_path(cfg)
+    try:
+        compact = _load_memoized(cp, CompactRegistry)
+        if compact.source_key != _source_key(p):
+            return None
+        _mark_used(p.parent)
+        return compact
+    except (OSError, ValueError):
         return None
 
 
-def save_cached_registry(cfg: RegistryConfig, data: dict[str, Any]) -> None:
-    """Save registry to local cache."""
+def _ensure_compact(cfg: RegistryConfig, data: dict[str, Any]) -> None:
+    """Rebuild a missing or stale compact cache from the loaded registry."""
+    if load_cached_registry(cfg) is not data or load_compact_registry(cfg) is not None:
+        return
+    p = registry_cache_path(cfg)
+    with file_lock(p):
+        if load_cached_registry(cfg) is data and load_compact_registry(cfg) is None:
+            _write_compact(cfg, p, data)
+
+
+def load_search_index(cfg: RegistryConfig) -> SearchIndex | None:
+    """Open the persisted search index if it matches the current registry.json.
+
+    Returns None if it is missing, unreadable or stale.
+    """
     p = registry_cache_path(cfg)
+    try:
+        index = _load_memoized(search_index_path(cfg), SearchIndex.open)
+        if index.source_key != _source_key(p):
+            return None
+        return index
+    except (OSError, ValueError):
+        return None
+
+
+def _search_index(reg: Registry, cfg: RegistryConfig) -> SearchIndex:
+    """Get the search index for a registry, building it at most once.
+
+    A registry loaded from the cache uses (or writes) the index persisted
+    next to it; any other document gets an in-memory index.
+    """
+    if reg.search_index is not None:
+        return reg.search_index
+    index = None
+    if load_cached_registry(cfg) is reg.raw:
+        index = load_search_index(cfg)
+        if index is None:
+            p = registry_cache_path(cfg)
+            sp = search_index_path(cfg)
+            with file_lock(p):
+                index = load_search_index(cfg)
+                if index is None and load_cached_registry(cfg) is reg.raw:
+                    # Drop our own mapping first, as for the compact cache
+                    hit = _parsed.pop(sp, None)
+                    if hit is not None:
+                        hit[1].close()
+                    try:
+                        write_search_index(sp, reg.tools, _source_key(p))
+                    except (OSError, ValueError):
+                        pass
+                    index = load_search_index(cfg)
+        if index is not None and len(index) != len(reg.tools):
+            index = None
+    if index is None:
+        index = SearchIndex(build_search_index(reg.tools))
+    reg.search_index = index
+    return index
+
+
+def load_validators(cfg: RegistryConfig) -> dict[str, dict[str, str]]:
+    """Load stored HTTP validators, keyed by cache-relative file name."""
+    p = registry_cache_path(cfg).parent / VALIDATORS_FILENAME
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_validators(cfg: RegistryConfig, validators: dict[str, dict[str, str]]) -> None:
+    """Store HTTP validators next to the registry cache."""
+    p = registry_cache_path(cfg).parent / VALIDATORS_FILENAME
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    atomic_write_text(p, json.dumps(validators, indent=2, sort_keys=True) + "\n")
+
+
+def _conditional_headers(entry: dict[str, str] | None) -> dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers from stored validators."""
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _response_validators(resp: httpx.Response) -> dict[str, str]:
+    """Extract ETag / Last-Modified from a response."""
+    out = {}
+    if resp.headers.get("etag"):
+        out["etag"] = resp.headers["etag"]
+    if resp.headers.get("last-modified"):
+        out["last_modified"] = resp.headers["last-modified"]
+    return out
 
 
 def load_local_registry(path: Path) -> dict[str, Any]:
@@ -75,49 +566,259 @@ def load_local_registry(path: Path) -> dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def fetch_registry(cfg: RegistryConfig) -> dict[str, Any]:
-    """Fetch registry from GitHub or local file."""
+def _http_client() -> httpx.Client:
+    """Create the pooled HTTP client shared by all downloads of one refresh."""
+    # Imported here: httpx is only needed when actually fetching
+    import httpx
+
+    return httpx.Client(limits=httpx.Limits(max_connections=len(ARTIFACTS) + 2))
+
+
+def _request_state(
+    cfg: RegistryConfig,
+) -> tuple[dict[str, Any] | None, dict[str, str], dict[str, dict[str, str]]]:
+    """Read what a refresh needs from the cache before downloading anything.
+
+    Returns the cached registry (or None), the conditional headers for
+    registry.json and the conditional headers for each dist artifact. Headers
+    are only sent for files that are actually cached.
+    """
+    validators = load_validators(cfg)
+    cached = load_cached_registry(cfg)
+    headers = _conditional_headers(validators.get("registry.json")) if cached is not None else {}
+
+    artifact_headers = {
+        art: _conditional_headers(validators.get(f"dist/{art}")) if cached_artifact_path(cfg, art) else {}
+        for art in ARTIFACTS
+    }
+    return cached, headers, artifact_headers
+
+
+def _new_generation(
+    r: httpx.Response,
+    cached: dict[str, Any] | None,
+    responses: dict[str, httpx.Response],
+    body: Path | None = None,
+) -> _Generation:
+    """Turn the responses of one refresh into a generation to commit.
+
+    ``body`` is registry.json as streamed to disk by _download; without it
+    the document is read from the (buffered) response.
+    """
+    if r.status_code == 304:
+        gen = _Generation(data=cached, not_modified=True)
+    elif body is None:
+        gen = _Generation(data=r.json(), validators=_response_validators(r))
+    else:
+        try:
+            data = json.loads(_read_cache_text(body))
+        except BaseException:
+            _unlink_quietly(body)
+            raise
+        gen = _Generation(data=data, validators=_response_validators(r))
+        gen.keep_body(body)
+    _stage_artifacts(gen, responses)
+    return gen
+
+
+def _download(r: httpx.Response) -> Path:
+    """Stream a response body, compressed for the cache, to a temp file.
+
+    The file is under the cache root, on the same filesystem as the cache, so
+    committing it is a rename, but outside the ref directory, which is not
+    touched until then.
+    """
+    downloads = cache_root() / "downloads"
+    downloads.mkdir(parents=True, exist_ok=True)
+    return write_temp(downloads / "registry.json", _compress_chunks(r.iter_bytes(DOWNLOAD_CHUNK)))
+
+
+def _stage_artifacts(gen: _Generation, responses: dict[str, httpx.Response]) -> None:
+    """Add the downloaded dist artifacts to a generation."""
+    # A 304 keeps the cached copy: nothing to stage
+    for art, resp in responses.items():
+        if resp.status_code == 200:
+            gen.artifacts[art] = resp.content
+            entry = _response_validators(resp)
+            if entry:
+                gen.artifact_validators[art] = entry
+
+
+def _delta_generation(
+    data: dict[str, Any],
+    head: httpx.Response | None,
+    responses: dict[str, httpx.Response],
+) -> _Generation:
+    """Turn a document built by _fetch_delta into a generation to commit.
+
+    ``head`` answers a HEAD request for the ref's registry.json, made along
+    with the manifest. Its validators are stored for the assembled document,
+    so the next refresh of the ref is conditional, as after a full download.
+    """
+    gen = _Generation(data=data)
+    if head is not None and head.status_code == 200:
+        gen.validators = _response_validators(head)
+    _stage_artifacts(gen, responses)
+    return gen
+
+
+def _delta_base_refs(cfg: RegistryConfig) -> list[RegistryConfig]:
+    """Other cached refs of a source a delta could build on.
+
+    Only lists them; their documents are read by _load_delta_bases once the
+    registry turns out to publish a manifest.
+    """
+    ref_root = registry_cache_path(cfg).parent.parent
+    try:
+        ref_dirs = sorted(ref_root.iterdir())
+    except OSError:
+        return []
+    return [
+        replace(cfg, ref=d.name)
+        for d in ref_dirs
+        if d.name != cfg.ref
+        and ((d / REGISTRY_FILENAME).is_file() or (d / LEGACY_REGISTRY_FILENAME).is_file())
+    ]
+
+
+def _load_delta_bases(refs: list[RegistryConfig]) -> list[dict[str, Any]]:
+    """Cached documents of the refs from _delta_base_refs."""
+    docs = (load_cached_registry(ref) for ref in refs)
+    return [doc for doc in docs if doc is not None]
+
+
+def _fetch_delta(
+    client: httpx.Client,
+    base_url: str,
+    manifest_request: Future[httpx.Response],
+    base_refs: list[RegistryConfig],
+) -> dict[str, Any] | None:
+    """Build a ref's registry from cached refs plus the tools that changed.
+
+    ``manifest_request`` is the manifest download, started alongside the
+    artifacts. Returns None if the registry publishes no manifest or a full
+    download is needed for any other reason (see mcpt.registry.delta).
+    """
+    try:
+        resp = manifest_request.result()
+        if resp.status_code != 200:
+            return None
+        manifest = resp.json()
+        plan = plan_delta(manifest, _load_delta_bases(base_refs))
+        if plan is None:
+            return None
+        known, missing = plan
+
+        with ThreadPoolExecutor(max_workers=len(ARTIFACTS) + 1) as pool:
+            futures = {
+                tool_id: pool.submit(
+                    client.get,
+                    f"{base_url}/dist/{tool_path(tool_id)}",
+                    timeout=ARTIFACT_TIMEOUT,
+                )
+                for tool_id in missing
+            }
+            fetched = {}
+            for tool_id, fut in futures.items():
+                resp = fut.result()
+                resp.raise_for_status()
+                fetched[tool_id] = resp.json()
+        return apply_delta(manifest, known, fetched)
+    except Exception:
+        return None
+
+
+def fetch_registry(cfg: RegistryConfig | RegistrySet) -> dict[str, Any]:
+    """Fetch registry from GitHub or local file.
+
+    registry.json and the dist artifacts are downloaded concurrently over one
+    pooled connection, so a refresh takes about as long as the slowest file.
+    Transfers are compressed (gzip/deflate, plus brotli and zstd when the
+    optional ``compression`` extra is installed). registry.json is streamed,
+    gzip-compressed for the cache, to a temp file under the cache root and
+    parsed from there; saving it renames that file into place.
+
+    Requests are conditional on the validators stored with the cache. When the
+    remote answers 304 Not Modified, the cached document is returned as-is.
+
+    A ref that is not cached yet is built from the closest cached ref of the
+    same source plus the tools that changed, if the registry publishes a
+    manifest (see mcpt.registry.delta).
+
+    Nothing is written here: the downloaded files are committed to the cache
+    together when the returned document is passed to save_cached_registry.
+
+    For a RegistrySet, every member is refreshed (in parallel, each into its
+    own cache) and the merged document is returned.
+    """
+    if isinstance(cfg, RegistrySet):
+        from .federation import fetch_federated
+
+        return fetch_federated(cfg, force_refresh=True)
+
     # Support local file paths
     source_path = Path(cfg.source)
     if source_path.exists() and source_path.is_file():
         return load_local_registry(source_path)
 
+    # registry.json is at .../ref/registry.json
+    # artifacts are at .../ref/dist/...
     url = github_raw_registry_url(cfg.source, cfg.ref)
-    r = httpx.get(url, timeout=20.0)
-    r.raise_for_status()
-    data = r.json()
+    base_url = url.rsplit("/", 1)[0]
+    cached, headers, artifact_headers = _request_state(cfg)
+    base_refs = _delta_base_refs(cfg) if cached is None else []
+
+    responses: dict[str, httpx.Response] = {}
+    with _http_client() as client, ThreadPoolExecutor(max_workers=len(ARTIFACTS) + 2) as pool:
+        futures = {
+            art: pool.submit(
+                client.get,
+                f"{base_url}/dist/{art}",
+                headers=artifact_headers[art],
+                timeout=ARTIFACT_TIMEOUT,
+            )
+            for art in ARTIFACTS
+        }
+
+        delta = head = None
+        if base_refs:
+            manifest_request = pool.submit(
+                client.get, f"{base_url}/dist/{MANIFEST_FILENAME}", timeout=ARTIFACT_TIMEOUT
+            )
+            head_request = pool.submit(client.head, url, timeout=ARTIFACT_TIMEOUT)
+            delta = _fetch_delta(client, base_url, manifest_request, base_refs)
+            if delta is not None:
+                try:
+                    head = head_request.result()
+                except Exception:
+                    pass
+        body = None
+        if delta is None:
+            try:
+                # Streamed: the body goes to disk as it arrives, not into memory
+                with client.stream("GET", url, headers=headers, timeout=REGISTRY_TIMEOUT) as r:
+                    if r.status_code != 304 or cached is None:
+                        r.raise_for_status()
+                    if r.status_code != 304:
+                        body = _download(r)
+            except Exception:
+                for fut in futures.values():
+                    fut.cancel()
+                raise
 
-    # Fetch additional artifacts (best effort)
-    try:
-        # registry.json is at .../ref/registry.json
-        # artifacts are at .../ref/dist/...
-        base_url = url.rsplit("/", 1)[0]
-
-        # Cache directory: .../registry/ref/dist/
-        cache_base = registry_cache_path(cfg).parent / "dist"
-        cache_base.mkdir(parents=True, exist_ok=True)
-
-        artifacts = [
-            "registry.index.json",
-            "capabilities.json",
-            "featured.json",
-            "registry.report.json",
-            "registry.llms.txt",
-        ]
-
-        for art in artifacts:
+        # Artifacts are best effort: a failed download keeps the cached copy
+        for art, fut in futures.items():
             try:
-                resp = httpx.get(f"{base_url}/dist/{art}", timeout=10.0)
-                if resp.status_code == 200:
-                    (cache_base / art).write_bytes(resp.content)
+                responses[art] = fut.result()
             except Exception:
                 pass
 
-    except Exception:
-        # Ensure we return the main registry even if artifact fetching fails
-        pass
-
-    return data
+    if delta is not None:
+        gen = _delta_generation(delta, head, responses)
+    else:
+        gen = _new_generation(r, cached, responses, body)
+    _pending[cfg] = gen
+    return gen.data
 
 
 class RegistryFetchError(Exception):
@@ -128,12 +829,24 @@ class RegistryFetchError(Exception):
         self.cached_available = cached_available
 
 
+def _fetch_error(e: Exception) -> RegistryFetchError:
+    """Build the error raised when a fetch fails and nothing is cached."""
+    return RegistryFetchError(
+        f"Failed to fetch registry: {e}\n"
+        f"No cached registry available. Check your network connection.",
+        cached_available=False,
+    )
+
+
 def get_registry(
-    cfg: RegistryConfig | None = None,
+    cfg: RegistryConfig | RegistrySet | None = None,
     force_refresh: bool = False,
 ) -> dict[str, Any]:
     """Get registry, using cache if available unless force_refresh is True.
 
+    A cache older than the max age (see mcpt.registry.freshness) is still
+    returned at once; a background process refreshes it for later calls.
+
     On network failure:
     - If cache exists, returns cached data (graceful degradation)
     - If no cache, raises RegistryFetchError with helpful message
@@ -144,65 +857,207 @@ def get_registry(
     cached = load_cached_registry(cfg)
 
     if not force_refresh and cached is not None:
+        _revalidate_if_stale(cfg)
         return cached
 
+    import httpx
+
     try:
-        data = fetch_registry(cfg)
+        if isinstance(cfg, RegistrySet):
+            from .federation import fetch_federated
+
+            # Members answer from their own caches unless refreshing
+            data = fetch_federated(cfg, force_refresh=force_refresh)
+        else:
+            data = fetch_registry(cfg)
         save_cached_registry(cfg, data)
         return data
     except (httpx.RequestError, httpx.HTTPStatusError) as e:
         if cached is not None:
             # Graceful degradation - return stale cache
             return cached
-        raise RegistryFetchError(
-            f"Failed to fetch registry: {e}\n"
-            f"No cached registry available. Check your network connection.",
-            cached_available=False,
-        ) from e
-
-
-def get_tool(tool_id: str, cfg: RegistryConfig | None = None) -> dict[str, Any] | None:
-    """Get a specific tool by ID."""
-    registry = get_registry(cfg)
-    for tool in registry.get("tools", []):
-        if tool.get("id") == tool_id:
-            return tool
-    return None
+        raise _fetch_error(e) from e
+    except RegistryFetchError:
+        # No member of a RegistrySet could be loaded
+        if cached is not None:
+            return cached
+        raise
+
+
+def _claim_if_stale(cfg: RegistryConfig | RegistrySet) -> bool:
+    """Claim the background refresh of a cached registry past its max age."""
+    ref_dir = registry_cache_path(cfg).parent
+    return is_stale(ref_dir, registry_max_age()) and claim_revalidation(ref_dir)
+
+
+def _revalidate_if_stale(cfg: RegistryConfig | RegistrySet) -> None:
+    """Start a background refresh of a cached registry past its max age."""
+    if _claim_if_stale(cfg):
+        try:
+            _spawn_revalidation(cfg)
+        except OSError:
+            release_revalidation(registry_cache_path(cfg).parent)
+
+
+def _spawn_revalidation(cfg: RegistryConfig | RegistrySet) -> None:
+    """Run ``python -m mcpt.registry.revalidate`` detached from this process."""
+    import subprocess
+    import sys
+
+    kwargs: dict[str, Any] = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(
+        [sys.executable, "-m", "mcpt.registry.revalidate", json.dumps(_target(cfg))],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        **kwargs,
+    )
+
+
+def index_registry(data: dict[str, Any], cfg: RegistryConfig | RegistrySet | None = None) -> Registry:
+    """Return the shared indexed view of a raw registry document.
+
+    The view is built once per document and reused by every caller in the
+    process, so commands that already hold the raw registry get O(1) lookups
+    without rebuilding the indexes.
+    """
+    if cfg is None:
+        cfg = RegistryConfig()
+    index = load_cached_artifact(cfg, "registry.index.json")
+    reg = _indexed.get(cfg)
+    if reg is not None and reg.raw is data and reg.index is index:
+        return reg
+    reg = Registry(data, index)
+    _indexed[cfg] = reg
+    return reg
+
+
+def load_registry(
+    cfg: RegistryConfig | RegistrySet | None = None,
+    force_refresh: bool = False,
+) -> Registry:
+    """Get the indexed registry, parsing and indexing it at most once per process.
+
+    The cache file is re-read only if it changes on disk.
+    """
+    if cfg is None:
+        cfg = RegistryConfig()
+    return index_registry(get_registry(cfg, force_refresh=force_refresh), cfg)
+
+
+def clear_registry_cache() -> None:
+    """Drop all in-process registry state (the on-disk cache is untouched)."""
+    _parsed.clear()
+    _indexed.clear()
+    _used.clear()
+
+
+def _target(cfg: RegistryConfig | RegistrySet) -> dict[str, Any]:
+    """Describe a config as JSON, for the daemon or a background refresh."""
+    if isinstance(cfg, RegistrySet):
+        return {"registries": [[m.source, m.ref] for m in cfg.members]}
+    return {"source": cfg.source, "ref": cfg.ref}
+
+
+def _config_from_target(params: dict[str, Any]) -> RegistryConfig | RegistrySet:
+    """Inverse of _target; missing fields take the defaults."""
+    if params.get("registries"):
+        return RegistrySet(tuple(RegistryConfig(source=s, ref=r) for s, r in params["registries"]))
+    defaults = RegistryConfig()
+    return RegistryConfig(
+        source=params.get("source", defaults.source),
+        ref=params.get("ref", defaults.ref),
+    )
+
+
+def _ask_daemon(method: str, cfg: RegistryConfig, **params: Any) -> tuple[bool, Any]:
+    """Offer a lookup to a running ``mcpt serve`` daemon.
+
+    Returns (True, result) if the daemon answered, else (False, None) and the
+    caller answers locally.
+    """
+    from mcpt import daemon
+
+    if not daemon.enabled():
+        return False, None
+    try:
+        return True, daemon.call(method, {**_target(cfg), **params})
+    except Exception:
+        return False, None
+
+
+def get_tool(tool_id: str, cfg: RegistryConfig | RegistrySet | None = None) -> dict[str, Any] | None:
+    """Get a specific tool by ID.
+
+    If the registry has not been loaded in this process yet, only this tool's
+    record is decoded from the compact cache; registry.json is not parsed.
+    """
+    if cfg is None:
+        cfg = RegistryConfig()
+    found, result = _ask_daemon("info", cfg, tool_id=tool_id)
+    if found:
+        return result
+    if cfg not in _indexed:
+        compact = load_compact_registry(cfg)
+        if compact is not None:
+            _revalidate_if_stale(cfg)
+            return compact.get(tool_id)
+        reg = load_registry(cfg)
+        _ensure_compact(cfg, reg.raw)
+        return reg.get(tool_id)
+    return load_registry(cfg).get(tool_id)
+
+
+def get_tool_bundles(tool_id: str, cfg: RegistryConfig | None = None) -> list[str]:
+    """Get the bundles a tool belongs to, without loading the full registry."""
+    if cfg is None:
+        cfg = RegistryConfig()
+    if cfg in _indexed:
+        return load_registry(cfg).bundles_for(tool_id)
+    index = load_cached_artifact(cfg, "registry.index.json")
+    if not isinstance(index, dict) or not isinstance(index.get("bundles"), dict):
+        return []
+    return [name for name, ids in index["bundles"].items() if tool_id in ids]
 
 
-def load_cached_artifact(cfg: RegistryConfig, filename: str) -> Any | None:
+def load_cached_artifact(cfg: RegistryConfig | RegistrySet, filename: str) -> Any | None:
     """Load a cached artifact (JSON or text) if available."""
-    p = registry_cache_path(cfg).parent / "dist" / filename
-    if not p.exists():
+    p = cached_artifact_path(cfg, filename)
+    if p is None:
         return None
     try:
-        content = p.read_text(encoding="utf-8")
         if filename.endswith(".json"):
-            return json.loads(content)
-        return content
+            return _load_parsed(p, json.loads)
+        return _load_parsed(p, str)
     except Exception:
         return None
 
 
 def get_bundle_membership(cfg: RegistryConfig | None = None) -> dict[str, list[str]]:
-    """Return a mapping of tool_id -> list[bundle_names] for all tools."""
+    """Return a mapping of tool_id -> list[bundle_names] for all tools.
+
+    Only the cached registry.index.json artifact is read; the registry
+    document is never parsed or fetched. A Registry already indexed over the
+    same artifact in this process supplies its map as is.
+    """
     if cfg is None:
         cfg = RegistryConfig()
-    try:
-        index = load_cached_artifact(cfg, "registry.index.json")
-        if not index or "bundles" not in index:
-            return {}
-        
-        # Invert: tool_id -> bundles
-        mapping: dict[str, list[str]] = {}
-        for bundle_name, tools in index["bundles"].items():
-            for tool_id in tools:
-                if tool_id not in mapping:
-                    mapping[tool_id] = []
-                mapping[tool_id].append(bundle_name)
-        return mapping
-    except Exception:
+    index = load_cached_artifact(cfg, "registry.index.json")
+    if not isinstance(index, dict) or not isinstance(index.get("bundles"), dict):
         return {}
+    reg = _indexed.get(cfg)
+    if reg is not None and reg.index is index:
+        return reg.tool_bundles
+    mapping: dict[str, list[str]] = {}
+    for bundle_name, tools in index["bundles"].items():
+        for tool_id in tools:
+            mapping.setdefault(tool_id, []).append(bundle_name)
+    return mapping
 
 
 def calculate_match_score(tool: dict[str, Any], query_lower: str) -> tuple[int, list[str]]:
@@ -252,36 +1107,102 @@ def calculate_match_score(tool: dict[str, Any], query_lower: str) -> tuple[int,
     return score, reasons
 
 
+def list_tools(
+    cfg: RegistryConfig | RegistrySet | None = None,
+    bundle: str | None = None,
+    tag: str | None = None,
+    include_deprecated: bool = False,
+    force_refresh: bool = False,
+) -> list[dict[str, Any]]:
+    """List registry tools, optionally filtered by bundle and tag.
+
+    Deprecated tools are left out unless ``include_deprecated``. An unknown
+    bundle matches no tools. A running daemon answers unless
+    ``force_refresh`` asks for a fresh download.
+    """
+    if cfg is None:
+        cfg = RegistryConfig()
+    if not force_refresh:
+        found, result = _ask_daemon(
+            "list", cfg, bundle=bundle, tag=tag, include_deprecated=include_deprecated,
+        )
+        if found:
+            return result
+    reg = load_registry(cfg, force_refresh=force_refresh)
+    tools = reg.tools
+    if not include_deprecated:
+        tools = [t for t in tools if not t.get("deprecated")]
+    if tag:
+        tagged = set(reg.ids_with_tag(tag))
+        tools = [t for t in tools if t.get("id") in tagged]
+    if bundle:
+        members = set(reg.ids_in_bundle(bundle) or [])
+        tools = [t for t in tools if t.get("id") in members]
+    return tools
+
+
+# Ranking modes accepted by search_tools
+RANK_MODES = ("score", "bm25")
+
+# Minimum number of tools scored by suggest_tools
+SUGGEST_SHORTLIST = 50
+
+
 def search_tools(
     query: str,
-    cfg: RegistryConfig | None = None,
+    cfg: RegistryConfig | RegistrySet | None = None,
     bundle: str | None = None,
     tag: str | None = None,
+    rank: str = "score",
+    limit: int | None = None,
+    ids: Iterable[str] | None = None,
 ) -> list[dict[str, Any]]:
     """Search tools with ranking and filtering.
-    
+
+    ``rank`` is "score" (the fixed match weights of calculate_match_score) or
+    "bm25" (field-weighted BM25 over the words of the query). ``limit`` keeps
+    only the best results, selected with a heap instead of sorting them all.
+    ``ids`` restricts the results to the given tool IDs.
+
     Returns tools with injected '_score' and '_reasons' fields.
     """
-    registry = get_registry(cfg)
+    if rank not in RANK_MODES:
+        raise ValueError(f"Unknown rank mode: {rank}")
+    if cfg is None:
+        cfg = RegistryConfig()
+    found, result = _ask_daemon(
+        "search", cfg, query=query, bundle=bundle, tag=tag, rank=rank, limit=limit,
+        ids=sorted(ids) if ids is not None else None,
+    )
+    if found:
+        return result
+    reg = load_registry(cfg)
     query_lower = query.lower() if query else ""
     results = []
 
-    # Try to load index for better bundle/tag data, but fallback to registry.json
-    index = load_cached_artifact(cfg or RegistryConfig(), "registry.index.json")
-    
-    # If bundle filter requested, and we have index with bundles
+    # Bundle/tag filters narrow the candidates via the prebuilt indexes
     allowed_ids = None
-    if bundle and index and "bundles" in index:
-        allowed_ids = set(index["bundles"].get(bundle, []))
-    
-    for tool in registry.get("tools", []):
-        # Filter by bundle
+    if bundle and reg.has_bundles:
+        allowed_ids = set(reg.ids_in_bundle(bundle) or [])
+    if tag:
+        tagged = set(reg.ids_with_tag(tag))
+        allowed_ids = tagged if allowed_ids is None else allowed_ids & tagged
+    if ids is not None:
+        allowed_ids = set(ids) if allowed_ids is None else allowed_ids & set(ids)
+
+    if query_lower and rank == "bm25":
+        return _search_bm25(reg, cfg, query_lower, allowed_ids, limit)
+
+    if query_lower:
+        # Only tools the inverted index can match are scored
+        candidates = _search_index(reg, cfg).candidates(query_lower)
+        tools = [reg.tools[i] for i in candidates if i < len(reg.tools)]
+    else:
+        tools = reg.tools
+
+    for tool in tools:
         if allowed_ids is not None and tool.get("id") not in allowed_ids:
             continue
-            
-        # Filter by tag
-        if tag and tag.lower() not in [t.lower() for t in tool.get("tags", [])]:
-            continue
 
         if not query:
             # If no query but filters matched, add with zero score
@@ -299,11 +1220,95 @@ def search_tools(
             results.append(tool_copy)
 
     # Sort by score descending, then ID ascending
-    results.sort(key=lambda x: (-x.get("_score", 0), x.get("id", "")))
-    
+    def order(x: dict[str, Any]) -> tuple[Any, ...]:
+        return (-x.get("_score", 0), x.get("id", ""))
+
+    if limit is not None:
+        return heapq.nsmallest(limit, results, key=order)
+    results.sort(key=order)
+    return results
+
+
+def _search_bm25(
+    reg: Registry,
+    cfg: RegistryConfig,
+    query_lower: str,
+    allowed_ids: set[str] | None,
+    limit: int | None,
+) -> list[dict[str, Any]]:
+    """Rank tools by BM25 over the precomputed term statistics."""
+    terms = tokenize(query_lower)
+    scores = _search_index(reg, cfg).bm25(terms)
+    tools = reg.tools
+
+    hits = [
+        (pos, score) for pos, score in scores.items()
+        if pos < len(tools) and (allowed_ids is None or tools[pos].get("id") in allowed_ids)
+    ]
+
+    # Best score first, then ID ascending
+    def order(hit: tuple[int, float]) -> tuple[Any, ...]:
+        return (-hit[1], tools[hit[0]].get("id", ""), hit[0])
+
+    top = heapq.nsmallest(limit, hits, key=order) if limit is not None else sorted(hits, key=order)
+
+    results = []
+    for pos, score in top:
+        tool_copy = tools[pos].copy()
+        tool_copy["_score"] = round(score, 4)
+        tool_copy["_reasons"] = matched_fields(tools[pos], dict.fromkeys(terms))
+        results.append(tool_copy)
     return results
 
 
+def _similarity(query_lower: str, text: str) -> float:
+    """Score how closely ``text`` resembles a (possibly mistyped) query."""
+    from difflib import SequenceMatcher
+
+    text = text.lower()
+    score = 0.0
+    if query_lower in text:
+        score += 0.5
+    if text.startswith(query_lower):
+        score += 0.3
+    score += SequenceMatcher(None, query_lower, text).ratio() * 0.5
+    return score
+
+
+def suggest_tools(
+    query: str,
+    cfg: RegistryConfig | RegistrySet | None = None,
+    limit: int = 5,
+    data: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Find tools whose ID or name resembles ``query`` ("did you mean").
+
+    Only a shortlist of tools sharing the most trigrams with the query is
+    scored, so the cost does not grow with every tool in the registry. ``data``
+    is an already loaded raw registry to search instead of the cached one.
+    """
+    if cfg is None:
+        cfg = RegistryConfig()
+    reg = index_registry(data, cfg) if data is not None else load_registry(cfg)
+    query_lower = query.lower()
+    shortlist = _search_index(reg, cfg).shortlist(query_lower, max(SUGGEST_SHORTLIST, limit * 10))
+
+    scored = []
+    for pos in shortlist:
+        if pos >= len(reg.tools):
+            continue
+        tool = reg.tools[pos]
+        score = max(
+            _similarity(query_lower, tool.get("id") or ""),
+            _similarity(query_lower, tool.get("name") or ""),
+        )
+        if score > 0.2:
+            scored.append((score, tool))
+
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [t for _, t in scored[:limit]]
+
+
 @dataclass
 class RegistryStatus:
     """Status information about the registry."""
@@ -315,28 +1320,65 @@ class RegistryStatus:
     cache_mtime: datetime | None
     tool_count: int
     provenance: str  # "cache", "remote", "local_file", "not_loaded"
+    # Per-registry status of a RegistrySet, highest priority first
+    members: list[RegistryStatus] = field(default_factory=list)
+    # Freshness: last fetch or revalidation, the max age in seconds (None:
+    # never stale), and whether a background refresh is due or running
+    checked_at: datetime | None = None
+    max_age: float | None = None
+    stale: bool = False
+    revalidating: bool = False
 
 
-def get_registry_status(cfg: RegistryConfig | None = None) -> RegistryStatus:
-    """Get status information about the registry without fetching."""
+def get_registry_status(cfg: RegistryConfig | RegistrySet | None = None) -> RegistryStatus:
+    """Get status information about the registry without fetching.
+
+    For a RegistrySet, the status describes the merged cache and lists the
+    status of each member.
+    """
     if cfg is None:
         cfg = RegistryConfig()
 
     cache_path = registry_cache_path(cfg)
-    cache_exists = cache_path.exists()
+    cache_exists = cache_path.exists() or _migrate_legacy(cache_path)
     cache_mtime = None
     tool_count = 0
     provenance = "not_loaded"
+    max_age = registry_max_age()
+    checked = checked_at(cache_path.parent) if cache_exists else None
+    freshness = {
+        "checked_at": datetime.fromtimestamp(checked) if checked is not None else None,
+        "max_age": max_age,
+        "stale": cache_exists and is_stale(cache_path.parent, max_age),
+        "revalidating": is_revalidating(cache_path.parent),
+    }
 
     if cache_exists:
         cache_mtime = datetime.fromtimestamp(cache_path.stat().st_mtime)
+        compact = load_compact_registry(cfg)
         try:
-            data = json.loads(cache_path.read_text(encoding="utf-8"))
-            tool_count = len(data.get("tools", []))
+            if compact is not None:
+                tool_count = len(compact)
+            else:
+                data = _load_parsed(cache_path, json.loads)
+                tool_count = len(data.get("tools", []))
             provenance = "cache"
         except Exception:
             pass
 
+    if isinstance(cfg, RegistrySet):
+        return RegistryStatus(
+            source=", ".join(m.source for m in cfg.members),
+            ref=", ".join(m.ref for m in cfg.members),
+            cache_path=cache_path,
+            cache_exists=cache_exists,
+            cache_mtime=cache_mtime,
+            tool_count=tool_count,
+            provenance=provenance,
+            members=[get_registry_status(m) for m in cfg.members],
+            **freshness,
+        )
+
     # Check if source is a local file
     source_path = Path(cfg.source)
     if source_path.exists() and source_path.is_file():
@@ -350,4 +1392,5 @@ def get_registry_status(cfg: RegistryConfig | None = None) -> RegistryStatus:
         cache_mtime=cache_mtime,
         tool_count=tool_count,
         provenance=provenance,
+        **freshness,
     )
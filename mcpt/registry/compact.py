@@ -0,0 +1,155 @@
+"""Compact binary registry cache with per-tool random access.
+
+The file is written alongside registry.json and lets a single tool be decoded
+without parsing the whole registry. Layout (little-endian):
+
+    header   magic, source mtime_ns, source size, meta length, tool count, ids length
+    meta     compact JSON of the top-level document minus "tools"
+    table    one fixed-width entry per tool, sorted by tool ID:
+             (id offset, id length, record offset, record length)
+    ids      UTF-8 tool IDs, concatenated
+    records  compact JSON of each tool, concatenated
+
+The header records the (st_mtime_ns, st_size) of the registry.json it was built
+from; a file whose stamp no longer matches is stale and must be ignored.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any
+
+from mcpt.fileio import atomic_write_bytes
+
+COMPACT_FILENAME = "registry.bin"
+
+MAGIC = b"MCPTRC01"
+HEADER = struct.Struct("<8sqQIII")
+ENTRY = struct.Struct("<IHQI")
+
+
+def build_compact(data: dict[str, Any], source_key: tuple[int, int]) -> bytes:
+    """Serialize a registry document into the compact format."""
+    meta = {k: v for k, v in data.items() if k != "tools"}
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+
+    records: dict[bytes, bytes] = {}
+    for tool in data.get("tools", []):
+        tool_id = tool.get("id")
+        if not tool_id:
+            continue
+        key = tool_id.encode("utf-8")
+        # First occurrence wins, matching Registry.by_id
+        if key not in records:
+            records[key] = json.dumps(tool, separators=(",", ":")).encode("utf-8")
+
+    table = bytearray()
+    ids = bytearray()
+    body = bytearray()
+    for key in sorted(records):
+        rec = records[key]
+        table += ENTRY.pack(len(ids), len(key), len(body), len(rec))
+        ids += key
+        body += rec
+
+    header = HEADER.pack(
+        MAGIC, source_key[0], source_key[1], len(meta_bytes), len(records), len(ids)
+    )
+    return b"".join((header, meta_bytes, bytes(table), bytes(ids), bytes(body)))
+
+
+def write_compact(path: Path, data: dict[str, Any], source_key: tuple[int, int]) -> None:
+    """Atomically write the compact cache for ``data``."""
+    atomic_write_bytes(path, build_compact(data, source_key))
+
+
+def restamp_compact(path: Path, source_key: tuple[int, int]) -> None:
+    """Point an existing compact cache at a touched (but unchanged) registry.json.
+
+    A torn write here only makes the stamp mismatch, which readers treat as stale.
+    """
+    with open(path, "r+b") as f:
+        f.seek(len(MAGIC))
+        f.write(struct.pack("<qQ", *source_key))
+
+
+class CompactRegistry:
+    """Read-only, memory-mapped view of a compact registry cache.
+
+    Nothing is read into Python memory up front: lookups bisect the offset
+    table in place through the mapping, so only the pages holding the probed
+    entries and the requested record are ever touched.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mm) < HEADER.size:
+                raise ValueError("Truncated compact registry")
+            magic, mtime_ns, size, meta_len, count, ids_len = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise ValueError("Not a compact registry")
+            self._meta_off = HEADER.size
+            self._meta_len = meta_len
+            self._table_off = self._meta_off + meta_len
+            self._ids_off = self._table_off + count * ENTRY.size
+            self._records_base = self._ids_off + ids_len
+            if self._records_base > len(self._mm):
+                raise ValueError("Truncated compact registry")
+        except Exception:
+            self._mm.close()
+            raise
+        self.path = path
+        self.source_key = (mtime_ns, size)
+        self.count = count
+
+    def close(self) -> None:
+        """Release the mapping."""
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _entry(self, i: int) -> tuple[int, int, int, int]:
+        return ENTRY.unpack_from(self._mm, self._table_off + i * ENTRY.size)
+
+    def _id_at(self, i: int) -> bytes:
+        id_off, id_len, _, _ = self._entry(i)
+        start = self._ids_off + id_off
+        return self._mm[start:start + id_len]
+
+    def _find(self, key: bytes) -> int:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._id_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._id_at(lo) == key:
+            return lo
+        return -1
+
+    def __contains__(self, tool_id: object) -> bool:
+        return isinstance(tool_id, str) and self._find(tool_id.encode("utf-8")) >= 0
+
+    def get(self, tool_id: str) -> dict[str, Any] | None:
+        """Decode a single tool record, or None if the ID is unknown."""
+        i = self._find(tool_id.encode("utf-8"))
+        if i < 0:
+            return None
+        _, _, rec_off, rec_len = self._entry(i)
+        start = self._records_base + rec_off
+        return json.loads(self._mm[start:start + rec_len])
+
+    def tool_ids(self) -> list[str]:
+        """All tool IDs, sorted."""
+        return [self._id_at(i).decode("utf-8") for i in range(self.count)]
+
+    def meta(self) -> dict[str, Any]:
+        """The top-level registry fields other than the tool list."""
+        return json.loads(self._mm[self._meta_off:self._meta_off + self._meta_len])
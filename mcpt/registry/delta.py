@@ -0,0 +1,120 @@
+"""Tool-level deltas between registry refs.
+
+A registry may publish, next to each ref's registry.json:
+
+    dist/registry.manifest.json
+             {"meta": {...}, "tools": [{"id": ..., "sha256": ...}, ...]}
+             where "meta" is the document minus "tools" and "tools" lists
+             every tool in order with the tool_digest of its record
+    dist/tools/<id>.json
+             one tool record
+
+When a ref is not cached yet but another ref of the same source is, the
+client reads the manifest, takes every tool whose digest it already holds from
+the closest cached ref and downloads only the others. A missing or malformed
+manifest, a digest mismatch or a delta larger than DELTA_MAX_FRACTION of the
+registry or DELTA_MAX_TOOLS records falls back to downloading registry.json
+in full.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Iterable
+from urllib.parse import quote
+
+MANIFEST_FILENAME = "registry.manifest.json"
+
+# Above this share of changed tools a full download is cheaper
+DELTA_MAX_FRACTION = 0.5
+# Each changed tool is one request; above this many, one full download wins
+DELTA_MAX_TOOLS = 32
+
+
+def tool_digest(tool: dict[str, Any]) -> str:
+    """SHA-256 of a tool record's canonical JSON (sorted keys, compact)."""
+    canonical = json.dumps(tool, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def build_manifest(data: dict[str, Any]) -> dict[str, Any]:
+    """Build the manifest a registry publishes for a document."""
+    return {
+        "meta": {k: v for k, v in data.items() if k != "tools"},
+        "tools": [{"id": t.get("id"), "sha256": tool_digest(t)} for t in data.get("tools", [])],
+    }
+
+
+def tool_path(tool_id: str) -> str:
+    """Path of a tool record relative to the ref's dist/ directory."""
+    return f"tools/{quote(tool_id, safe='')}.json"
+
+
+def _entries(manifest: Any) -> list[tuple[str, str]]:
+    """Validate a manifest and return its (id, digest) pairs in order."""
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("meta"), dict):
+        raise ValueError("Invalid registry manifest")
+    tools = manifest.get("tools")
+    if not isinstance(tools, list):
+        raise ValueError("Invalid registry manifest")
+    entries = []
+    for entry in tools:
+        if not isinstance(entry, dict):
+            raise ValueError("Invalid registry manifest")
+        tool_id, digest = entry.get("id"), entry.get("sha256")
+        if not isinstance(tool_id, str) or not isinstance(digest, str):
+            raise ValueError("Invalid registry manifest")
+        entries.append((tool_id, digest))
+    return entries
+
+
+def plan_delta(
+    manifest: Any,
+    bases: Iterable[dict[str, Any]],
+) -> tuple[dict[str, dict[str, Any]], list[str]] | None:
+    """Decide which tools of a manifest must be downloaded.
+
+    ``bases`` are cached documents of other refs. Returns the known records
+    by digest (from the base sharing the most tools) and the IDs still to
+    fetch, or None if a full download is the better deal. Raises ValueError
+    for a malformed manifest.
+    """
+    entries = _entries(manifest)
+    wanted = {digest for _, digest in entries}
+
+    best: dict[str, dict[str, Any]] = {}
+    for doc in bases:
+        known = {}
+        for tool in doc.get("tools", []):
+            digest = tool_digest(tool)
+            if digest in wanted:
+                known[digest] = tool
+        if len(known) > len(best):
+            best = known
+
+    missing = list(dict.fromkeys(tool_id for tool_id, digest in entries if digest not in best))
+    if not best or len(missing) > min(DELTA_MAX_TOOLS, DELTA_MAX_FRACTION * len(entries)):
+        return None
+    return best, missing
+
+
+def apply_delta(
+    manifest: Any,
+    known: dict[str, dict[str, Any]],
+    fetched: dict[str, dict[str, Any]],
+) -> dict[str, Any]:
+    """Assemble the document a manifest describes.
+
+    Every record is checked against its digest; raises ValueError if a record
+    is missing or does not match.
+    """
+    tools = []
+    for tool_id, digest in _entries(manifest):
+        tool = known.get(digest)
+        if tool is None:
+            tool = fetched.get(tool_id)
+            if not isinstance(tool, dict) or tool_digest(tool) != digest:
+                raise ValueError(f"Delta record for {tool_id} does not match the manifest")
+        tools.append(tool)
+    return {**manifest["meta"], "tools": tools}
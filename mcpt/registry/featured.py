@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any
 
-from mcpt.registry.client import RegistryConfig, get_registry, load_cached_artifact
+from mcpt.registry.client import RegistryConfig, load_cached_artifact, load_registry
 
 
 @dataclass
@@ -50,8 +50,7 @@ def get_featured(
 
     # Load main registry to validate IDs
     try:
-        registry = get_registry(cfg)
-        known_ids = {t["id"] for t in registry.get("tools", [])}
+        known_ids = load_registry(cfg).by_id.keys()
     except Exception:
         # If registry fetch fails, we can't validate IDs strict-mode,
         # but we should still return the structure if available locally.
@@ -0,0 +1,158 @@
+"""Federation of several registries into one merged view."""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Sequence
+
+from .client import (
+    RegistryConfig,
+    RegistryFetchError,
+    RegistrySet,
+    _Generation,
+    _pending,
+    get_registry,
+    load_cached_artifact,
+    load_cached_registry,
+)
+
+# Dist artifacts rebuilt for the merged view; the others describe a single
+# registry and are not carried over
+MERGED_ARTIFACTS = ("registry.index.json", "featured.json")
+
+
+def registry_set(configs: Sequence[RegistryConfig]) -> RegistryConfig | RegistrySet:
+    """Build the config for a priority-ordered list of registries.
+
+    Duplicates are dropped; a single registry is returned as-is.
+    """
+    members = tuple(dict.fromkeys(configs))
+    if not members:
+        return RegistryConfig()
+    if len(members) == 1:
+        return members[0]
+    return RegistrySet(members)
+
+
+def merge_registries(
+    rset: RegistrySet,
+    docs: Sequence[dict[str, Any] | None],
+) -> dict[str, Any]:
+    """Merge member registry documents, highest priority first.
+
+    When several registries publish the same tool ID, the record from the
+    highest-priority one wins. ``docs`` holds None for members that could not
+    be loaded. The merged document lists its members under "registries" and
+    the member each tool came from under "origins".
+    """
+    primary = next(doc for doc in docs if doc is not None)
+    merged: dict[str, Any] = {k: v for k, v in primary.items() if k != "tools"}
+    tools: list[dict[str, Any]] = []
+    origins: dict[str, int] = {}
+    registries = []
+
+    for pos, (cfg, doc) in enumerate(zip(rset.members, docs)):
+        registries.append({"source": cfg.source, "ref": cfg.ref, "available": doc is not None})
+        if doc is None:
+            continue
+        for tool in doc.get("tools", []):
+            tool_id = tool.get("id")
+            if not tool_id or tool_id in origins:
+                continue
+            origins[tool_id] = pos
+            tools.append(tool)
+
+    merged["tools"] = tools
+    merged["registries"] = registries
+    merged["origins"] = origins
+    return merged
+
+
+def _merge_index(indexes: Sequence[Any]) -> dict[str, Any] | None:
+    """Union the bundles of every member's registry.index.json."""
+    bundles: dict[str, list[str]] = {}
+    found = False
+    for index in indexes:
+        if not isinstance(index, dict) or not isinstance(index.get("bundles"), dict):
+            continue
+        found = True
+        for name, ids in index["bundles"].items():
+            members = bundles.setdefault(name, [])
+            members.extend(i for i in ids if i not in members)
+    return {"bundles": bundles} if found else None
+
+
+def _merged_artifacts(
+    rset: RegistrySet,
+    docs: Sequence[dict[str, Any] | None],
+) -> dict[str, Any]:
+    """Build the dist artifacts of the merged view from the members' caches."""
+    loaded = [cfg for cfg, doc in zip(rset.members, docs) if doc is not None]
+    artifacts: dict[str, Any] = {}
+
+    index = _merge_index([load_cached_artifact(cfg, "registry.index.json") for cfg in loaded])
+    if index is not None:
+        artifacts["registry.index.json"] = index
+
+    # Curation is not merged: the highest-priority featured.json is used
+    for cfg in loaded:
+        featured = load_cached_artifact(cfg, "featured.json")
+        if isinstance(featured, dict):
+            artifacts["featured.json"] = featured
+            break
+    return artifacts
+
+
+def stage_merged(
+    rset: RegistrySet,
+    docs: Sequence[dict[str, Any] | None],
+    errors: Sequence[Exception] = (),
+) -> dict[str, Any]:
+    """Merge loaded member documents and stage them for save_cached_registry.
+
+    Raises RegistryFetchError if no member could be loaded. If the merge is
+    unchanged, the cached merged document is returned and left as-is when
+    saved, so its compact cache and search index are kept.
+    """
+    if all(doc is None for doc in docs):
+        detail = f": {errors[0]}" if errors else ""
+        raise RegistryFetchError(
+            f"Failed to fetch any of {len(rset.members)} registries{detail}",
+            cached_available=False,
+        )
+
+    merged = merge_registries(rset, docs)
+    cached = load_cached_registry(rset)
+    if cached == merged:
+        gen = _Generation(data=cached, not_modified=True)
+    else:
+        gen = _Generation(data=merged)
+
+    for name, value in _merged_artifacts(rset, docs).items():
+        if load_cached_artifact(rset, name) != value:
+            gen.artifacts[name] = (json.dumps(value, indent=2) + "\n").encode("utf-8")
+
+    _pending[rset] = gen
+    return gen.data
+
+
+def fetch_federated(rset: RegistrySet, force_refresh: bool = False) -> dict[str, Any]:
+    """Load every member registry in parallel and return the merged document.
+
+    Each member goes through get_registry, so it is cached (and revalidated)
+    on its own: a refresh only downloads the registries that changed, and an
+    unreachable member falls back to its stale cache. Members that cannot be
+    loaded at all are left out of the merge.
+    """
+    docs: list[dict[str, Any] | None] = []
+    errors: list[Exception] = []
+    with ThreadPoolExecutor(max_workers=len(rset.members)) as pool:
+        futures = [pool.submit(get_registry, cfg, force_refresh) for cfg in rset.members]
+        for fut in futures:
+            try:
+                docs.append(fut.result())
+            except RegistryFetchError as e:
+                docs.append(None)
+                errors.append(e)
+    return stage_merged(rset, docs, errors)
@@ -0,0 +1,138 @@
+"""Freshness of cached registries (max-age plus stale-while-revalidate).
+
+A cached registry is used as-is while it is younger than the max age. Once it
+is older, commands still answer from the cache immediately and a detached
+background process (``python -m mcpt.registry.revalidate``) fetches the new
+version for the next command. Two files in each ref directory track this:
+
+    registry.checked
+             empty; its mtime is when the registry was last fetched or
+             confirmed unchanged
+    registry.revalidating
+             present while a background refresh runs; one that is older than
+             REVALIDATE_TIMEOUT is abandoned and may be claimed again, which
+             also spaces out retries while the network is down
+
+The max age comes from MCPT_REGISTRY_MAX_AGE ("90", "30m", "6h", "1d"; "never"
+turns background refreshes off).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from pathlib import Path
+
+from .store import LEGACY_REGISTRY_FILENAME, REGISTRY_FILENAME
+
+CHECKED_FILENAME = "registry.checked"
+REVALIDATING_FILENAME = "registry.revalidating"
+
+# Age after which a cached registry is refreshed in the background
+DEFAULT_MAX_AGE = 60 * 60
+
+# A background refresh older than this is considered dead
+REVALIDATE_TIMEOUT = 5 * 60
+
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+def parse_duration(text: str) -> float | None:
+    """Parse a max age such as "90", "30m" or "6h" into seconds.
+
+    "never" (or "off") returns None: cached registries never go stale.
+    """
+    if text.strip().lower() in ("never", "off"):
+        return None
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*", text, re.IGNORECASE)
+    if not m:
+        raise ValueError(f"Invalid duration: {text}")
+    return float(m.group(1)) * _UNITS[m.group(2).lower()]
+
+
+def registry_max_age() -> float | None:
+    """Max age of cached registries, from MCPT_REGISTRY_MAX_AGE.
+
+    An invalid value falls back to DEFAULT_MAX_AGE.
+    """
+    value = os.environ.get("MCPT_REGISTRY_MAX_AGE")
+    if not value:
+        return DEFAULT_MAX_AGE
+    try:
+        return parse_duration(value)
+    except ValueError:
+        return DEFAULT_MAX_AGE
+
+
+def mark_checked(ref_dir: Path, at: float | None = None) -> None:
+    """Record that a ref's registry was fetched or revalidated ``at`` (default: now)."""
+    try:
+        p = ref_dir / CHECKED_FILENAME
+        p.touch()
+        if at is not None:
+            os.utime(p, (at, at))
+    except OSError:
+        pass
+
+
+def checked_at(ref_dir: Path) -> float | None:
+    """When a ref's registry was last fetched or revalidated (epoch seconds).
+
+    Caches written before freshness was tracked fall back to the mtime of
+    the registry document.
+    """
+    for name in (CHECKED_FILENAME, REGISTRY_FILENAME, LEGACY_REGISTRY_FILENAME):
+        try:
+            return (ref_dir / name).stat().st_mtime
+        except OSError:
+            continue
+    return None
+
+
+def is_stale(ref_dir: Path, max_age: float | None) -> bool:
+    """Whether a cached ref is older than ``max_age`` (None: never stale)."""
+    if max_age is None:
+        return False
+    checked = checked_at(ref_dir)
+    return checked is not None and time.time() - checked >= max_age
+
+
+def is_revalidating(ref_dir: Path) -> bool:
+    """Whether a background refresh of a ref is running."""
+    try:
+        started = (ref_dir / REVALIDATING_FILENAME).stat().st_mtime
+    except OSError:
+        return False
+    return time.time() - started < REVALIDATE_TIMEOUT
+
+
+def claim_revalidation(ref_dir: Path) -> bool:
+    """Claim the right to refresh a ref in the background.
+
+    Returns False if another process (or an earlier command) already runs
+    one; an abandoned claim is taken over.
+    """
+    marker = ref_dir / REVALIDATING_FILENAME
+    for _ in range(2):
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            if is_revalidating(ref_dir):
+                return False
+            try:
+                marker.unlink()
+            except OSError:
+                pass
+        except OSError:
+            return False
+    return False
+
+
+def release_revalidation(ref_dir: Path) -> None:
+    """Drop the claim taken by claim_revalidation."""
+    try:
+        (ref_dir / REVALIDATING_FILENAME).unlink()
+    except OSError:
+        pass
@@ -0,0 +1,71 @@
+"""Indexed in-memory registry model."""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+
+class Registry:
+    """A parsed registry with pre-built lookup indexes.
+
+    Wraps the raw ``registry.json`` document (kept as ``raw``) together with
+    the bundle data from ``registry.index.json`` so that lookups by ID, tag
+    and bundle are O(1) instead of a scan over every tool.
+    """
+
+    def __init__(
+        self,
+        raw: dict[str, Any],
+        index: dict[str, Any] | None = None,
+    ) -> None:
+        self.raw = raw
+        self.index = index
+        self.tools: list[dict[str, Any]] = raw.get("tools", [])
+        self.by_id: dict[str, dict[str, Any]] = {}
+        self.tag_ids: dict[str, list[str]] = {}
+        self.bundle_ids: dict[str, list[str]] = {}
+        self.tool_bundles: dict[str, list[str]] = {}
+        # Inverted search index, attached on first search (see search_tools)
+        self.search_index: Any = None
+
+        for tool in self.tools:
+            tool_id = tool.get("id")
+            if not tool_id:
+                continue
+            # First occurrence wins, matching the old linear scan
+            self.by_id.setdefault(tool_id, tool)
+            for tag in tool.get("tags", []):
+                self.tag_ids.setdefault(tag.lower(), []).append(tool_id)
+
+        bundles = index.get("bundles") if isinstance(index, dict) else None
+        self.has_bundles = isinstance(bundles, dict)
+        if self.has_bundles:
+            for bundle_name, tool_ids in bundles.items():
+                self.bundle_ids[bundle_name] = list(tool_ids)
+                for tool_id in tool_ids:
+                    self.tool_bundles.setdefault(tool_id, []).append(bundle_name)
+
+    def __len__(self) -> int:
+        return len(self.tools)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self.tools)
+
+    def __contains__(self, tool_id: object) -> bool:
+        return tool_id in self.by_id
+
+    def get(self, tool_id: str) -> dict[str, Any] | None:
+        """Get a tool by ID."""
+        return self.by_id.get(tool_id)
+
+    def ids_with_tag(self, tag: str) -> list[str]:
+        """Tool IDs carrying a tag (case-insensitive)."""
+        return self.tag_ids.get(tag.lower(), [])
+
+    def ids_in_bundle(self, bundle: str) -> list[str] | None:
+        """Tool IDs in a bundle, or None if the bundle is unknown."""
+        return self.bundle_ids.get(bundle)
+
+    def bundles_for(self, tool_id: str) -> list[str]:
+        """Bundles a tool belongs to."""
+        return self.tool_bundles.get(tool_id, [])
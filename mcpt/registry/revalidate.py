@@ -0,0 +1,51 @@
+"""Background refresh of one cached registry.
+
+Started detached by get_registry when a cache is past its max age::
+
+    python -m mcpt.registry.revalidate '{"source": ..., "ref": ...}'
+
+The caller has already claimed the ref (see mcpt.registry.freshness). The
+claim is released after a successful refresh. After a failure it is left
+to expire, so a registry that cannot be reached is not retried by every
+command.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+
+from .client import (
+    RegistrySet,
+    _config_from_target,
+    fetch_registry,
+    registry_cache_path,
+    save_cached_registry,
+)
+from .freshness import release_revalidation
+
+
+def revalidate(target: dict) -> bool:
+    """Fetch and cache the registry ``target`` describes; True on success."""
+    cfg = _config_from_target(target)
+    try:
+        if isinstance(cfg, RegistrySet):
+            from .federation import fetch_federated
+
+            data = fetch_federated(cfg, force_refresh=True)
+        else:
+            data = fetch_registry(cfg)
+        save_cached_registry(cfg, data)
+    except Exception:
+        return False
+    release_revalidation(registry_cache_path(cfg).parent)
+    return True
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    return 0 if revalidate(json.loads(args[0])) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
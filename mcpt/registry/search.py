@@ -0,0 +1,416 @@
+"""Inverted index for registry search.
+
+Every match rule in ``calculate_match_score`` is either an ID prefix test or a
+case-insensitive substring test against the name, description or a tag. The
+index answers both without touching every tool:
+
+    grams    sorted postings of every 1-, 2- and 3-character substring of the
+             lowercased name, description and tags, mapping to tool positions
+    ids      lowercased tool IDs, sorted, for prefix lookups by bisection
+
+A query's candidates are the tools whose ID starts with it, plus the tools
+holding every trigram of it (or the query itself, if shorter). That is a
+superset of the tools that can score, so the caller still scores each
+candidate with ``calculate_match_score`` and results, weights and reasons are
+unchanged.
+
+The index also carries term statistics for BM25 ranking. Each posting of a
+word-level term stores its precomputed impact: the field-weighted (BM25F)
+term frequency of that tool, length-normalized per field, saturated with K1
+and multiplied by the term's IDF. A query's BM25 score is then just the sum of
+the impacts of its terms.
+
+For "did you mean" suggestions the index keeps a third table: the padded
+trigrams of each tool's lowercased ID and name. A mistyped ID shares most of
+its trigrams with the intended one, so counting shared trigrams gives a small
+shortlist that is worth scoring with a (much slower) similarity ratio.
+
+The serialized form is stored next to registry.json and memory-mapped on
+load. Layout (little-endian):
+
+    header    magic, source mtime_ns, source size, tool count, gram count,
+              id count, term count, trigram count, strings length,
+              gram postings length, term postings length,
+              fuzzy postings length
+    grams     one entry per gram, sorted: (string offset, string length,
+              postings offset, postings length)
+    ids       one entry per tool with an ID, sorted: (string offset,
+              string length, tool position)
+    terms     one entry per term, sorted, laid out like grams
+    fuzzy     one entry per ID/name trigram, sorted, laid out like grams
+    strings   UTF-8 grams, IDs, terms and trigrams, concatenated
+    postings  uint32 tool positions, ascending within each gram
+    term postings
+              uint32 tool positions, then float32 impacts in the same order
+    fuzzy postings
+              uint32 tool positions, ascending within each trigram
+
+Like the compact cache, the header carries the (st_mtime_ns, st_size) stamp of
+the registry.json it was built from.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import mmap
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Iterable
+
+from mcpt.fileio import atomic_write_bytes
+
+SEARCH_FILENAME = "registry.search.idx"
+
+MAGIC = b"MCPTSI03"
+HEADER = struct.Struct("<8sqQIIIIIIIII")
+GRAM = struct.Struct("<IHII")
+IDENT = struct.Struct("<IHI")
+
+# Longest substring indexed; longer queries are split into grams this long
+GRAM_MAX = 3
+
+# BM25 parameters and per-field weights
+K1 = 1.2
+B = 0.75
+FIELD_WEIGHTS = {"id": 3.0, "name": 2.5, "tags": 2.0, "description": 1.0}
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def _lower(value: Any) -> str:
+    return value.lower() if isinstance(value, str) else ""
+
+
+def _grams(text: str) -> set[str]:
+    """All substrings of ``text`` up to GRAM_MAX characters long."""
+    out = set()
+    for n in range(1, GRAM_MAX + 1):
+        for i in range(len(text) - n + 1):
+            out.add(text[i:i + n])
+    return out
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word terms (letters and digits)."""
+    return _TOKEN.findall(text.lower())
+
+
+def _fields(tool: dict[str, Any]) -> dict[str, list[str]]:
+    """The terms of each BM25 field of a tool."""
+    tags = [t for t in tool.get("tags") or [] if isinstance(t, str)]
+    return {
+        "id": tokenize(_lower(tool.get("id"))),
+        "name": tokenize(_lower(tool.get("name"))),
+        "tags": tokenize(" ".join(tags)),
+        "description": tokenize(_lower(tool.get("description"))),
+    }
+
+
+def matched_fields(tool: dict[str, Any], terms: Iterable[str]) -> list[str]:
+    """Explain a BM25 hit: which query terms occur in which fields."""
+    fields = {name: set(tokens) for name, tokens in _fields(tool).items()}
+    reasons = []
+    for term in terms:
+        where = [name for name in FIELD_WEIGHTS if term in fields[name]]
+        if where:
+            reasons.append(f"{term} in {'/'.join(where)}")
+    return reasons
+
+
+def _impacts(docs: list[dict[str, list[str]]]) -> dict[str, list[tuple[int, float]]]:
+    """Precompute the BM25F impact of every (term, tool) pair."""
+    n = len(docs)
+    avg = {
+        f: (sum(len(d[f]) for d in docs) / n if n else 0.0) or 1.0
+        for f in FIELD_WEIGHTS
+    }
+    weighted: dict[str, list[tuple[int, float]]] = {}
+    for pos, doc in enumerate(docs):
+        tf: dict[str, float] = {}
+        for f, weight in FIELD_WEIGHTS.items():
+            tokens = doc[f]
+            if not tokens:
+                continue
+            norm = weight / (1 - B + B * len(tokens) / avg[f])
+            for token in tokens:
+                tf[token] = tf.get(token, 0.0) + norm
+        for term, freq in tf.items():
+            weighted.setdefault(term, []).append((pos, freq))
+
+    impacts = {}
+    for term, postings in weighted.items():
+        df = len(postings)
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        impacts[term] = [(pos, idf * tf * (K1 + 1) / (tf + K1)) for pos, tf in postings]
+    return impacts
+
+
+def fuzzy_grams(text: str) -> set[str]:
+    """Trigrams of ``text`` padded with a space at each end."""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def query_grams(query_lower: str) -> set[str]:
+    """The grams a field must contain to have ``query_lower`` as a substring."""
+    if len(query_lower) <= GRAM_MAX:
+        return {query_lower}
+    n = GRAM_MAX
+    return {query_lower[i:i + n] for i in range(len(query_lower) - n + 1)}
+
+
+def build_search_index(
+    tools: Iterable[dict[str, Any]],
+    source_key: tuple[int, int] = (0, 0),
+) -> bytes:
+    """Serialize the search index for a tool list (positions follow its order)."""
+    postings: dict[bytes, list[int]] = {}
+    fuzzy: dict[bytes, list[int]] = {}
+    ids: list[tuple[bytes, int]] = []
+    docs = []
+    count = 0
+    for pos, tool in enumerate(tools):
+        count += 1
+        docs.append(_fields(tool))
+        tid = _lower(tool.get("id"))
+        if tid:
+            ids.append((tid.encode("utf-8"), pos))
+        grams = _grams(_lower(tool.get("name"))) | _grams(_lower(tool.get("description")))
+        for tag in tool.get("tags") or []:
+            grams |= _grams(_lower(tag))
+        for gram in grams:
+            postings.setdefault(gram.encode("utf-8"), []).append(pos)
+        for gram in fuzzy_grams(tid) | fuzzy_grams(_lower(tool.get("name"))):
+            fuzzy.setdefault(gram.encode("utf-8"), []).append(pos)
+
+    strings = bytearray()
+    gram_table = bytearray()
+    body = array("I")
+    for gram in sorted(postings):
+        positions = postings[gram]
+        gram_table += GRAM.pack(len(strings), len(gram), len(body), len(positions))
+        strings += gram
+        body.extend(positions)
+
+    ids.sort()
+    id_table = bytearray()
+    for key, pos in ids:
+        id_table += IDENT.pack(len(strings), len(key), pos)
+        strings += key
+
+    impacts = {term.encode("utf-8"): p for term, p in _impacts(docs).items()}
+    term_table = bytearray()
+    term_pos = array("I")
+    term_impact = array("f")
+    for term in sorted(impacts):
+        term_table += GRAM.pack(len(strings), len(term), len(term_pos), len(impacts[term]))
+        strings += term
+        for pos, impact in impacts[term]:
+            term_pos.append(pos)
+            term_impact.append(impact)
+
+    fuzzy_table = bytearray()
+    fuzzy_body = array("I")
+    for gram in sorted(fuzzy):
+        positions = fuzzy[gram]
+        fuzzy_table += GRAM.pack(len(strings), len(gram), len(fuzzy_body), len(positions))
+        strings += gram
+        fuzzy_body.extend(positions)
+
+    if sys.byteorder != "little":
+        for arr in (body, term_pos, term_impact, fuzzy_body):
+            arr.byteswap()
+    header = HEADER.pack(
+        MAGIC, source_key[0], source_key[1], count, len(postings), len(ids),
+        len(impacts), len(fuzzy), len(strings), len(body), len(term_pos), len(fuzzy_body),
+    )
+    return b"".join((
+        header, bytes(gram_table), bytes(id_table), bytes(term_table), bytes(fuzzy_table),
+        bytes(strings), body.tobytes(), term_pos.tobytes(), term_impact.tobytes(),
+        fuzzy_body.tobytes(),
+    ))
+
+
+def write_search_index(
+    path: Path,
+    tools: Iterable[dict[str, Any]],
+    source_key: tuple[int, int],
+) -> None:
+    """Atomically write the search index for ``tools``."""
+    atomic_write_bytes(path, build_search_index(tools, source_key))
+
+
+def restamp_search_index(path: Path, source_key: tuple[int, int]) -> None:
+    """Point an existing index at a touched (but unchanged) registry.json."""
+    with open(path, "r+b") as f:
+        f.seek(len(MAGIC))
+        f.write(struct.pack("<qQ", *source_key))
+
+
+class SearchIndex:
+    """Read-only view of a serialized search index.
+
+    Wraps either the bytes returned by build_search_index or a memory-mapped
+    index file (see SearchIndex.open); lookups bisect the tables in place.
+    """
+
+    def __init__(self, buf: bytes | mmap.mmap) -> None:
+        self._buf = buf
+        if len(buf) < HEADER.size:
+            raise ValueError("Truncated search index")
+        (magic, mtime_ns, size, count, n_grams, n_ids, n_terms, n_fuzzy, strings_len,
+         n_gram_postings, n_term_postings, n_fuzzy_postings) = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a search index")
+        self._grams_off = HEADER.size
+        self._ids_off = self._grams_off + n_grams * GRAM.size
+        self._terms_off = self._ids_off + n_ids * IDENT.size
+        self._fuzzy_off = self._terms_off + n_terms * GRAM.size
+        self._strings_off = self._fuzzy_off + n_fuzzy * GRAM.size
+        self._postings_off = self._strings_off + strings_len
+        self._term_pos_off = self._postings_off + 4 * n_gram_postings
+        self._term_impact_off = self._term_pos_off + 4 * n_term_postings
+        self._fuzzy_postings_off = self._term_impact_off + 4 * n_term_postings
+        self._n_grams = n_grams
+        self._n_ids = n_ids
+        self._n_terms = n_terms
+        self._n_fuzzy = n_fuzzy
+        if self._fuzzy_postings_off + 4 * n_fuzzy_postings > len(buf):
+            raise ValueError("Truncated search index")
+        self.source_key = (mtime_ns, size)
+        self.count = count
+
+    @classmethod
+    def open(cls, path: Path) -> SearchIndex:
+        """Memory-map an index file."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mm)
+        except Exception:
+            mm.close()
+            raise
+
+    def close(self) -> None:
+        """Release the mapping, if the index is file-backed."""
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _string(self, off: int, length: int) -> bytes:
+        start = self._strings_off + off
+        return self._buf[start:start + length]
+
+    def _entry_at(self, table_off: int, i: int) -> tuple[bytes, int, int]:
+        s_off, s_len, p_off, p_len = GRAM.unpack_from(self._buf, table_off + i * GRAM.size)
+        return self._string(s_off, s_len), p_off, p_len
+
+    def _lookup(self, table_off: int, n: int, key: bytes) -> tuple[int, int] | None:
+        """Bisect a gram/term table for ``key``; (postings offset, length) if found."""
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry_at(table_off, mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < n:
+            found, p_off, p_len = self._entry_at(table_off, lo)
+            if found == key:
+                return p_off, p_len
+        return None
+
+    def _read_array(self, typecode: str, start: int, length: int) -> array:
+        out = array(typecode)
+        out.frombytes(self._buf[start:start + length * out.itemsize])
+        if sys.byteorder != "little":
+            out.byteswap()
+        return out
+
+    def _id_at(self, i: int) -> tuple[bytes, int]:
+        s_off, s_len, pos = IDENT.unpack_from(self._buf, self._ids_off + i * IDENT.size)
+        return self._string(s_off, s_len), pos
+
+    def postings(self, gram: str) -> array:
+        """Positions of the tools whose name, description or tags contain ``gram``."""
+        hit = self._lookup(self._grams_off, self._n_grams, gram.encode("utf-8"))
+        if hit is None:
+            return array("I")
+        p_off, p_len = hit
+        return self._read_array("I", self._postings_off + 4 * p_off, p_len)
+
+    def term_postings(self, term: str) -> tuple[array, array]:
+        """Positions of the tools containing a word term, and their BM25 impacts."""
+        hit = self._lookup(self._terms_off, self._n_terms, term.encode("utf-8"))
+        if hit is None:
+            return array("I"), array("f")
+        p_off, p_len = hit
+        return (
+            self._read_array("I", self._term_pos_off + 4 * p_off, p_len),
+            self._read_array("f", self._term_impact_off + 4 * p_off, p_len),
+        )
+
+    def id_prefix(self, prefix: str) -> list[int]:
+        """Positions of the tools whose lowercased ID starts with ``prefix``."""
+        key = prefix.encode("utf-8")
+        lo, hi = 0, self._n_ids
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._id_at(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        out = []
+        for i in range(lo, self._n_ids):
+            tid, pos = self._id_at(i)
+            if not tid.startswith(key):
+                break
+            out.append(pos)
+        return out
+
+    def candidates(self, query_lower: str) -> list[int]:
+        """Positions of every tool that can match ``query_lower``, ascending."""
+        if not query_lower:
+            return list(range(self.count))
+        text: set[int] | None = None
+        # Intersect the rarest postings first so the working set stays small
+        for positions in sorted((self.postings(g) for g in query_grams(query_lower)), key=len):
+            text = set(positions) if text is None else text.intersection(positions)
+            if not text:
+                break
+        found = text or set()
+        found.update(self.id_prefix(query_lower))
+        return sorted(found)
+
+    def bm25(self, terms: Iterable[str]) -> dict[int, float]:
+        """BM25 score of every tool containing at least one of ``terms``."""
+        scores: dict[int, float] = {}
+        for term in dict.fromkeys(terms):
+            positions, impacts = self.term_postings(term)
+            for pos, impact in zip(positions, impacts):
+                scores[pos] = scores.get(pos, 0.0) + impact
+        return scores
+
+    def shortlist(self, query_lower: str, size: int) -> list[int]:
+        """Positions of the tools most likely to be what ``query_lower`` meant.
+
+        Tools are ranked by how many ID/name trigrams they share with the
+        query; tools whose ID starts with the query are always included.
+        Returned in ascending position order.
+        """
+        shared: dict[int, int] = {}
+        for gram in fuzzy_grams(query_lower):
+            hit = self._lookup(self._fuzzy_off, self._n_fuzzy, gram.encode("utf-8"))
+            if hit is None:
+                continue
+            p_off, p_len = hit
+            for pos in self._read_array("I", self._fuzzy_postings_off + 4 * p_off, p_len):
+                shared[pos] = shared.get(pos, 0) + 1
+        best = heapq.nlargest(size, shared, key=shared.__getitem__)
+        return sorted(set(best).union(self.id_prefix(query_lower)))
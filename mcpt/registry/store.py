@@ -0,0 +1,215 @@
+"""Content-addressed object store shared by every cached registry ref.
+
+Cache files with the same content in several refs (registry.json.gz of two
+refs pointing at one commit, unchanged dist artifacts) are kept once:
+
+    objects/<xx>/<sha256>
+             one file per distinct content
+    registry/.../<ref>/store.json
+             {"files": {"registry.json.gz": <sha256>, "dist/featured.json.gz": ...}}
+
+Every stored file in a ref directory is a hard link to its object, so readers
+keep opening (and memory-mapping) plain paths. An object whose link count is
+down to 1 is no longer used by any ref. Files derived per ref (registry.bin,
+registry.search.idx, validators.json) are not stored: they carry the stamp of
+their own ref's registry.json.
+
+Where hard links are not supported, files stay independent copies.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from mcpt.fileio import atomic_write_text, file_lock
+
+STORE_MANIFEST = "store.json"
+
+# A ref's registry document, gzip-compressed. Caches written before the cache
+# was compressed hold a plain LEGACY_REGISTRY_FILENAME instead.
+REGISTRY_FILENAME = "registry.json.gz"
+LEGACY_REGISTRY_FILENAME = "registry.json"
+
+# Cache size kept by `mcpt cache gc` unless --max-size / MCPT_CACHE_MAX_SIZE say otherwise
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def object_path(root: Path, digest: str) -> Path:
+    """Get the path of the object holding content with ``digest``."""
+    return root / "objects" / digest[:2] / digest
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's content."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def link_into_store(root: Path, path: Path) -> str | None:
+    """Share a freshly written cache file through the object store.
+
+    If an object with the same content exists, ``path`` is atomically
+    replaced by a link to it; otherwise the file becomes the object. Returns
+    the digest, or None if the file could not be stored (best effort).
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.link")
+    try:
+        digest = file_digest(path)
+        obj = object_path(root, digest)
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, obj)
+        except FileExistsError:
+            if not os.path.samefile(obj, path):
+                os.link(obj, tmp)
+                os.replace(tmp, path)
+        return digest
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return None
+
+
+def read_store_manifest(ref_dir: Path) -> dict[str, str]:
+    """Stored files of a ref directory, by relative name."""
+    try:
+        data = json.loads((ref_dir / STORE_MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    files = data.get("files") if isinstance(data, dict) else None
+    return files if isinstance(files, dict) else {}
+
+
+def write_store_manifest(ref_dir: Path, files: dict[str, str]) -> None:
+    """Record the stored files of a ref directory."""
+    atomic_write_text(
+        ref_dir / STORE_MANIFEST,
+        json.dumps({"files": dict(sorted(files.items()))}, indent=2) + "\n",
+    )
+
+
+def mark_used(ref_dir: Path) -> None:
+    """Record that a ref was read, for least-recently-used eviction."""
+    try:
+        os.utime(ref_dir / STORE_MANIFEST)
+    except OSError:
+        pass
+
+
+def _last_used(ref_dir: Path) -> float:
+    for name in (STORE_MANIFEST, REGISTRY_FILENAME, LEGACY_REGISTRY_FILENAME):
+        try:
+            return (ref_dir / name).stat().st_mtime
+        except OSError:
+            continue
+    return 0.0
+
+
+def ref_dirs(root: Path) -> list[Path]:
+    """Every cached ref directory (members, other sources and merged views)."""
+    base = root / "registry"
+    found = {p.parent for name in (REGISTRY_FILENAME, LEGACY_REGISTRY_FILENAME) for p in base.rglob(name)}
+    return sorted(found)
+
+
+def cache_size(root: Path) -> int:
+    """Bytes used by the registry cache, counting each shared object once."""
+    seen: set[tuple[int, int]] = set()
+    total = 0
+    for top in (root / "registry", root / "objects"):
+        for dirpath, _, filenames in os.walk(top):
+            for name in filenames:
+                try:
+                    st = os.stat(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                if (st.st_dev, st.st_ino) not in seen:
+                    seen.add((st.st_dev, st.st_ino))
+                    total += st.st_size
+    return total
+
+
+def sweep_objects(root: Path) -> int:
+    """Delete objects no ref links to any more; returns how many."""
+    removed = 0
+    objects = root / "objects"
+    if not objects.is_dir():
+        return 0
+    for obj in objects.glob("*/*"):
+        try:
+            if obj.stat().st_nlink <= 1:
+                obj.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def _remove_ref(ref_dir: Path) -> None:
+    """Delete one ref's files, leaving refs nested below it (e.g. "feature/x")."""
+    if not ref_dir.is_dir():
+        return
+    shutil.rmtree(ref_dir / "dist", ignore_errors=True)
+    for p in ref_dir.iterdir():
+        if p.is_file():
+            try:
+                p.unlink()
+            except OSError:
+                pass
+    try:
+        ref_dir.rmdir()
+    except OSError:
+        pass
+
+
+@dataclass
+class GcResult:
+    """What a garbage collection removed."""
+
+    size_before: int
+    size_after: int
+    removed_objects: int = 0
+    removed_refs: list[Path] = field(default_factory=list)
+
+
+def collect_garbage(root: Path, max_size: int | None = None) -> GcResult:
+    """Remove unreferenced objects, then evict refs until under ``max_size``.
+
+    Refs are evicted least recently used first (see mark_used); an evicted
+    ref is simply downloaded again the next time it is needed.
+    """
+    result = GcResult(size_before=cache_size(root), size_after=0)
+    result.removed_objects = sweep_objects(root)
+
+    if max_size is not None:
+        for ref_dir in sorted(ref_dirs(root), key=_last_used):
+            if cache_size(root) <= max_size:
+                break
+            with file_lock(ref_dir / REGISTRY_FILENAME):
+                _remove_ref(ref_dir)
+            result.removed_refs.append(ref_dir)
+            result.removed_objects += sweep_objects(root)
+
+    result.size_after = cache_size(root)
+    return result
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as "500M", "2G" or "1048576" into bytes."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)(?:i?B)?\s*", text, re.IGNORECASE)
+    if not m:
+        raise ValueError(f"Invalid size: {text}")
+    return int(float(m.group(1)) * _UNITS[m.group(2).upper()])
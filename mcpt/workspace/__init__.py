@@ -13,11 +13,15 @@ from .config import (
     read_lock,
     write_lock_record,
     get_ui_config,
+    get_registry_config,
+    load_workspace,
+    edit_workspace,
     get_run_stats,
     get_all_run_stats,
     update_run_stats,
     MCP_YAML_FILENAME,
 )
+from .model import Workspace
 
 __all__ = [
     "default_yaml",
@@ -32,6 +36,10 @@ __all__ = [
     "read_lock",
     "write_lock_record",
     "get_ui_config",
+    "get_registry_config",
+    "load_workspace",
+    "edit_workspace",
+    "Workspace",
     "get_run_stats",
     "get_all_run_stats",
     "update_run_stats",
@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import json
 from datetime import datetime, timezone
-import yaml
 
-from mcpt.registry.client import DEFAULT_REGISTRY_SOURCE, DEFAULT_REF
+from mcpt.fileio import atomic_write_text, file_lock
+from mcpt.registry.client import (
+    DEFAULT_REF,
+    DEFAULT_REGISTRY_SOURCE,
+    RegistryConfig,
+    RegistrySet,
+)
+
+from .model import Workspace
+from .yamlio import dump_yaml, load_yaml
 
 MCP_YAML_FILENAME = "mcp.yaml"
 MCP_LOCK_FILENAME = "mcp.lock.yaml"
@@ -19,32 +28,33 @@ def update_run_stats(path: Path, tool_id: str, success: bool) -> None:
     """Update execution statistics for a tool."""
     state_path = path.parent / MCP_STATE_FILENAME
     
-    data = {}
-    if state_path.exists():
-        try:
-            data = json.loads(state_path.read_text(encoding="utf-8"))
-        except Exception:
-            pass
+    with file_lock(state_path):
+        data = {}
+        if state_path.exists():
+            try:
+                data = json.loads(state_path.read_text(encoding="utf-8"))
+            except Exception:
+                pass
             
-    if "stats" not in data:
-        data["stats"] = {}
+        if "stats" not in data:
+            data["stats"] = {}
         
-    stats = data["stats"].get(tool_id, {
-        "runs_ok": 0,
-        "runs_failed": 0,
-        "last_run_at": None
-    })
+        stats = data["stats"].get(tool_id, {
+            "runs_ok": 0,
+            "runs_failed": 0,
+            "last_run_at": None
+        })
     
-    if success:
-        stats["runs_ok"] += 1
-    else:
-        stats["runs_failed"] += 1
+        if success:
+            stats["runs_ok"] += 1
+        else:
+            stats["runs_failed"] += 1
         
-    stats["last_run_at"] = datetime.now(timezone.utc).isoformat()
+        stats["last_run_at"] = datetime.now(timezone.utc).isoformat()
     
-    data["stats"][tool_id] = stats
+        data["stats"][tool_id] = stats
     
-    state_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        atomic_write_text(state_path, json.dumps(data, indent=2))
 
 
 def get_all_run_stats(path: Path) -> dict[str, dict[str, Any]]:
@@ -93,146 +103,118 @@ def write_default(
     registry_ref: str = DEFAULT_REF,
 ) -> None:
     """Write default mcp.yaml to path."""
-    path.write_text(default_yaml(registry_source, registry_ref), encoding="utf-8")
+    with file_lock(path):
+        atomic_write_text(path, default_yaml(registry_source, registry_ref))
 
 
 def read_config(path: Path) -> dict[str, Any]:
     """Read mcp.yaml configuration."""
-    return yaml.safe_load(path.read_text(encoding="utf-8"))
+    with file_lock(path, shared=True):
+        return load_yaml(path.read_text(encoding="utf-8"))
 
 
 def write_config(path: Path, config: dict[str, Any]) -> None:
     """Write configuration to mcp.yaml."""
-    path.write_text(
-        yaml.dump(config, default_flow_style=False, sort_keys=False),
-        encoding="utf-8",
-    )
+    with file_lock(path):
+        atomic_write_text(
+            path,
+            dump_yaml(config),
+        )
 
 
-def add_tool(path: Path, tool_id: str, ref: str | None = None) -> bool:
-    """Add a tool to the workspace configuration.
+# Parsed workspaces as path -> (stat key, Workspace); mcp.yaml is read again
+# only if it changes, so every command in a process shares one parse
+_resolved: dict[Path, tuple[tuple[int, int, int], Workspace]] = {}
 
-    Returns True if the tool was added, False if it already exists.
+
+def _stat_key(path: Path) -> tuple[int, int, int]:
+    st = path.stat()
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def load_workspace(path: Path) -> Workspace:
+    """Get the parsed workspace at ``path``, parsing mcp.yaml at most once.
+
+    The result is shared and read-only; use edit_workspace to change it.
+    Raises OSError if the file is missing and yaml.YAMLError if it does not
+    parse.
     """
-    config = read_config(path)
-    tools = config.get("tools", [])
+    key = _stat_key(path)
+    hit = _resolved.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    ws = Workspace(path, read_config(path))
+    _resolved[path] = (key, ws)
+    return ws
+
+
+@contextmanager
+def edit_workspace(path: Path) -> Iterator[Workspace]:
+    """Change a workspace in one transaction.
+
+    The workspace is parsed fresh under an exclusive lock. Every mutation
+    made in the block is written with a single write when it ends, and only
+    if something changed. If the block raises, nothing is written::
+
+        with edit_workspace(path) as ws:
+            ws.add_tool("file-compass")
+            ws.grant("file-compass", "network")
+    """
+    with file_lock(path):
+        ws = Workspace(path, read_config(path), editable=True)
+        yield ws
+        ws.editable = False
+        if ws.changed:
+            write_config(path, ws.config)
+            _resolved[path] = (_stat_key(path), ws)
 
-    # Check if tool already exists
-    for tool in tools:
-        if isinstance(tool, str) and tool == tool_id:
-            return False
-        if isinstance(tool, dict) and tool.get("id") == tool_id:
-            return False
 
-    # Add the tool
-    if ref:
-        tools.append({"id": tool_id, "ref": ref})
-    else:
-        tools.append(tool_id)
+def get_registry_config(path: Path) -> RegistryConfig | RegistrySet:
+    """Get the registry (or registries) a workspace uses.
 
-    config["tools"] = tools
-    write_config(path, config)
-    return True
+    See Workspace.registry. A missing or unreadable mcp.yaml gives the
+    default registry.
+    """
+    try:
+        return load_workspace(path).registry
+    except Exception:
+        return RegistryConfig()
 
 
-def remove_tool(path: Path, tool_id: str) -> bool:
-    """Remove a tool from the workspace configuration.
+def add_tool(path: Path, tool_id: str, ref: str | None = None) -> bool:
+    """Add a tool to the workspace configuration.
 
-    Returns True if the tool was removed, False if it wasn't found.
+    Returns True if the tool was added, False if it already exists.
     """
-    config = read_config(path)
-    tools = config.get("tools", [])
-    original_len = len(tools)
+    with edit_workspace(path) as ws:
+        return ws.add_tool(tool_id, ref)
 
-    # Filter out the tool
-    new_tools = []
-    for tool in tools:
-        if isinstance(tool, str) and tool == tool_id:
-            continue
-        if isinstance(tool, dict) and tool.get("id") == tool_id:
-            continue
-        new_tools.append(tool)
 
-    if len(new_tools) == original_len:
-        return False
+def remove_tool(path: Path, tool_id: str) -> bool:
+    """Remove a tool from the workspace configuration.
 
-    config["tools"] = new_tools
-    write_config(path, config)
-    return True
+    Returns True if the tool was removed, False if it wasn't found.
+    """
+    with edit_workspace(path) as ws:
+        return ws.remove_tool(tool_id)
 
 
 def grant_capability(path: Path, tool_id: str, capability: str) -> bool:
     """Grant a capability to a tool in the workspace configuration."""
-    config = read_config(path)
-    tools = config.get("tools", [])
-    
-    found = False
-    new_tools = []
-    
-    for tool in tools:
-        if isinstance(tool, str):
-            if tool == tool_id:
-                # Upgrade to dict
-                tool = {"id": tool, "grants": [capability]}
-                found = True
-            new_tools.append(tool)
-        elif isinstance(tool, dict):
-            if tool.get("id") == tool_id:
-                grants = tool.get("grants", [])
-                if capability not in grants:
-                    grants.append(capability)
-                tool["grants"] = grants
-                found = True
-            new_tools.append(tool)
-    
-    if not found:
-        return False
-        
-    config["tools"] = new_tools
-    write_config(path, config)
-    return True
+    with edit_workspace(path) as ws:
+        return ws.grant(tool_id, capability)
 
 
 def revoke_capability(path: Path, tool_id: str, capability: str) -> bool:
     """Revoke a capability from a tool in the workspace configuration."""
-    config = read_config(path)
-    tools = config.get("tools", [])
-    
-    found = False
-    new_tools = []
-    
-    for tool in tools:
-        if isinstance(tool, str):
-            if tool == tool_id:
-                found = True # Exists, but has no grants to revoke
-            new_tools.append(tool)
-        elif isinstance(tool, dict):
-            if tool.get("id") == tool_id:
-                grants = tool.get("grants", [])
-                if capability in grants:
-                    grants.remove(capability)
-                    found = True
-                tool["grants"] = grants
-            new_tools.append(tool)
-            
-    if not found:
-        return False
-        
-    config["tools"] = new_tools
-    write_config(path, config)
-    return True
+    with edit_workspace(path) as ws:
+        return ws.revoke(tool_id, capability)
 
 
 def get_grants(path: Path, tool_id: str) -> list[str]:
     """Get granted capabilities for a tool."""
     try:
-        config = read_config(path)
-        for tool in config.get("tools", []):
-            if isinstance(tool, str) and tool == tool_id:
-                return []
-            if isinstance(tool, dict) and tool.get("id") == tool_id:
-                return tool.get("grants", [])
-        return []
+        return load_workspace(path).grants(tool_id)
     except Exception:
         return []
 
@@ -242,7 +224,8 @@ def read_lock(path: Path) -> dict[str, Any]:
     lock_path = path.parent / MCP_LOCK_FILENAME
     if not lock_path.exists():
         return {"tools": {}}
-    return yaml.safe_load(lock_path.read_text(encoding="utf-8")) or {"tools": {}}
+    with file_lock(lock_path, shared=True):
+        return load_yaml(lock_path.read_text(encoding="utf-8")) or {"tools": {}}
 
 
 def write_lock_record(
@@ -253,19 +236,20 @@ def write_lock_record(
     """Update install record in mcp.lock.yaml."""
     lock_path = path.parent / MCP_LOCK_FILENAME
     
-    lock_data = {"tools": {}}
-    if lock_path.exists():
-        lock_data = yaml.safe_load(lock_path.read_text(encoding="utf-8")) or {"tools": {}}
+    with file_lock(lock_path):
+        lock_data = {"tools": {}}
+        if lock_path.exists():
+            lock_data = load_yaml(lock_path.read_text(encoding="utf-8")) or {"tools": {}}
         
-    lock_data["tools"][tool_id] = record
+        lock_data["tools"][tool_id] = record
     
-    # Sort keys for deterministic output
-    lock_data["tools"] = dict(sorted(lock_data["tools"].items()))
+        # Sort keys for deterministic output
+        lock_data["tools"] = dict(sorted(lock_data["tools"].items()))
     
-    lock_path.write_text(
-        yaml.dump(lock_data, default_flow_style=False, sort_keys=False),
-        encoding="utf-8",
-    )
+        atomic_write_text(
+            lock_path,
+            dump_yaml(lock_data),
+        )
 
 
 def get_ui_config(path: Path) -> dict[str, Any]:
@@ -275,7 +259,6 @@ def get_ui_config(path: Path) -> dict[str, Any]:
     if not path.exists():
         return {}
     try:
-        data = read_config(path)
-        return data.get("ui", {})
+        return load_workspace(path).ui
     except Exception:
         return {}
@@ -0,0 +1,153 @@
+"""Parsed workspace (mcp.yaml) model."""
+
+from __future__ import annotations
+
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Union
+
+from mcpt.registry.client import DEFAULT_REF, DEFAULT_REGISTRY_SOURCE, RegistryConfig, RegistrySet
+
+# A tool entry is a bare ID or a mapping with "id" (and "ref", "grants", ...)
+ToolEntry = Union[str, dict[str, Any]]
+
+
+def _entry_id(entry: Any) -> str | None:
+    if isinstance(entry, str):
+        return entry
+    if isinstance(entry, dict):
+        return entry.get("id")
+    return None
+
+
+class Workspace:
+    """A parsed mcp.yaml with an index of its tools by ID.
+
+    Reads never touch the file again. Mutations change the in-memory config
+    and mark the workspace ``changed``. They are only allowed on a workspace
+    opened with edit_workspace, which writes every change of the block at
+    once. Workspaces from load_workspace are shared and read-only.
+    """
+
+    def __init__(self, path: Path, config: Any, editable: bool = False) -> None:
+        self.path = path
+        self.config: dict[str, Any] = config if isinstance(config, dict) else {}
+        self.editable = editable
+        self.changed = False
+        self._index()
+
+    def _index(self) -> None:
+        tools = self.config.get("tools")
+        self.tools: list[ToolEntry] = tools if isinstance(tools, list) else []
+        # Positions of every entry per ID; the first one answers reads
+        self._positions: dict[str, list[int]] = {}
+        for pos, entry in enumerate(self.tools):
+            tool_id = _entry_id(entry)
+            if tool_id:
+                self._positions.setdefault(tool_id, []).append(pos)
+
+    def __contains__(self, tool_id: object) -> bool:
+        return tool_id in self._positions
+
+    @property
+    def tool_ids(self) -> list[str]:
+        """IDs of the tools in the workspace, in order, without duplicates."""
+        return list(self._positions)
+
+    def get(self, tool_id: str) -> ToolEntry | None:
+        """Get the entry of a tool, or None if it is not in the workspace."""
+        positions = self._positions.get(tool_id)
+        return self.tools[positions[0]] if positions else None
+
+    def grants(self, tool_id: str) -> list[str]:
+        """Get the capabilities granted to a tool."""
+        entry = self.get(tool_id)
+        return entry.get("grants", []) if isinstance(entry, dict) else []
+
+    @property
+    def ui(self) -> dict[str, Any]:
+        """The ``ui:`` settings."""
+        return self.config.get("ui", {})
+
+    @cached_property
+    def registry(self) -> RegistryConfig | RegistrySet:
+        """The registry (or registries) the workspace uses.
+
+        ``registries:`` lists several registries, highest priority first, and
+        takes precedence over the single ``registry:`` block. Missing fields
+        fall back to the defaults.
+        """
+        from mcpt.registry.federation import registry_set
+
+        entries = self.config.get("registries")
+        if not isinstance(entries, list) or not entries:
+            entries = [self.config.get("registry") or {}]
+
+        configs = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            configs.append(
+                RegistryConfig(
+                    source=str(entry.get("source") or DEFAULT_REGISTRY_SOURCE),
+                    ref=str(entry.get("ref") or DEFAULT_REF),
+                )
+            )
+        return registry_set(configs)
+
+    def _edit(self) -> None:
+        if not self.editable:
+            raise RuntimeError("Workspace is read-only; open it with edit_workspace()")
+        self.changed = True
+
+    def add_tool(self, tool_id: str, ref: str | None = None) -> bool:
+        """Add a tool. Returns False if it is already in the workspace."""
+        if tool_id in self:
+            return False
+        self._edit()
+        self.tools.append({"id": tool_id, "ref": ref} if ref else tool_id)
+        self.config["tools"] = self.tools
+        self._positions[tool_id] = [len(self.tools) - 1]
+        return True
+
+    def remove_tool(self, tool_id: str) -> bool:
+        """Remove every entry of a tool. Returns False if it was not found."""
+        if tool_id not in self:
+            return False
+        self._edit()
+        self.config["tools"] = [entry for entry in self.tools if _entry_id(entry) != tool_id]
+        self._index()
+        return True
+
+    def grant(self, tool_id: str, capability: str) -> bool:
+        """Grant a capability to a tool. Returns False if the tool is not found."""
+        positions = self._positions.get(tool_id)
+        if not positions:
+            return False
+        for pos in positions:
+            entry = self.tools[pos]
+            if isinstance(entry, str):
+                # Upgrade to dict
+                self._edit()
+                self.tools[pos] = {"id": entry, "grants": [capability]}
+            elif capability not in entry.get("grants", []):
+                self._edit()
+                entry["grants"] = [*entry.get("grants", []), capability]
+        return True
+
+    def revoke(self, tool_id: str, capability: str) -> bool:
+        """Revoke a capability from a tool.
+
+        Returns False if the tool is not found, or no entry of it (other than
+        a bare ID, which has no grants) held the capability.
+        """
+        found = False
+        for pos in self._positions.get(tool_id, []):
+            entry = self.tools[pos]
+            if isinstance(entry, str):
+                found = True
+            elif capability in entry.get("grants", []):
+                self._edit()
+                entry["grants"] = [c for c in entry["grants"] if c != capability]
+                found = True
+        return found
@@ -0,0 +1,67 @@
+"""YAML loading and dumping for mcp.yaml and mcp.lock.yaml.
+
+PyYAML built with libyaml ships C versions of the safe loader and dumper
+that are many times faster than the pure-Python ones on large lock files.
+They are used when available and when a probe document loads and dumps
+exactly as with the pure-Python classes; otherwise everything falls back
+to SafeLoader/SafeDumper. Either way the output is the same.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+# Covers the shapes mcp.yaml and the lock file use: nested maps, lists,
+# quoted and unquoted strings, numbers, booleans, nulls and timestamps-as-text
+_PROBE = """\
+registry:
+  source: https://github.com/mcp-tool-shop-org/mcp-tool-registry
+  ref: v0.3.0
+tools:
+- file-compass
+- id: "tool: quoted"
+  ref: v1.0.0
+  grants: [network, filesystem_write]
+lock:
+  tool-a: {version: 1.2, pinned: true, sha: null, installed: '2025-01-01T00:00:00+00:00'}
+  "7": [0, -1, 3.5e3, "é\\n"]
+"""
+
+
+@lru_cache(maxsize=None)
+def yaml_backend() -> tuple[type, type]:
+    """The (loader, dumper) classes to use: libyaml's if they check out."""
+    import yaml
+
+    pure = (yaml.SafeLoader, yaml.SafeDumper)
+    fast = (getattr(yaml, "CSafeLoader", None), getattr(yaml, "CSafeDumper", None))
+    if None in fast:
+        return pure
+    try:
+        expected = yaml.load(_PROBE, Loader=pure[0])
+        if yaml.load(_PROBE, Loader=fast[0]) != expected:
+            return pure
+        if _dump(expected, fast[1]) != _dump(expected, pure[1]):
+            return pure
+    except Exception:
+        return pure
+    return fast
+
+
+def _dump(data: Any, dumper: type) -> str:
+    import yaml
+
+    return yaml.dump(data, Dumper=dumper, default_flow_style=False, sort_keys=False)
+
+
+def load_yaml(text: str) -> Any:
+    """Parse a YAML document (safe subset)."""
+    import yaml
+
+    return yaml.load(text, Loader=yaml_backend()[0])
+
+
+def dump_yaml(data: Any) -> str:
+    """Serialize ``data`` as block-style YAML, keeping key order."""
+    return _dump(data, yaml_backend()[1])
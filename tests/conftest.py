@@ -14,6 +14,9 @@ def _disable_network(monkeypatch):
 
     class GuardedSocket(real_socket):
         def connect(self, address):
+            if self.family == getattr(socket, "AF_UNIX", None):
+                # Local IPC (the mcpt serve daemon) is not network access
+                return super().connect(address)
             raise RuntimeError(
                 f"Network access is disabled during tests. Attempted to connect to {address}. "
                 "Mock the registry client / httpx calls, or set MCPT_TEST_ALLOW_NETWORK=1 for a one-off."
@@ -26,3 +29,22 @@ def _disable_network(monkeypatch):
             )
 
     monkeypatch.setattr(socket, "socket", GuardedSocket)
+
+
+@pytest.fixture(autouse=True)
+def _isolate_registry_cache(monkeypatch, tmp_path):
+    """Point the registry cache at a temp dir and reset in-process registry state."""
+    from mcpt import daemon, fileio
+    from mcpt.registry import client
+
+    cache_root = tmp_path / "cache"
+    monkeypatch.setattr(client, "user_cache_dir", lambda *args, **kwargs: str(cache_root))
+    monkeypatch.setattr(fileio, "user_cache_dir", lambda *args, **kwargs: str(cache_root))
+    monkeypatch.setattr(daemon, "user_cache_dir", lambda *args, **kwargs: str(cache_root))
+    monkeypatch.delenv("MCPT_SOCKET", raising=False)
+    monkeypatch.delenv("MCPT_REGISTRY_MAX_AGE", raising=False)
+    # Stale caches must not start real background processes during tests
+    monkeypatch.setattr(client, "_spawn_revalidation", lambda cfg: None)
+    client.clear_registry_cache()
+    yield
+    client.clear_registry_cache()
@@ -67,6 +67,23 @@ class TestFuzzyMatchTools:
         results = fuzzy_match_tools("tool", limit=3)
         assert len(results) <= 3
 
+    @patch("mcpt.cli.get_registry")
+    def test_fuzzy_match_swallows_registry_errors(self, mock_get_registry):
+        """Test fuzzy_match_tools returns no suggestions if the registry fails."""
+        mock_get_registry.side_effect = RuntimeError("offline")
+        assert fuzzy_match_tools("file-compass") == []
+
+    @patch("mcpt.cli.get_registry")
+    @patch("mcpt.cli.get_tool")
+    def test_info_not_found_suggests(self, mock_get_tool, mock_get_registry):
+        """Test info suggests similar tools for an unknown ID."""
+        mock_get_tool.return_value = None
+        mock_get_registry.return_value = {"tools": [{"id": "file-compass", "name": "File Compass"}]}
+        result = runner.invoke(app, ["info", "file-compas"])
+        assert result.exit_code == 1
+        assert "Did you mean" in result.stdout
+        assert "file-compass" in result.stdout
+
     @patch("mcpt.cli.get_registry")
     def test_fuzzy_match_case_insensitive(self, mock_get_registry):
         """Test fuzzy_match_tools is case insensitive."""
@@ -82,7 +99,7 @@ class TestFuzzyMatchTools:
 class TestListCommand:
     """Test list command."""
 
-    @patch("mcpt.cli.get_registry")
+    @patch("mcpt.registry.client.get_registry")
     def test_list_basic(self, mock_get_registry):
         """Test list command basic output."""
         mock_get_registry.return_value = {
@@ -95,7 +112,7 @@ class TestListCommand:
         assert result.exit_code == 0
         assert "file-compass" in result.stdout or "File Compass" in result.stdout
 
-    @patch("mcpt.cli.get_registry")
+    @patch("mcpt.registry.client.get_registry")
     def test_list_json_output(self, mock_get_registry):
         """Test list command with JSON output."""
         mock_get_registry.return_value = {
@@ -107,7 +124,7 @@ class TestListCommand:
         assert result.exit_code == 0
         assert "file-compass" in result.stdout
 
-    @patch("mcpt.cli.get_registry")
+    @patch("mcpt.registry.client.get_registry")
     def test_list_with_refresh(self, mock_get_registry):
         """Test list command with --refresh flag."""
         mock_get_registry.return_value = {
@@ -118,7 +135,7 @@ class TestListCommand:
         result = runner.invoke(app, ["list", "--refresh"])
         assert result.exit_code == 0
 
-    @patch("mcpt.cli.get_registry")
+    @patch("mcpt.registry.client.get_registry")
     def test_list_handles_error(self, mock_get_registry):
         """Test list command handles registry fetch errors."""
         mock_get_registry.side_effect = Exception("Registry fetch failed")
@@ -188,6 +205,24 @@ class TestSearchCommand:
         assert result.exit_code == 0
 
 
+    @patch("mcpt.cli.search_tools")
+    def test_search_bm25(self, mock_search):
+        """Test --rank bm25 is passed through with the default result limit."""
+        mock_search.return_value = [{"id": "git-diff-review", "_score": 1.5, "_reasons": ["git in id"]}]
+        result = runner.invoke(app, ["search", "git diff", "--rank", "bm25", "--explain"])
+        assert result.exit_code == 0
+        kwargs = mock_search.call_args.kwargs
+        assert kwargs["rank"] == "bm25"
+        assert kwargs["limit"] == 20
+
+    @patch("mcpt.cli.search_tools")
+    def test_search_unknown_rank(self, mock_search):
+        """Test an unknown --rank value is rejected."""
+        result = runner.invoke(app, ["search", "git", "--rank", "magic"])
+        assert result.exit_code == 1
+        mock_search.assert_not_called()
+
+
 class TestInitCommand:
     """Test init command."""
 
@@ -293,3 +328,203 @@ class TestDoctorCommand:
         """Test doctor command runs."""
         result = runner.invoke(app, ["doctor"])
         assert result.exit_code == 0
+
+
+class TestWorkspaceRegistry:
+    """Test commands use the registry pinned in mcp.yaml."""
+
+    PINNED = {"tools": [{"id": "pinned-tool", "name": "Pinned Tool"}]}
+
+    @pytest.fixture
+    def workspace(self, tmp_path, monkeypatch):
+        from mcpt.registry import RegistryConfig, save_cached_registry
+        from mcpt.workspace import write_default
+
+        monkeypatch.chdir(tmp_path)
+        write_default(tmp_path / "mcp.yaml", "https://github.com/acme/registry", "v9")
+        cfg = RegistryConfig("https://github.com/acme/registry", "v9")
+        save_cached_registry(cfg, self.PINNED)
+        return cfg
+
+    def test_commands_read_pinned_cache(self, workspace):
+        """Test list, search and info answer from the pinned registry's cache."""
+        commands = (
+            ["list", "--json"],
+            ["search", "pinned", "--json"],
+            ["search", "pinned", "--plain"],
+            ["info", "pinned-tool", "--json"],
+            ["info", "pinned-tool"],
+        )
+        with patch("mcpt.registry.client.fetch_registry") as fetch:
+            for args in commands:
+                result = runner.invoke(app, args)
+                assert result.exit_code == 0, args
+                assert "pinned-tool" in result.stdout
+        fetch.assert_not_called()
+
+    def test_registry_status_uses_pin(self, workspace):
+        """Test registry reports the pinned source and ref."""
+        result = runner.invoke(app, ["registry"])
+        assert result.exit_code == 0
+        assert "https://github.com/acme/registry" in result.stdout
+        assert "Ref: v9" in result.stdout
+
+    def test_registry_status_freshness(self, workspace):
+        """Test registry reports when the cache was last checked."""
+        result = runner.invoke(app, ["registry"])
+        assert "Checked:" in result.stdout
+        assert "(fresh)" in result.stdout
+        result = runner.invoke(app, ["registry", "--json"])
+        assert '"stale": false' in result.stdout
+        assert '"max_age_seconds": 3600' in result.stdout
+
+    def test_info_parses_workspace_once(self, workspace, tmp_path):
+        """Test info reads the registry pin, grants and UI settings from one parse."""
+        from mcpt.workspace import config
+
+        with patch("mcpt.workspace.config.read_config", wraps=config.read_config) as read:
+            result = runner.invoke(app, ["info", "pinned-tool"])
+        assert result.exit_code == 0
+        assert read.call_count == 1
+
+    def test_grant_several_capabilities(self, workspace, tmp_path):
+        """Test grant and revoke take several capabilities."""
+        from mcpt.workspace import add_tool, get_grants
+
+        path = tmp_path / "mcp.yaml"
+        add_tool(path, "pinned-tool")
+        result = runner.invoke(app, ["grant", "pinned-tool", "network", "filesystem_write"])
+        assert result.exit_code == 0
+        assert get_grants(path, "pinned-tool") == ["network", "filesystem_write"]
+        result = runner.invoke(app, ["revoke", "pinned-tool", "network", "shell"])
+        assert "Revoked" in result.stdout
+        assert get_grants(path, "pinned-tool") == ["filesystem_write"]
+
+    def test_config_read_once(self, workspace, tmp_path):
+        """Test mcp.yaml is parsed once while unchanged."""
+        from mcpt.workspace import config, get_registry_config
+
+        path = tmp_path / "mcp.yaml"
+        config._resolved.pop(path, None)
+        with patch("mcpt.workspace.config.read_config", wraps=config.read_config) as read:
+            assert get_registry_config(path) == workspace
+            assert get_registry_config(path) == workspace
+        assert read.call_count == 1
+
+
+class TestCacheCommand:
+    """Test cache gc command."""
+
+    def test_cache_gc(self):
+        """Test cache gc runs and rejects a bad size."""
+        result = runner.invoke(app, ["cache", "gc", "--max-size", "1G"])
+        assert result.exit_code == 0
+        assert "Removed 0 unused objects" in result.stdout
+        result = runner.invoke(app, ["cache", "gc", "--max-size", "huge"])
+        assert result.exit_code == 1
+
+
+class TestRegistryBundle:
+    """Test registry export / import commands."""
+
+    def test_export_import(self, tmp_path, monkeypatch):
+        """Test a bundle exported by one cache imports into an empty one."""
+        import shutil
+        from mcpt.registry import RegistryConfig, clear_registry_cache, load_cached_registry, save_cached_registry
+        from mcpt.registry.client import cache_root
+
+        monkeypatch.chdir(tmp_path)
+        save_cached_registry(RegistryConfig(), {"tools": [{"id": "a"}]})
+        bundle = tmp_path / "offline.tar.gz"
+        result = runner.invoke(app, ["registry", "export", str(bundle)])
+        assert result.exit_code == 0
+        assert "Exported" in result.stdout
+
+        shutil.rmtree(cache_root())
+        clear_registry_cache()
+        result = runner.invoke(app, ["registry", "import", str(bundle)])
+        assert result.exit_code == 0
+        assert load_cached_registry(RegistryConfig()) == {"tools": [{"id": "a"}]}
+
+        result = runner.invoke(app, ["registry", "import", str(tmp_path / "missing.tar.gz")])
+        assert result.exit_code == 1
+
+
+class TestBulkWorkspaceEdits:
+    """Test add, remove and grant on several tools at once."""
+
+    TOOLS = {
+        "tools": [
+            {"id": "tool-a", "capabilities": ["network"]},
+            {"id": "tool-b", "capabilities": ["network", "filesystem_write"]},
+            {"id": "tool-c"},
+        ]
+    }
+
+    @pytest.fixture
+    def workspace(self, tmp_path, monkeypatch):
+        from mcpt.registry import RegistryConfig, save_cached_registry
+        from mcpt.registry.client import registry_cache_path
+        from mcpt.workspace import write_default
+
+        monkeypatch.chdir(tmp_path)
+        write_default(tmp_path / "mcp.yaml", "https://github.com/acme/registry", "v9")
+        cfg = RegistryConfig("https://github.com/acme/registry", "v9")
+        save_cached_registry(cfg, self.TOOLS)
+        dist = registry_cache_path(cfg).parent / "dist"
+        dist.mkdir(exist_ok=True)
+        (dist / "registry.index.json").write_text('{"bundles": {"core": ["tool-a", "tool-b"]}}', encoding="utf-8")
+        (dist / "featured.json").write_text(
+            '{"collections": [{"id": "starter", "name": "Starter", "tools": ["tool-c"]}]}', encoding="utf-8"
+        )
+        return tmp_path / "mcp.yaml"
+
+    def _tools(self, path):
+        from mcpt.workspace import load_workspace
+
+        return load_workspace(path).tool_ids
+
+    def test_add_several_writes_once(self, workspace, tmp_path):
+        """Test add takes IDs, a file, a bundle and a collection in one write."""
+        from mcpt.workspace import config
+
+        (tmp_path / "tools.txt").write_text("# team tools\ntool-c\n\ntool-a  # again\n", encoding="utf-8")
+        with patch("mcpt.workspace.config.write_config", wraps=config.write_config) as write:
+            result = runner.invoke(
+                app, ["add", "tool-a", "--from-file", "tools.txt", "--bundle", "core", "--collection", "starter"]
+            )
+        assert result.exit_code == 0, result.stdout
+        assert write.call_count == 1
+        assert self._tools(workspace) == ["tool-a", "tool-c", "tool-b"]
+
+    def test_add_unknown_writes_nothing(self, workspace):
+        """Test one unknown ID fails the whole add."""
+        result = runner.invoke(app, ["add", "tool-a", "missing-1", "missing-2"])
+        assert result.exit_code == 1
+        assert "missing-1, missing-2" in result.stdout
+        assert self._tools(workspace) == []
+        assert runner.invoke(app, ["add", "--bundle", "nope"]).exit_code == 1
+        assert runner.invoke(app, ["add", "tool-a", "tool-b", "--ref", "v1"]).exit_code == 1
+
+    def test_remove_several(self, workspace):
+        """Test remove takes several IDs."""
+        runner.invoke(app, ["add", "tool-a", "tool-b", "tool-c"])
+        result = runner.invoke(app, ["remove", "tool-a", "tool-c", "tool-x"])
+        assert result.exit_code == 0
+        assert "tool-x not found" in result.stdout
+        assert self._tools(workspace) == ["tool-b"]
+
+    def test_grant_all_required(self, workspace):
+        """Test grant --all-required grants what the registry lists for every tool."""
+        from mcpt.workspace import get_grants
+
+        runner.invoke(app, ["add", "--bundle", "core", "--collection", "starter"])
+        result = runner.invoke(app, ["grant", "tool-a", "--all-required"])
+        assert result.exit_code == 0
+        assert get_grants(workspace, "tool-a") == ["network"]
+        assert get_grants(workspace, "tool-b") == []
+        result = runner.invoke(app, ["grant", "--all-required"])
+        assert result.exit_code == 0
+        assert get_grants(workspace, "tool-b") == ["network", "filesystem_write"]
+        assert get_grants(workspace, "tool-c") == []
+        assert runner.invoke(app, ["grant", "tool-a", "shell", "--all-required"]).exit_code == 1
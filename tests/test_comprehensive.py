@@ -177,7 +177,7 @@ class TestOutputFormats:
 
     def test_list_default_format(self):
         """Test list command with default format."""
-        with patch("mcpt.cli.get_registry") as mock_registry:
+        with patch("mcpt.registry.client.get_registry") as mock_registry:
             mock_registry.return_value = {
                 "tools": [
                     {"id": "tool-1", "name": "Tool 1", "description": "First tool"},
@@ -189,7 +189,7 @@ class TestOutputFormats:
 
     def test_list_json_format(self):
         """Test list command with JSON output."""
-        with patch("mcpt.cli.get_registry") as mock_registry:
+        with patch("mcpt.registry.client.get_registry") as mock_registry:
             mock_registry.return_value = {
                 "tools": [
                     {"id": "tool-1", "name": "Tool 1"},
@@ -201,7 +201,7 @@ class TestOutputFormats:
 
     def test_list_with_refresh(self):
         """Test list command with force refresh."""
-        with patch("mcpt.cli.get_registry") as mock_registry:
+        with patch("mcpt.registry.client.get_registry") as mock_registry:
             mock_registry.return_value = {"tools": []}
             result = runner.invoke(app, ["list", "--refresh"])
             # Should have been called with force_refresh=True
@@ -285,7 +285,7 @@ class TestErrorHandling:
 
     def test_registry_fetch_error(self):
         """Test handling of registry fetch errors."""
-        with patch("mcpt.cli.get_registry") as mock_registry:
+        with patch("mcpt.registry.client.get_registry") as mock_registry:
             mock_registry.side_effect = Exception("Network error")
             result = runner.invoke(app, ["list"])
             # Should fail gracefully
@@ -367,7 +367,7 @@ class TestIntegration:
 
     def test_list_search_flow(self):
         """Test listing tools and then searching."""
-        with patch("mcpt.cli.get_registry") as mock_registry, \
+        with patch("mcpt.registry.client.get_registry") as mock_registry, \
              patch("mcpt.cli.search_tools") as mock_search:
             
             mock_registry.return_value = {
@@ -0,0 +1,105 @@
+"""Tests for the mcpt serve daemon."""
+
+import socket
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from mcpt import daemon
+from mcpt.registry import RegistryConfig, get_tool, list_tools, save_cached_registry, search_tools
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+TOOLS = [
+    {"id": "file-compass", "name": "File Compass", "tags": ["files"]},
+    {"id": "tool-scan", "name": "Tool Scan", "deprecated": True},
+]
+
+
+@pytest.fixture
+def server():
+    save_cached_registry(RegistryConfig(), {"tools": TOOLS})
+    srv = daemon.create_server()
+    thread = threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    thread.join()
+
+
+class TestDaemon:
+    """Test the JSON-RPC daemon and transparent client use."""
+
+    def test_ping(self, server):
+        """Test the daemon answers a ping."""
+        assert "pid" in daemon.call("ping")
+        assert daemon.enabled()
+
+    def test_lookups_go_through_daemon(self, server):
+        """Test get_tool and search_tools are answered by a running daemon."""
+        with patch("mcpt.daemon.handle_request", wraps=daemon.handle_request) as handled:
+            assert get_tool("file-compass") == TOOLS[0]
+            results = search_tools("compass")
+        assert handled.call_count == 2
+        assert [t["id"] for t in results] == ["file-compass"]
+
+    def test_results_match_local(self, server, monkeypatch):
+        """Test daemon answers equal local answers."""
+        remote = search_tools("tool", rank="bm25", limit=5)
+        monkeypatch.setenv("MCPT_NO_DAEMON", "1")
+        assert not daemon.enabled()
+        assert search_tools("tool", rank="bm25", limit=5) == remote
+
+    def test_list(self, server):
+        """Test the list method filters deprecated tools by default."""
+        assert [t["id"] for t in daemon.call("list")] == ["file-compass"]
+        assert len(daemon.call("list", {"include_deprecated": True})) == 2
+
+    def test_list_command_goes_through_daemon(self, server, tmp_path, monkeypatch):
+        """Test list_tools and mcpt list are answered by a running daemon."""
+        from typer.testing import CliRunner
+
+        from mcpt.cli import app
+
+        monkeypatch.chdir(tmp_path)
+        with patch("mcpt.daemon.handle_request", wraps=daemon.handle_request) as handled:
+            assert list_tools(tag="files") == [TOOLS[0]]
+            result = CliRunner().invoke(app, ["list", "--json"])
+        assert handled.call_count == 2
+        assert result.exit_code == 0
+        assert "file-compass" in result.stdout
+        assert "tool-scan" not in result.stdout
+
+    def test_reloads_when_cache_changes(self, server):
+        """Test the daemon picks up a refreshed cache."""
+        assert get_tool("new-tool") is None
+        save_cached_registry(RegistryConfig(), {"tools": TOOLS + [{"id": "new-tool"}]})
+        assert get_tool("new-tool") == {"id": "new-tool"}
+
+    def test_errors(self, server):
+        """Test unknown methods and failing requests raise DaemonError."""
+        with pytest.raises(daemon.DaemonError, match="Unknown method"):
+            daemon.call("nope")
+        with pytest.raises(daemon.DaemonError):
+            daemon.call("info", {})
+
+    def test_second_server_refused(self, server):
+        """Test a second daemon cannot take over a live socket."""
+        with pytest.raises(daemon.DaemonError, match="already running"):
+            daemon.create_server()
+
+    def test_stale_socket_falls_back(self):
+        """Test a leftover socket file from a dead daemon is ignored."""
+        save_cached_registry(RegistryConfig(), {"tools": TOOLS})
+        path = daemon.socket_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+        assert daemon.enabled()
+        assert get_tool("file-compass") == TOOLS[0]
+
+        srv = daemon.create_server()
+        srv.server_close()
+        assert not path.exists()
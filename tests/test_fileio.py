@@ -0,0 +1,129 @@
+"""Tests for atomic writes and cross-process file locks."""
+
+import multiprocessing
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from mcpt.fileio import LockTimeout, atomic_write_text, file_lock
+from mcpt.workspace import add_tool, read_config, write_default
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="fcntl locks are POSIX only")
+
+_fork = multiprocessing.get_context("fork") if os.name == "posix" else None
+
+
+def _hold_lock(path, shared, ready, release):
+    with file_lock(Path(path), shared=shared):
+        ready.set()
+        release.wait(10)
+
+
+def _add_tools(path, prefix, count):
+    for i in range(count):
+        add_tool(Path(path), f"{prefix}-{i}")
+
+
+class TestAtomicWrite:
+    """Test atomic_write_text."""
+
+    def test_replaces_content_and_keeps_mode(self, tmp_path):
+        """Test the file is replaced and its permissions preserved."""
+        target = tmp_path / "f.txt"
+        target.write_text("old", encoding="utf-8")
+        target.chmod(0o640)
+
+        atomic_write_text(target, "new")
+
+        assert target.read_text(encoding="utf-8") == "new"
+        assert target.stat().st_mode & 0o777 == 0o640
+        assert os.listdir(tmp_path) == ["f.txt"]
+
+
+class TestFileLock:
+    """Test shared/exclusive semantics of file_lock."""
+
+    def _hold_in_child(self, path, shared):
+        ready, release = _fork.Event(), _fork.Event()
+        proc = _fork.Process(target=_hold_lock, args=(str(path), shared, ready, release))
+        proc.start()
+        assert ready.wait(10)
+        return proc, release
+
+    def test_readers_do_not_block_each_other(self, tmp_path):
+        """Test a shared lock is granted while another process reads."""
+        proc, release = self._hold_in_child(tmp_path / "f", shared=True)
+        try:
+            with file_lock(tmp_path / "f", shared=True, timeout=1):
+                pass
+        finally:
+            release.set()
+            proc.join()
+
+    def test_writer_waits_for_reader(self, tmp_path):
+        """Test an exclusive lock times out while another process reads."""
+        proc, release = self._hold_in_child(tmp_path / "f", shared=True)
+        try:
+            start = time.monotonic()
+            with pytest.raises(LockTimeout):
+                with file_lock(tmp_path / "f", timeout=0.2):
+                    pass
+            assert time.monotonic() - start >= 0.2
+        finally:
+            release.set()
+            proc.join()
+
+    def test_reentrant_in_process(self, tmp_path):
+        """Test nested acquisitions in one process do not deadlock."""
+        with file_lock(tmp_path / "f", timeout=1):
+            with file_lock(tmp_path / "f", timeout=1):
+                with file_lock(tmp_path / "f", shared=True, timeout=1):
+                    pass
+
+    def test_threads_hold_their_own_locks(self, tmp_path):
+        """Test a thread's lock outlives another thread's release of the same path."""
+        import threading
+
+        f = tmp_path / "f"
+        b_holds, b_release = threading.Event(), threading.Event()
+        errors = []
+
+        def reader_b():
+            try:
+                with file_lock(f, shared=True, timeout=1):
+                    b_holds.set()
+                    b_release.wait(10)
+            except Exception as e:
+                errors.append(e)
+
+        with file_lock(f, shared=True, timeout=1):
+            thread = threading.Thread(target=reader_b)
+            thread.start()
+            assert b_holds.wait(10)
+        try:
+            # Thread B still holds its shared lock, so a writer in this thread waits
+            with pytest.raises(LockTimeout):
+                with file_lock(f, timeout=0.2):
+                    pass
+        finally:
+            b_release.set()
+            thread.join()
+        assert errors == []
+        with file_lock(f, timeout=1):
+            pass
+
+    def test_concurrent_workspace_updates_are_not_lost(self, tmp_path):
+        """Test parallel add_tool calls from several processes all land."""
+        path = tmp_path / "mcp.yaml"
+        write_default(path)
+
+        procs = [_fork.Process(target=_add_tools, args=(str(path), f"p{n}", 5)) for n in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join(30)
+            assert proc.exitcode == 0
+
+        assert len(read_config(path)["tools"]) == 20
@@ -136,3 +136,1398 @@ class TestCaching:
             save_cached_registry(cfg, test_data)
             loaded = load_cached_registry(cfg)
             assert loaded == test_data
+
+    def test_lock_timeout_is_not_corruption(self):
+        """Test a cache locked past the timeout is reported, not deleted as corrupt."""
+        from contextlib import contextmanager
+        from mcpt.fileio import LockTimeout
+        from mcpt.registry import clear_registry_cache
+        from mcpt.registry.client import registry_cache_path
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": []})
+        clear_registry_cache()
+
+        # Readers time out behind a writer; the self-healing path must not run
+        healing = []
+
+        @contextmanager
+        def busy(path, shared=False, timeout=None):
+            if not shared:
+                healing.append(path)
+            raise LockTimeout(f"Timed out waiting for lock on {path}")
+            yield
+
+        with patch("mcpt.registry.client.file_lock", busy):
+            with pytest.raises(LockTimeout):
+                load_cached_registry(cfg)
+        assert healing == []
+        assert registry_cache_path(cfg).exists()
+        assert load_cached_registry(cfg) == {"tools": []}
+
+
+class TestRegistryIndex:
+    """Test the indexed Registry model and its process-level sharing."""
+
+    def test_indexes(self):
+        """Test id, tag and bundle indexes are built from the raw data."""
+        from mcpt.registry import Registry
+
+        reg = Registry(
+            {"tools": [
+                {"id": "a", "tags": ["Git", "review"]},
+                {"id": "b", "tags": ["git"]},
+            ]},
+            {"bundles": {"core": ["a", "b"], "extra": ["b"]}},
+        )
+        assert reg.get("a")["id"] == "a"
+        assert reg.get("missing") is None
+        assert "b" in reg
+        assert reg.ids_with_tag("GIT") == ["a", "b"]
+        assert reg.ids_in_bundle("extra") == ["b"]
+        assert reg.ids_in_bundle("nope") is None
+        assert reg.bundles_for("b") == ["core", "extra"]
+        assert reg.has_bundles
+
+    def test_missing_bundle_index(self):
+        """Test a registry without registry.index.json has no bundles."""
+        from mcpt.registry import Registry
+
+        reg = Registry({"tools": [{"id": "a"}]})
+        assert not reg.has_bundles
+        assert reg.bundles_for("a") == []
+
+    @patch("mcpt.registry.client.fetch_registry")
+    def test_registry_loaded_once_per_process(self, mock_fetch):
+        """Test repeated lookups reuse the loaded registry."""
+        from mcpt.registry import load_registry
+
+        mock_fetch.return_value = {"tools": [{"id": "a"}, {"id": "b"}]}
+        assert get_tool("a")["id"] == "a"
+        assert get_tool("b")["id"] == "b"
+        assert load_registry() is load_registry()
+        assert mock_fetch.call_count == 1
+
+    @patch("mcpt.registry.client.fetch_registry")
+    def test_save_invalidates_index(self, mock_fetch):
+        """Test saving a new registry replaces the shared index."""
+        from mcpt.registry import load_registry
+
+        mock_fetch.return_value = {"tools": [{"id": "a"}]}
+        first = load_registry()
+        save_cached_registry(RegistryConfig(), {"tools": [{"id": "b"}]})
+        second = load_registry()
+        assert second is not first
+        assert "b" in second and "a" not in second
+
+
+class TestParsedFileCache:
+    """Test memoization of parsed cache files keyed on file stat."""
+
+    def test_unchanged_file_parsed_once(self):
+        """Test repeated loads of an unchanged cache reuse the parsed object."""
+        from mcpt.registry.client import clear_registry_cache, _parse_registry
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": [{"id": "a"}]})
+        clear_registry_cache()
+
+        with patch("mcpt.registry.client._parse_registry", wraps=_parse_registry) as parse:
+            first = load_cached_registry(cfg)
+            second = load_cached_registry(cfg)
+            assert get_registry(cfg) is first
+        assert first is second
+        assert parse.call_count == 1
+
+    def test_changed_file_is_reparsed(self):
+        """Test an external rewrite of the cache is picked up."""
+        import json
+        from mcpt.registry.client import registry_cache_path
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": [{"id": "a"}]})
+        assert get_tool("a", cfg) is not None
+
+        registry_cache_path(cfg).write_text(
+            json.dumps({"tools": [{"id": "b"}, {"id": "c"}]}), encoding="utf-8"
+        )
+        assert get_tool("a", cfg) is None
+        assert get_tool("b", cfg) is not None
+
+    def test_artifact_parsed_once(self):
+        """Test cached artifacts are memoized too."""
+        from mcpt.registry import load_cached_artifact
+        from mcpt.registry.client import registry_cache_path
+
+        cfg = RegistryConfig()
+        dist = registry_cache_path(cfg).parent / "dist"
+        dist.mkdir(parents=True)
+        (dist / "registry.index.json").write_text('{"bundles": {"core": ["a"]}}', encoding="utf-8")
+
+        first = load_cached_artifact(cfg, "registry.index.json")
+        assert first == {"bundles": {"core": ["a"]}}
+        assert load_cached_artifact(cfg, "registry.index.json") is first
+
+
+def _mock_client(handler):
+    """Build an _http_client replacement that serves requests from a handler."""
+    import httpx
+
+    return lambda: httpx.Client(transport=httpx.MockTransport(handler))
+
+
+class TestConditionalRefresh:
+    """Test ETag / Last-Modified revalidation of the registry cache."""
+
+    def test_not_modified_keeps_cache(self):
+        """Test a 304 response reuses the cache without rewriting or touching it."""
+        import os
+        import httpx
+        from mcpt.registry.client import registry_cache_path
+
+        seen = []
+
+        def handler(request):
+            if request.url.path.endswith("/registry.json"):
+                seen.append(dict(request.headers))
+                if request.headers.get("if-none-match") == '"v1"':
+                    return httpx.Response(304)
+                return httpx.Response(
+                    200,
+                    json={"tools": [{"id": "a"}]},
+                    headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2026 00:00:00 GMT"},
+                )
+            return httpx.Response(404)
+
+        cfg = RegistryConfig()
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            first = get_registry(cfg, force_refresh=True)
+            cache_file = registry_cache_path(cfg)
+            os.utime(cache_file, (0, 0))
+
+            inode = cache_file.stat().st_ino
+            second = get_registry(cfg, force_refresh=True)
+
+        assert second == first
+        # Not rewritten; the check is recorded in registry.checked instead
+        assert cache_file.stat().st_ino == inode
+        assert "if-none-match" not in seen[0]
+        assert seen[1]["if-none-match"] == '"v1"'
+        assert seen[1]["if-modified-since"] == "Wed, 01 Jan 2026 00:00:00 GMT"
+        assert cache_file.stat().st_mtime == 0
+        assert (cache_file.parent / "registry.checked").stat().st_mtime > 0
+
+    def test_changed_registry_is_downloaded(self):
+        """Test a 200 response replaces the cache and its validators."""
+        import httpx
+        from mcpt.registry.client import load_validators
+
+        version = {"n": 1}
+
+        def handler(request):
+            if request.url.path.endswith("/registry.json"):
+                n = version["n"]
+                return httpx.Response(200, json={"tools": [{"id": f"t{n}"}]}, headers={"ETag": f'"v{n}"'})
+            if request.url.path.endswith("/featured.json"):
+                return httpx.Response(200, json={"featured": []}, headers={"ETag": '"f"'})
+            return httpx.Response(404)
+
+        cfg = RegistryConfig()
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            get_registry(cfg, force_refresh=True)
+            version["n"] = 2
+            data = get_registry(cfg, force_refresh=True)
+
+        assert data["tools"][0]["id"] == "t2"
+        validators = load_validators(cfg)
+        assert validators["registry.json"] == {"etag": '"v2"'}
+        assert validators["dist/featured.json"] == {"etag": '"f"'}
+
+
+class TestConcurrentFetch:
+    """Test registry.json and dist artifacts are downloaded concurrently."""
+
+    def test_downloads_overlap(self):
+        """Test all six downloads are in flight at the same time."""
+        import threading
+        import httpx
+        from mcpt.registry import load_cached_artifact
+        from mcpt.registry.client import ARTIFACTS
+
+        barrier = threading.Barrier(len(ARTIFACTS) + 1, timeout=5)
+
+        def handler(request):
+            # Fails with BrokenBarrierError if requests are issued one by one
+            barrier.wait()
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(200, json={"tools": [{"id": "a"}]})
+            if request.url.path.endswith("/registry.index.json"):
+                return httpx.Response(200, json={"bundles": {"core": ["a"]}})
+            return httpx.Response(404)
+
+        cfg = RegistryConfig()
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            data = get_registry(cfg, force_refresh=True)
+
+        assert data == {"tools": [{"id": "a"}]}
+        assert load_cached_artifact(cfg, "registry.index.json") == {"bundles": {"core": ["a"]}}
+        assert load_cached_artifact(cfg, "featured.json") is None
+
+    def test_registry_failure_skips_artifacts(self):
+        """Test artifacts are not cached when registry.json fails."""
+        import httpx
+        from mcpt.registry import RegistryFetchError, load_cached_artifact
+
+        def handler(request):
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(500)
+            return httpx.Response(200, json={"bundles": {}})
+
+        cfg = RegistryConfig()
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            with pytest.raises(RegistryFetchError):
+                get_registry(cfg, force_refresh=True)
+
+        assert load_cached_artifact(cfg, "registry.index.json") is None
+
+
+class TestGenerationCommit:
+    """Test fetched files are committed to the cache as one unit."""
+
+    def test_fetch_writes_nothing_until_saved(self):
+        """Test fetch_registry stages artifacts and save commits them."""
+        import httpx
+        from mcpt.registry import fetch_registry, load_cached_artifact
+        from mcpt.registry.client import registry_cache_path
+
+        def handler(request):
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(200, json={"tools": [{"id": "a"}]})
+            if request.url.path.endswith("/featured.json"):
+                return httpx.Response(200, json={"featured": ["a"]})
+            return httpx.Response(404)
+
+        cfg = RegistryConfig()
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            data = fetch_registry(cfg)
+
+        assert not registry_cache_path(cfg).parent.exists()
+        save_cached_registry(cfg, data)
+        assert load_cached_registry(cfg) == data
+        assert load_cached_artifact(cfg, "featured.json") == {"featured": ["a"]}
+
+    def test_interrupted_save_keeps_previous_cache(self):
+        """Test a failed write leaves the old cache intact and no temp files."""
+        from mcpt.registry.client import registry_cache_path
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": [{"id": "old"}]})
+
+        with patch("mcpt.fileio.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                save_cached_registry(cfg, {"tools": [{"id": "new"}]})
+
+        from mcpt.registry import clear_registry_cache
+        clear_registry_cache()
+        assert load_cached_registry(cfg) == {"tools": [{"id": "old"}]}
+        assert not [p for p in registry_cache_path(cfg).parent.iterdir() if p.name.endswith(".tmp")]
+
+
+class TestStreamingDownload:
+    """Test registry.json is streamed to disk and committed as downloaded."""
+
+    BODY = b'{"tools":[{"id":"a"},{"id":"b"}]}'
+
+    def _downloads(self):
+        from mcpt.registry.client import cache_root
+
+        return list((cache_root() / "downloads").glob("*"))
+
+    def test_body_committed_verbatim(self):
+        """Test the cached file holds the downloaded bytes, not a re-serialization."""
+        import gzip
+        import httpx
+        from mcpt.registry.client import registry_cache_path
+
+        def handler(request):
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(200, content=iter([self.BODY[:10], self.BODY[10:]]))
+            return httpx.Response(404)
+
+        cfg = RegistryConfig()
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            data = get_registry(cfg, force_refresh=True)
+
+        assert [t["id"] for t in data["tools"]] == ["a", "b"]
+        assert gzip.decompress(registry_cache_path(cfg).read_bytes()) == self.BODY
+        assert self._downloads() == []
+
+    def test_failed_or_dropped_download_is_removed(self):
+        """Test no temp file is left by a broken stream or an unsaved fetch."""
+        import gc
+        import httpx
+        from mcpt.registry import fetch_registry
+        from mcpt.registry.client import _pending
+
+        def broken():
+            yield self.BODY[:10]
+            raise httpx.ReadError("connection reset")
+
+        def handler(request):
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(200, content=broken())
+            return httpx.Response(404)
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": [{"id": "cached"}]})
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            assert get_registry(cfg, force_refresh=True) == {"tools": [{"id": "cached"}]}
+        assert self._downloads() == []
+
+        def ok(request):
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(200, content=self.BODY)
+            return httpx.Response(404)
+
+        with patch("mcpt.registry.client._http_client", _mock_client(ok)):
+            fetch_registry(cfg)
+        assert len(self._downloads()) == 1
+        _pending.clear()
+        gc.collect()
+        assert self._downloads() == []
+
+
+class TestCompressedCache:
+    """Test compressed transfers and gzip-compressed cache files."""
+
+    def test_compressed_transfer_and_storage(self):
+        """Test gzip transfers are decoded and cache files are stored compressed."""
+        import gzip
+        import json
+        import httpx
+        from mcpt.registry import load_cached_artifact
+        from mcpt.registry.client import registry_cache_path
+
+        doc = {"tools": [{"id": f"tool-{i}", "description": "repetitive text " * 20} for i in range(50)]}
+        raw = json.dumps(doc).encode()
+        accept = []
+
+        def handler(request):
+            accept.append(request.headers.get("accept-encoding", ""))
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(200, content=gzip.compress(raw), headers={"Content-Encoding": "gzip"})
+            if request.url.path.endswith("/registry.llms.txt"):
+                return httpx.Response(200, text="# Tools\n" * 100)
+            return httpx.Response(404)
+
+        cfg = RegistryConfig()
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            assert get_registry(cfg, force_refresh=True) == doc
+
+        assert all("gzip" in a for a in accept)
+        p = registry_cache_path(cfg)
+        assert p.read_bytes()[:2] == b"\x1f\x8b"
+        assert p.stat().st_size < len(raw) / 5
+        assert p.name == "registry.json.gz"
+        llms = p.parent / "dist" / "registry.llms.txt.gz"
+        assert gzip.decompress(llms.read_bytes()) == b"# Tools\n" * 100
+
+        from mcpt.registry import clear_registry_cache
+        clear_registry_cache()
+        assert load_cached_registry(cfg) == doc
+        assert load_cached_artifact(cfg, "registry.llms.txt") == "# Tools\n" * 100
+
+    def test_plain_cache_files_still_read(self):
+        """Test caches written uncompressed by earlier versions load, and move to .gz names."""
+        import json
+        from mcpt.registry import load_cached_artifact
+        from mcpt.registry.client import registry_cache_path
+
+        cfg = RegistryConfig()
+        p = registry_cache_path(cfg)
+        legacy = p.with_name("registry.json")
+        (p.parent / "dist").mkdir(parents=True)
+        legacy.write_text(json.dumps({"tools": [{"id": "plain"}]}, indent=2), encoding="utf-8")
+        (p.parent / "dist" / "featured.json").write_text('{"featured": []}', encoding="utf-8")
+        assert get_registry_status(cfg).tool_count == 1
+        assert load_cached_registry(cfg) == {"tools": [{"id": "plain"}]}
+        assert load_cached_artifact(cfg, "featured.json") == {"featured": []}
+        assert p.read_bytes()[:2] == b"\x1f\x8b"
+        assert not legacy.exists()
+
+
+class TestCompactCache:
+    """Test the compact binary cache and single-tool lookups."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test records, IDs and metadata survive the compact format."""
+        from mcpt.registry.compact import CompactRegistry, write_compact
+
+        data = {
+            "schema_version": "1",
+            "tools": [
+                {"id": "zeta", "name": "Z", "tags": ["x"]},
+                {"id": "alpha", "name": "A"},
+                {"id": "alpha", "name": "duplicate"},
+                {"name": "no id"},
+            ],
+        }
+        path = tmp_path / "registry.bin"
+        write_compact(path, data, (123, 456))
+
+        compact = CompactRegistry(path)
+        assert compact.source_key == (123, 456)
+        assert len(compact) == 2
+        assert compact.tool_ids() == ["alpha", "zeta"]
+        assert compact.get("zeta") == {"id": "zeta", "name": "Z", "tags": ["x"]}
+        assert compact.get("alpha")["name"] == "A"
+        assert compact.get("missing") is None
+        assert "zeta" in compact
+        assert compact.meta() == {"schema_version": "1"}
+
+    def test_get_tool_skips_full_parse(self):
+        """Test get_tool decodes from the compact cache in a fresh process."""
+        from mcpt.registry import clear_registry_cache
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": [{"id": "a", "name": "A"}, {"id": "b"}]})
+        clear_registry_cache()
+
+        with patch("mcpt.registry.client._parse_registry") as parse:
+            assert get_tool("a", cfg) == {"id": "a", "name": "A"}
+            assert get_tool("zzz", cfg) is None
+        parse.assert_not_called()
+
+    def test_stale_compact_is_ignored_and_rebuilt(self):
+        """Test a compact cache that no longer matches registry.json is not used."""
+        import json
+        from mcpt.registry import clear_registry_cache
+        from mcpt.registry.client import load_compact_registry, registry_cache_path
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": [{"id": "a"}]})
+        registry_cache_path(cfg).write_text(json.dumps({"tools": [{"id": "b"}, {"id": "c"}]}), encoding="utf-8")
+        clear_registry_cache()
+
+        assert load_compact_registry(cfg) is None
+        assert get_tool("a", cfg) is None
+        assert get_tool("b", cfg) == {"id": "b"}
+        assert load_compact_registry(cfg).tool_ids() == ["b", "c"]
+
+    def test_truncated_compact_is_rejected(self, tmp_path):
+        """Test empty or truncated compact files are refused rather than misread."""
+        from mcpt.registry.compact import CompactRegistry, build_compact
+
+        blob = build_compact({"tools": [{"id": "a"}, {"id": "b"}]}, (1, 2))
+        path = tmp_path / "registry.bin"
+        for content in (b"", blob[:10], blob[:60]):
+            path.write_bytes(content)
+            with pytest.raises(ValueError):
+                CompactRegistry(path)
+
+    def test_rewrite_releases_previous_mapping(self):
+        """Test rewriting the compact cache closes this process's old mapping."""
+        from mcpt.registry.client import load_compact_registry
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": [{"id": "a"}]})
+        old = load_compact_registry(cfg)
+        assert old.get("a") == {"id": "a"}
+
+        save_cached_registry(cfg, {"tools": [{"id": "a"}, {"id": "b"}]})
+        with pytest.raises(ValueError):
+            old.get("a")
+        assert get_tool("b", cfg) == {"id": "b"}
+
+    def test_tool_bundles_without_registry(self):
+        """Test bundle lookup for one tool reads only the index artifact."""
+        from mcpt.registry import get_tool_bundles
+        from mcpt.registry.client import registry_cache_path
+
+        cfg = RegistryConfig()
+        dist = registry_cache_path(cfg).parent / "dist"
+        dist.mkdir(parents=True)
+        (dist / "registry.index.json").write_text('{"bundles": {"core": ["a"], "ops": ["a", "b"]}}', encoding="utf-8")
+
+        assert get_tool_bundles("a", cfg) == ["core", "ops"]
+        assert get_tool_bundles("c", cfg) == []
+
+    def test_bundle_membership_without_registry(self):
+        """Test the full bundle map is inverted from the index artifact alone."""
+        from mcpt.registry import get_bundle_membership
+        from mcpt.registry.client import registry_cache_path
+
+        cfg = RegistryConfig()
+        dist = registry_cache_path(cfg).parent / "dist"
+        dist.mkdir(parents=True)
+        (dist / "registry.index.json").write_text('{"bundles": {"core": ["a"], "ops": ["a", "b"]}}', encoding="utf-8")
+
+        def handler(request):
+            raise AssertionError(f"unexpected request for {request.url}")
+
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            assert get_bundle_membership(cfg) == {"a": ["core", "ops"], "b": ["ops"]}
+        assert not registry_cache_path(cfg).exists()
+
+
+class TestSearchIndex:
+    """Test the inverted search index behind search_tools."""
+
+    TOOLS = [
+        {"id": "file-compass", "name": "File Discovery", "description": "Find files fast", "tags": ["discovery", "FS"]},
+        {"id": "tool-compass", "name": "Tool Discovery", "description": "Find MCP tools", "tags": ["discovery"]},
+        {"id": "voice-soundboard", "name": "Voice Synthesis", "description": "Speak text aloud", "tags": ["audio"]},
+        {"id": "file-compass", "name": "Duplicate", "description": "second record"},
+        {"name": "No ID", "description": "anonymous compass"},
+        {"id": "Café-Tools", "name": "Café", "tags": ["Crème"]},
+        {"id": "x", "name": "x", "description": "", "tags": []},
+    ]
+
+    @staticmethod
+    def _linear(tools, query):
+        from mcpt.registry.client import calculate_match_score
+
+        results = []
+        for tool in tools:
+            score, reasons = calculate_match_score(tool, query.lower())
+            if score > 0:
+                results.append({**tool, "_score": score, "_reasons": reasons})
+        results.sort(key=lambda x: (-x.get("_score", 0), x.get("id", "")))
+        return results
+
+    @patch("mcpt.registry.client.get_registry")
+    def test_matches_linear_scoring(self, mock_get_registry):
+        """Test indexed search returns exactly what scoring every tool would."""
+        mock_get_registry.return_value = {"tools": self.TOOLS}
+        queries = [
+            "discovery", "DISCOVERY", "compass", "file", "f", "fi", "com", "x", "e",
+            "café", "crème", "find", "fs", "tool-compass", "no id", "zzz", "s a", "-",
+        ]
+        for query in queries:
+            assert search_tools(query) == self._linear(self.TOOLS, query), query
+
+    @patch("mcpt.registry.client.get_registry")
+    def test_filters_apply_to_candidates(self, mock_get_registry):
+        """Test tag filters still narrow indexed results."""
+        mock_get_registry.return_value = {"tools": self.TOOLS}
+        results = search_tools("s", tag="audio")
+        assert [t["id"] for t in results] == ["voice-soundboard"]
+
+    def test_persisted_index_is_reused(self):
+        """Test the index is written next to the cache and reused by later processes."""
+        from mcpt.registry import clear_registry_cache
+        from mcpt.registry.client import search_index_path
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": self.TOOLS})
+        first = search_tools("compass", cfg)
+        assert search_index_path(cfg).exists()
+
+        clear_registry_cache()
+        with patch("mcpt.registry.client.build_search_index") as build, \
+             patch("mcpt.registry.client.write_search_index") as write:
+            assert search_tools("compass", cfg) == first
+        build.assert_not_called()
+        write.assert_not_called()
+
+    def test_stale_index_is_rebuilt(self):
+        """Test a new registry generation does not reuse the old index."""
+        from mcpt.registry import clear_registry_cache
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": self.TOOLS})
+        assert search_tools("voice", cfg)
+
+        save_cached_registry(cfg, {"tools": [{"id": "voice-2", "name": "Voice"}]})
+        clear_registry_cache()
+        assert [t["id"] for t in search_tools("voice", cfg)] == ["voice-2"]
+
+
+class TestBM25Search:
+    """Test BM25 ranking in search_tools."""
+
+    TOOLS = [
+        {"id": "git-diff-review", "name": "Diff Review", "description": "Review git diffs before merge", "tags": ["git"]},
+        {"id": "git-log", "name": "Git Log", "description": "Browse git history", "tags": ["git"]},
+        {"id": "code-review", "name": "Code Review", "description": "Review pull requests", "tags": ["review"]},
+        {"id": "weather", "name": "Weather", "description": "Forecasts", "tags": []},
+    ]
+
+    @patch("mcpt.registry.client.get_registry")
+    def test_multi_word_query(self, mock_get_registry):
+        """Test a multi-word query ranks the tool matching every word first."""
+        mock_get_registry.return_value = {"tools": self.TOOLS}
+        results = search_tools("git diff review", rank="bm25")
+
+        assert results[0]["id"] == "git-diff-review"
+        assert {t["id"] for t in results} == {"git-diff-review", "git-log", "code-review"}
+        scores = [t["_score"] for t in results]
+        assert scores == sorted(scores, reverse=True)
+        assert "diff in id/name" in results[0]["_reasons"]
+
+    @patch("mcpt.registry.client.get_registry")
+    def test_limit_and_ids(self, mock_get_registry):
+        """Test top-k selection and ID restriction."""
+        mock_get_registry.return_value = {"tools": self.TOOLS}
+        full = search_tools("git review", rank="bm25")
+
+        assert search_tools("git review", rank="bm25", limit=2) == full[:2]
+        assert search_tools("git review", limit=1) == search_tools("git review")[:1]
+        limited = search_tools("git review", rank="bm25", ids=["code-review", "weather"])
+        assert [t["id"] for t in limited] == ["code-review"]
+
+    @patch("mcpt.registry.client.get_registry")
+    def test_unknown_rank(self, mock_get_registry):
+        """Test an unknown rank mode is rejected."""
+        mock_get_registry.return_value = {"tools": self.TOOLS}
+        with pytest.raises(ValueError):
+            search_tools("git", rank="magic")
+
+
+class TestSuggestTools:
+    """Test "did you mean" suggestions."""
+
+    @patch("mcpt.registry.client.get_registry")
+    def test_typo_suggests_intended_tool(self, mock_get_registry):
+        """Test a mistyped ID suggests the intended tool first."""
+        from mcpt.registry import suggest_tools
+
+        mock_get_registry.return_value = {
+            "tools": [
+                {"id": "file-compass", "name": "File Compass"},
+                {"id": "tool-scan", "name": "Tool Scan"},
+                {"id": "voice-soundboard", "name": "Soundboard"},
+            ]
+        }
+        assert suggest_tools("fle-compas")[0]["id"] == "file-compass"
+        assert suggest_tools("soundbord")[0]["id"] == "voice-soundboard"
+
+    @patch("mcpt.registry.client.get_registry")
+    def test_scores_only_a_shortlist(self, mock_get_registry):
+        """Test only the trigram shortlist is scored on a large registry."""
+        from difflib import SequenceMatcher
+        from mcpt.registry import suggest_tools
+        from mcpt.registry.client import SUGGEST_SHORTLIST
+
+        tools = [{"id": f"tool-{i:05d}", "name": f"Tool {i}"} for i in range(2000)]
+        tools.append({"id": "file-compass", "name": "File Compass"})
+        mock_get_registry.return_value = {"tools": tools}
+
+        with patch("difflib.SequenceMatcher", wraps=SequenceMatcher) as matcher:
+            results = suggest_tools("file-compas", limit=3)
+        assert results[0]["id"] == "file-compass"
+        assert matcher.call_count <= 2 * SUGGEST_SHORTLIST
+
+
+def _async_client(handler):
+    """Build an AsyncRegistryClient that serves requests from a handler."""
+    import httpx
+    from mcpt.registry import AsyncRegistryClient
+
+    return AsyncRegistryClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+class TestAsyncRegistryClient:
+    """Test the asyncio registry client."""
+
+    def test_shares_cache_with_sync_api(self):
+        """Test an async refresh is committed like get_registry's."""
+        import asyncio
+        import httpx
+        from mcpt.registry import load_cached_artifact
+        from mcpt.registry.client import load_validators
+
+        def handler(request):
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(200, json={"tools": [{"id": "a"}]}, headers={"ETag": '"v1"'})
+            if request.url.path.endswith("/featured.json"):
+                return httpx.Response(200, json={"featured": ["a"]})
+            return httpx.Response(404)
+
+        async def main():
+            async with _async_client(handler) as registry:
+                data = await registry.get_registry()
+                tool = await registry.get_tool("a")
+            return data, tool
+
+        cfg = RegistryConfig()
+        data, tool = asyncio.run(main())
+        assert data == {"tools": [{"id": "a"}]}
+        assert tool == {"id": "a"}
+        assert load_cached_registry(cfg) == data
+        assert load_cached_artifact(cfg, "featured.json") == {"featured": ["a"]}
+        assert load_validators(cfg)["registry.json"] == {"etag": '"v1"'}
+        assert get_tool("a") == {"id": "a"}
+
+    def test_concurrent_sources_and_refs(self):
+        """Test several configs are fetched concurrently and one refresh per config is shared."""
+        import asyncio
+        import httpx
+
+        refs = ["v1", "v2"]
+        started = []
+
+        async def handler(request):
+            if not request.url.path.endswith("/registry.json"):
+                return httpx.Response(404)
+            started.append(request.url.path)
+            # Only returns once every ref has been requested
+            while len(started) < len(refs):
+                await asyncio.sleep(0.01)
+            ref = request.url.path.split("/")[-2]
+            return httpx.Response(200, json={"tools": [{"id": ref}]})
+
+        async def main():
+            async with _async_client(handler) as registry:
+                cfgs = [RegistryConfig(ref=ref) for ref in refs]
+                return await asyncio.wait_for(registry.get_registries(cfgs + cfgs[:1]), 5)
+
+        results = asyncio.run(main())
+        assert [r["tools"][0]["id"] for r in results] == ["v1", "v2", "v1"]
+        assert len(started) == 2
+
+    def test_stale_cache_and_fetch_error(self):
+        """Test network failures fall back to the cache or raise RegistryFetchError."""
+        import asyncio
+        import httpx
+        from mcpt.registry import RegistryFetchError
+
+        def handler(request):
+            raise httpx.ConnectError("offline")
+
+        async def refresh(cfg):
+            async with _async_client(handler) as registry:
+                return await registry.get_registry(cfg, force_refresh=True)
+
+        with pytest.raises(RegistryFetchError) as exc:
+            asyncio.run(refresh(RegistryConfig(ref="v9")))
+        assert exc.value.cached_available is False
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": [{"id": "cached"}]})
+        assert asyncio.run(refresh(cfg)) == {"tools": [{"id": "cached"}]}
+
+
+class TestFederation:
+    """Test several registries merged into one view."""
+
+    MIRROR = RegistryConfig("https://github.com/acme/mirror", "main")
+    PUBLIC = RegistryConfig()
+
+    def _handler(self, downloads, tools):
+        import httpx
+
+        def handler(request):
+            path = request.url.path
+            if path.endswith("/registry.json"):
+                org = path.split("/")[1]
+                downloads.append(org)
+                etag = f'"{org}"'
+                if request.headers.get("if-none-match") == etag:
+                    return httpx.Response(304)
+                return httpx.Response(200, json={"tools": tools[org]}, headers={"ETag": etag})
+            if path.endswith("/registry.index.json"):
+                org = path.split("/")[1]
+                return httpx.Response(200, json={"bundles": {"core": [t["id"] for t in tools[org]]}})
+            return httpx.Response(404)
+
+        return handler
+
+    def test_merge_priority_and_bundles(self):
+        """Test the first registry wins on tool ID and bundles are unioned."""
+        from mcpt.registry import RegistrySet, get_tool, load_registry
+
+        tools = {
+            "acme": [{"id": "shared", "name": "Mirror"}, {"id": "internal"}],
+            "mcp-tool-shop-org": [{"id": "shared", "name": "Public"}, {"id": "public"}],
+        }
+        rset = RegistrySet((self.MIRROR, self.PUBLIC))
+        with patch("mcpt.registry.client._http_client", _mock_client(self._handler([], tools))):
+            reg = load_registry(rset, force_refresh=True)
+
+        assert [t["id"] for t in reg.tools] == ["shared", "internal", "public"]
+        assert reg.get("shared")["name"] == "Mirror"
+        assert reg.raw["origins"] == {"shared": 0, "internal": 0, "public": 1}
+        assert reg.ids_in_bundle("core") == ["shared", "internal", "public"]
+        assert get_tool("public", rset) == {"id": "public"}
+        assert [t["id"] for t in search_tools("internal", rset)] == ["internal"]
+        # Members are cached independently
+        assert load_cached_registry(self.MIRROR)["tools"] == tools["acme"]
+        assert load_cached_registry(self.PUBLIC)["tools"] == tools["mcp-tool-shop-org"]
+
+    def test_refresh_revalidates_each_member(self):
+        """Test refreshes are conditional per member and an unchanged merge is kept."""
+        from mcpt.registry import RegistrySet, get_registry
+        from mcpt.registry.client import registry_cache_path
+
+        tools = {"acme": [{"id": "a"}], "mcp-tool-shop-org": [{"id": "b"}]}
+        rset = RegistrySet((self.MIRROR, self.PUBLIC))
+        downloads = []
+        with patch("mcpt.registry.client._http_client", _mock_client(self._handler(downloads, tools))):
+            get_registry(rset, force_refresh=True)
+            inode = registry_cache_path(rset).stat().st_ino
+            data = get_registry(rset, force_refresh=True)
+
+        assert sorted(downloads) == ["acme", "acme", "mcp-tool-shop-org", "mcp-tool-shop-org"]
+        assert [t["id"] for t in data["tools"]] == ["a", "b"]
+        assert registry_cache_path(rset).stat().st_ino == inode
+
+    def test_unreachable_member_is_skipped(self):
+        """Test a member without cache is left out, and all failing raises."""
+        import httpx
+        from mcpt.registry import RegistryFetchError, RegistrySet, get_registry
+
+        def handler(request):
+            if request.url.path.startswith("/acme/"):
+                raise httpx.ConnectError("offline")
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(200, json={"tools": [{"id": "b"}]})
+            return httpx.Response(404)
+
+        rset = RegistrySet((self.MIRROR, self.PUBLIC))
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            data = get_registry(rset, force_refresh=True)
+        assert [t["id"] for t in data["tools"]] == ["b"]
+        assert [r["available"] for r in data["registries"]] == [False, True]
+
+        offline = RegistrySet((self.MIRROR, RegistryConfig("https://github.com/acme/other", "main")))
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            with pytest.raises(RegistryFetchError):
+                get_registry(offline, force_refresh=True)
+
+
+class TestDeltaUpdates:
+    """Test building a new ref from a cached ref plus changed tools."""
+
+    V1 = {"schema_version": "1", "tools": [{"id": f"t{i}", "name": f"Tool {i}"} for i in range(4)]}
+    V2 = {"schema_version": "2", "tools": V1["tools"][:3] + [{"id": "t3", "name": "Tool 3 v2"}]}
+
+    VALIDATORS = {"ETag": '"v2"', "Last-Modified": "Tue, 01 Sep 2026 00:00:00 GMT"}
+
+    def _handler(self, requests, manifest=None, record=None, conditional=None):
+        import httpx
+        from mcpt.registry.delta import build_manifest
+
+        manifest = build_manifest(self.V2) if manifest is None else manifest
+        record = self.V2["tools"][3] if record is None else record
+
+        def handler(request):
+            path = request.url.path
+            name = path.split("/v2/", 1)[-1]
+            requests.append(name if request.method == "GET" else f"{request.method} {name}")
+            if path.endswith("/v2/registry.json"):
+                if conditional is not None:
+                    conditional.append({
+                        k: request.headers.get(k) for k in ("if-none-match", "if-modified-since")
+                    })
+                if request.headers.get("if-none-match") == self.VALIDATORS["ETag"]:
+                    return httpx.Response(304)
+                if request.method == "HEAD":
+                    return httpx.Response(200, headers=self.VALIDATORS)
+                return httpx.Response(200, json=self.V2, headers=self.VALIDATORS)
+            if path.endswith("/v2/dist/registry.manifest.json") and manifest:
+                return httpx.Response(200, json=manifest)
+            if path.endswith("/v2/dist/tools/t3.json"):
+                return httpx.Response(200, json=record)
+            return httpx.Response(404)
+
+        return handler
+
+    def test_new_ref_fetches_only_changed_tools(self):
+        """Test only the manifest and the changed tool are downloaded."""
+        from mcpt.registry.client import load_validators
+
+        save_cached_registry(RegistryConfig(ref="v1"), self.V1)
+        requests = []
+        cfg = RegistryConfig(ref="v2")
+        with patch("mcpt.registry.client._http_client", _mock_client(self._handler(requests))):
+            data = get_registry(cfg)
+
+        assert data == self.V2
+        assert load_cached_registry(cfg) == self.V2
+        assert "registry.json" not in requests
+        assert "dist/tools/t3.json" in requests
+        assert [p for p in requests if p.startswith("dist/tools/")] == ["dist/tools/t3.json"]
+        assert load_validators(cfg)["registry.json"] == {
+            "etag": '"v2"', "last_modified": self.VALIDATORS["Last-Modified"],
+        }
+
+    def test_refresh_after_delta_is_conditional(self):
+        """Test the next refresh of a delta-built ref revalidates instead of downloading."""
+        save_cached_registry(RegistryConfig(ref="v1"), self.V1)
+        requests, conditional = [], []
+        cfg = RegistryConfig(ref="v2")
+        with patch("mcpt.registry.client._http_client", _mock_client(self._handler(requests, conditional=conditional))):
+            get_registry(cfg)
+            assert get_registry(cfg, force_refresh=True) == self.V2
+
+        assert conditional[-1] == {
+            "if-none-match": '"v2"', "if-modified-since": self.VALIDATORS["Last-Modified"],
+        }
+        assert requests.count("registry.json") == 1
+
+    def test_falls_back_to_full_download(self):
+        """Test a missing manifest or a bad record downloads registry.json."""
+        from mcpt.registry import clear_registry_cache
+        from mcpt.registry.client import registry_cache_path
+
+        save_cached_registry(RegistryConfig(ref="v1"), self.V1)
+        for kwargs in ({"manifest": {}}, {"record": {"id": "t3", "name": "tampered"}}):
+            cfg = RegistryConfig(ref="v2")
+            registry_cache_path(cfg).unlink(missing_ok=True)
+            clear_registry_cache()
+            requests = []
+            with patch("mcpt.registry.client._http_client", _mock_client(self._handler(requests, **kwargs))):
+                assert get_registry(cfg, force_refresh=True) == self.V2
+            assert "registry.json" in requests
+
+    def test_no_manifest_reads_no_bases(self):
+        """Test cached refs are only loaded once the registry publishes a manifest."""
+        from mcpt.registry import clear_registry_cache
+
+        save_cached_registry(RegistryConfig(ref="v1"), self.V1)
+        clear_registry_cache()
+        requests = []
+        with patch("mcpt.registry.client._load_delta_bases") as load_bases:
+            with patch("mcpt.registry.client._http_client", _mock_client(self._handler(requests, manifest={}))):
+                assert get_registry(RegistryConfig(ref="v2")) == self.V2
+        load_bases.assert_not_called()
+        assert "dist/registry.manifest.json" in requests
+
+    def test_async_client(self):
+        """Test the async client takes the same delta path."""
+        import asyncio
+
+        save_cached_registry(RegistryConfig(ref="v1"), self.V1)
+        requests = []
+
+        async def main():
+            async with _async_client(self._handler(requests)) as registry:
+                return await registry.get_registry(RegistryConfig(ref="v2"))
+
+        from mcpt.registry.client import load_validators
+
+        assert asyncio.run(main()) == self.V2
+        assert "registry.json" not in requests
+        assert load_validators(RegistryConfig(ref="v2"))["registry.json"]["etag"] == '"v2"'
+
+    def test_large_delta_is_not_worth_it(self):
+        """Test plan_delta declines when most tools changed."""
+        from mcpt.registry.delta import build_manifest, plan_delta
+
+        changed = {"tools": [{"id": t["id"], "name": "new"} for t in self.V1["tools"]]}
+        assert plan_delta(build_manifest(changed), [self.V1]) is None
+        known, missing = plan_delta(build_manifest(self.V2), [self.V1])
+        assert missing == ["t3"] and len(known) == 3
+
+    def test_delta_is_capped_in_tools(self):
+        """Test plan_delta declines above DELTA_MAX_TOOLS changed tools, whatever the share."""
+        from mcpt.registry.delta import DELTA_MAX_TOOLS, build_manifest, plan_delta
+
+        base = {"tools": [{"id": f"t{i}"} for i in range(4 * DELTA_MAX_TOOLS)]}
+
+        def changed(n):
+            return {"tools": [{"id": t["id"], "v": 2} for t in base["tools"][:n]] + base["tools"][n:]}
+
+        assert plan_delta(build_manifest(changed(DELTA_MAX_TOOLS + 1)), [base]) is None
+        _, missing = plan_delta(build_manifest(changed(DELTA_MAX_TOOLS)), [base])
+        assert len(missing) == DELTA_MAX_TOOLS
+
+    def test_async_tool_fetches_are_bounded(self):
+        """Test the async client fetches changed tools a few at a time."""
+        import asyncio
+        import httpx
+        from mcpt.registry.client import ARTIFACTS
+        from mcpt.registry.delta import DELTA_MAX_TOOLS, build_manifest
+
+        v1 = {"tools": [{"id": f"t{i}"} for i in range(4 * DELTA_MAX_TOOLS)]}
+        v2 = {"tools": [{"id": f"t{i}", "v": 2} for i in range(DELTA_MAX_TOOLS)] + v1["tools"][DELTA_MAX_TOOLS:]}
+        save_cached_registry(RegistryConfig(ref="v1"), v1)
+        active, peak = [0], [0]
+
+        async def handler(request):
+            path = request.url.path
+            if path.endswith("/dist/registry.manifest.json"):
+                return httpx.Response(200, json=build_manifest(v2))
+            if "/dist/tools/" in path:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.001)
+                active[0] -= 1
+                tool_id = path.rsplit("/", 1)[-1].removesuffix(".json")
+                return httpx.Response(200, json={"id": tool_id, "v": 2})
+            return httpx.Response(404)
+
+        async def main():
+            async with _async_client(handler) as registry:
+                return await registry.get_registry(RegistryConfig(ref="v2"))
+
+        assert asyncio.run(main()) == v2
+        assert 1 < peak[0] <= len(ARTIFACTS) + 1
+
+
+class TestObjectStore:
+    """Test cache files are deduplicated across refs and garbage collected."""
+
+    DOC = {"tools": [{"id": "a", "description": "x" * 2000}]}
+
+    def test_identical_refs_share_objects(self):
+        """Test two refs with the same registry.json share one object."""
+        import os
+        from mcpt.registry.client import cache_root, registry_cache_path
+        from mcpt.registry.store import object_path, read_store_manifest
+
+        v1, v2 = RegistryConfig(ref="v1"), RegistryConfig(ref="v2")
+        save_cached_registry(v1, self.DOC)
+        save_cached_registry(v2, self.DOC)
+
+        p1, p2 = registry_cache_path(v1), registry_cache_path(v2)
+        assert os.path.samefile(p1, p2)
+        digest = read_store_manifest(p1.parent)["registry.json.gz"]
+        assert read_store_manifest(p2.parent)["registry.json.gz"] == digest
+        assert os.path.samefile(object_path(cache_root(), digest), p1)
+        assert len(list((cache_root() / "objects").glob("*/*"))) == 1
+        assert load_cached_registry(v2) == self.DOC
+
+    def test_not_modified_keeps_shared_indexes(self):
+        """Test a 304 on one ref leaves the derived caches of refs sharing its object valid."""
+        import httpx
+        from mcpt.registry.client import load_compact_registry, load_search_index
+
+        def handler(request):
+            if request.url.path.endswith("/registry.json"):
+                if request.headers.get("if-none-match") == '"v1"':
+                    return httpx.Response(304)
+                return httpx.Response(200, json=self.DOC, headers={"ETag": '"v1"'})
+            return httpx.Response(404)
+
+        v1, v2 = RegistryConfig(ref="v1"), RegistryConfig(ref="v2")
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            get_registry(v1, force_refresh=True)
+            get_registry(v2, force_refresh=True)
+            search_tools("a", v2)
+            assert load_compact_registry(v2) is not None
+            assert load_search_index(v2) is not None
+            get_registry(v1, force_refresh=True)
+
+        assert load_compact_registry(v1) is not None
+        assert load_compact_registry(v2) is not None
+        assert load_search_index(v2) is not None
+
+    def test_gc_evicts_least_recently_used(self):
+        """Test gc drops unreferenced objects and evicts old refs over the cap."""
+        import os
+        from mcpt.registry import clear_registry_cache
+        from mcpt.registry.client import cache_root, registry_cache_path
+        from mcpt.registry.store import cache_size, collect_garbage, object_path, read_store_manifest
+
+        old, new = RegistryConfig(ref="old"), RegistryConfig(ref="new")
+        save_cached_registry(old, {"tools": [{"id": "old"}]})
+        save_cached_registry(new, self.DOC)
+        os.utime(registry_cache_path(old).parent / "store.json", (1, 1))
+        old_obj = object_path(cache_root(), read_store_manifest(registry_cache_path(old).parent)["registry.json.gz"])
+
+        # Replacing a ref's registry leaves its previous object unreferenced
+        save_cached_registry(new, {"tools": [{"id": "b"}]})
+        assert collect_garbage(cache_root()).removed_objects == 1
+
+        result = collect_garbage(cache_root(), max_size=cache_size(cache_root()) - 1)
+        assert result.removed_refs == [registry_cache_path(old).parent]
+        assert not old_obj.exists()
+        clear_registry_cache()
+        assert load_cached_registry(old) is None
+        assert load_cached_registry(new) == {"tools": [{"id": "b"}]}
+
+    def test_parse_size(self):
+        """Test human-readable size caps."""
+        from mcpt.registry.store import parse_size
+
+        assert parse_size("1048576") == 1 << 20
+        assert parse_size("500M") == 500 << 20
+        assert parse_size("2GiB") == 2 << 30
+        with pytest.raises(ValueError):
+            parse_size("lots")
+
+
+class TestFreshness:
+    """Test max-age freshness with stale-while-revalidate."""
+
+    def _age(self, cfg, seconds):
+        import os
+        import time
+        from mcpt.registry.client import registry_cache_path
+        from mcpt.registry.freshness import CHECKED_FILENAME
+
+        past = time.time() - seconds
+        os.utime(registry_cache_path(cfg).parent / CHECKED_FILENAME, (past, past))
+
+    def test_stale_cache_returned_and_revalidated_once(self, monkeypatch):
+        """Test a stale cache is served at once and one background refresh starts."""
+        spawned = []
+        monkeypatch.setattr("mcpt.registry.client._spawn_revalidation", spawned.append)
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": [{"id": "a"}]})
+        assert get_registry(cfg) == {"tools": [{"id": "a"}]}
+        assert spawned == []
+
+        self._age(cfg, 2 * 60 * 60)
+        assert get_registry(cfg) == {"tools": [{"id": "a"}]}
+        assert get_tool("a", cfg) == {"id": "a"}
+        # The claim keeps later commands from starting another refresh
+        assert spawned == [cfg]
+
+        status = get_registry_status(cfg)
+        assert status.stale and status.revalidating
+        assert status.max_age == 60 * 60
+
+    def test_migrated_legacy_cache_keeps_its_age(self, monkeypatch):
+        """Test a stale plain registry.json is still stale once moved to the compressed cache."""
+        import json
+        import os
+        import time
+        from mcpt.registry.client import registry_cache_path
+        from mcpt.registry.store import LEGACY_REGISTRY_FILENAME
+
+        spawned = []
+        monkeypatch.setattr("mcpt.registry.client._spawn_revalidation", spawned.append)
+        cfg = RegistryConfig()
+        legacy = registry_cache_path(cfg).with_name(LEGACY_REGISTRY_FILENAME)
+        legacy.parent.mkdir(parents=True)
+        legacy.write_text(json.dumps({"tools": [{"id": "a"}]}), encoding="utf-8")
+        past = time.time() - 2 * 60 * 60
+        os.utime(legacy, (past, past))
+
+        assert get_registry(cfg) == {"tools": [{"id": "a"}]}
+        assert not legacy.exists()
+        assert spawned == [cfg]
+        assert get_registry_status(cfg).stale
+
+    def test_max_age_setting(self, monkeypatch):
+        """Test MCPT_REGISTRY_MAX_AGE durations and "never"."""
+        from mcpt.registry.freshness import parse_duration
+
+        spawned = []
+        monkeypatch.setattr("mcpt.registry.client._spawn_revalidation", spawned.append)
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": []})
+        self._age(cfg, 2 * 60 * 60)
+
+        monkeypatch.setenv("MCPT_REGISTRY_MAX_AGE", "never")
+        get_registry(cfg)
+        assert spawned == []
+        assert get_registry_status(cfg).stale is False
+
+        monkeypatch.setenv("MCPT_REGISTRY_MAX_AGE", "1h")
+        get_registry(cfg)
+        assert spawned == [cfg]
+
+        assert parse_duration("90") == 90
+        assert parse_duration("30m") == 1800
+        assert parse_duration("1d") == 86400
+        with pytest.raises(ValueError):
+            parse_duration("soon")
+
+    def test_background_refresh(self):
+        """Test the background process refreshes the cache and releases its claim."""
+        import httpx
+        from mcpt.registry.client import _claim_if_stale, _target, registry_cache_path
+        from mcpt.registry.freshness import is_revalidating
+        from mcpt.registry.revalidate import revalidate
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": [{"id": "old"}]})
+        self._age(cfg, 2 * 60 * 60)
+        ref_dir = registry_cache_path(cfg).parent
+
+        def offline(request):
+            raise httpx.ConnectError("offline")
+
+        assert _claim_if_stale(cfg)
+        with patch("mcpt.registry.client._http_client", _mock_client(offline)):
+            assert revalidate(_target(cfg)) is False
+        # Left claimed, so the next commands do not retry right away
+        assert is_revalidating(ref_dir)
+
+        def handler(request):
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(200, json={"tools": [{"id": "new"}]})
+            return httpx.Response(404)
+
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            assert revalidate(_target(cfg)) is True
+        assert not is_revalidating(ref_dir)
+        assert load_cached_registry(cfg) == {"tools": [{"id": "new"}]}
+        assert get_registry_status(cfg).stale is False
+
+    def test_async_client_refreshes_in_background(self):
+        """Test the async client serves a stale cache and refreshes it in a task."""
+        import asyncio
+        import httpx
+
+        def handler(request):
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(200, json={"tools": [{"id": "new"}]})
+            return httpx.Response(404)
+
+        cfg = RegistryConfig()
+        save_cached_registry(cfg, {"tools": [{"id": "old"}]})
+        self._age(cfg, 2 * 60 * 60)
+
+        async def main():
+            async with _async_client(handler) as registry:
+                return await registry.get_registry(cfg)
+
+        assert asyncio.run(main()) == {"tools": [{"id": "old"}]}
+        assert load_cached_registry(cfg) == {"tools": [{"id": "new"}]}
+
+
+class TestOfflineBundle:
+    """Test exporting and importing the registry cache as one archive."""
+
+    DOC = {"tools": [{"id": "git-helper", "name": "Git Helper", "description": "diff and review"}]}
+
+    def _fetch(self, cfg):
+        import httpx
+
+        def handler(request):
+            if request.url.path.endswith("/registry.json"):
+                return httpx.Response(200, json=self.DOC, headers={"ETag": '"v1"'})
+            if request.url.path.endswith("/featured.json"):
+                return httpx.Response(200, json={"featured": ["git-helper"]})
+            return httpx.Response(404)
+
+        with patch("mcpt.registry.client._http_client", _mock_client(handler)):
+            get_registry(cfg, force_refresh=True)
+
+    def _wipe(self):
+        import shutil
+        from mcpt.registry import clear_registry_cache
+        from mcpt.registry.client import cache_root
+
+        shutil.rmtree(cache_root())
+        clear_registry_cache()
+
+    def test_round_trip_without_network(self, tmp_path):
+        """Test an imported bundle restores registry, artifacts and indexes."""
+        import tarfile
+        from mcpt.registry import export_bundle, import_bundle, load_cached_artifact
+        from mcpt.registry.client import load_compact_registry, load_search_index, load_validators
+
+        cfg = RegistryConfig()
+        self._fetch(cfg)
+        bundle = tmp_path / "registry.tar.gz"
+        assert export_bundle(cfg, bundle) == [cfg]
+        with tarfile.open(bundle) as tar:
+            names = tar.getnames()
+        assert names[0] == "mcpt-bundle.json"
+        assert names[-1] == "0/registry.json.gz"
+        assert {"0/dist/featured.json.gz", "0/registry.bin", "0/registry.search.idx"} <= set(names)
+
+        self._wipe()
+
+        def offline(request):
+            raise AssertionError("no network expected")
+
+        with patch("mcpt.registry.client._http_client", _mock_client(offline)):
+            assert import_bundle(bundle) == [cfg]
+            assert get_registry(cfg) == self.DOC
+            assert load_cached_artifact(cfg, "featured.json") == {"featured": ["git-helper"]}
+            # The prebuilt indexes are used, not rebuilt
+            assert load_compact_registry(cfg) is not None
+            assert load_search_index(cfg) is not None
+            assert search_tools("review", cfg)[0]["id"] == "git-helper"
+        assert load_validators(cfg)["registry.json"] == {"etag": '"v1"'}
+        assert get_registry_status(cfg).stale is False
+
+    def test_registry_set(self, tmp_path):
+        """Test a set is exported with its members and imported as a merged view."""
+        from mcpt.registry import RegistrySet, export_bundle, import_bundle, load_registry
+
+        mirror = RegistryConfig("https://github.com/acme/mirror", "main")
+        save_cached_registry(mirror, {"tools": [{"id": "internal"}]})
+        save_cached_registry(RegistryConfig(), self.DOC)
+        rset = RegistrySet((mirror, RegistryConfig()))
+        load_registry(rset)
+
+        bundle = tmp_path / "registry.tar.xz"
+        export_bundle(rset, bundle)
+        self._wipe()
+
+        assert import_bundle(bundle) == [mirror, RegistryConfig(), rset]
+        assert [t["id"] for t in load_registry(rset).tools] == ["internal", "git-helper"]
+        assert load_cached_registry(mirror) == {"tools": [{"id": "internal"}]}
+
+    def test_shared_objects_round_trip(self, tmp_path):
+        """Test members sharing store objects export as regular files and import."""
+        import tarfile
+        from mcpt.registry import RegistrySet, export_bundle, import_bundle, load_registry
+
+        a = RegistryConfig("https://github.com/acme/a", "main")
+        b = RegistryConfig("https://github.com/acme/b", "main")
+        save_cached_registry(a, self.DOC)
+        save_cached_registry(b, self.DOC)
+        rset = RegistrySet((a, b))
+        load_registry(rset)
+
+        bundle = tmp_path / "registry.tar.gz"
+        export_bundle(rset, bundle)
+        with tarfile.open(bundle) as tar:
+            assert all(m.isfile() for m in tar.getmembers())
+        self._wipe()
+
+        assert import_bundle(bundle) == [a, b, rset]
+        assert load_cached_registry(b) == self.DOC
+
+    def test_rejects_invalid_bundles(self, tmp_path):
+        """Test files that are not bundles, or carry unexpected paths, are refused."""
+        import io
+        import json
+        import tarfile
+        from mcpt.registry import import_bundle
+
+        junk = tmp_path / "junk.tar.gz"
+        junk.write_bytes(b"not an archive")
+        with pytest.raises(ValueError):
+            import_bundle(junk)
+
+        evil = tmp_path / "evil.tar.gz"
+        manifest = json.dumps({"version": 1, "registries": [{"ref": "v1", "path": "0"}]}).encode()
+        with tarfile.open(evil, "w:gz") as tar:
+            for name, data in (("mcpt-bundle.json", manifest), ("0/../../escape.json", b"{}")):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        with pytest.raises(ValueError, match="Unexpected file"):
+            import_bundle(evil)
+        assert not (tmp_path / "escape.json").exists()
+
+    @pytest.mark.parametrize(
+        "entry",
+        [
+            {"ref": "../../../escaped", "path": "0"},
+            {"ref": "/tmp/escaped", "path": "0"},
+            {"ref": "v1/../../x", "path": "0"},
+            {"source": 1, "ref": "v1", "path": "0"},
+            {"registries": [1], "path": "0"},
+            1,
+        ],
+    )
+    def test_rejects_unsafe_manifest(self, tmp_path, entry):
+        """Test a manifest with an escaping ref or malformed entry writes nothing."""
+        import io
+        import json
+        import tarfile
+        from mcpt.registry import import_bundle
+        from mcpt.registry.client import cache_root
+
+        evil = tmp_path / "evil.tar.gz"
+        manifest = json.dumps({"version": 1, "registries": [entry]}).encode()
+        with tarfile.open(evil, "w:gz") as tar:
+            for name, data in (("mcpt-bundle.json", manifest), ("0/registry.json.gz", b"{}")):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        with pytest.raises(ValueError):
+            import_bundle(evil)
+        assert not list(cache_root().rglob("registry.json"))
@@ -0,0 +1,80 @@
+"""Tests for CLI cold-start cost."""
+
+import json
+import os
+import subprocess
+import sys
+
+# Modules that only specific commands need; importing the CLI must not load them
+HEAVY_MODULES = ["httpx", "yaml", "difflib", "mcpt.runner", "mcpt.ui.render", "mcpt.ui.legend", "asyncio"]
+
+# Wall-clock budget (seconds) for `import mcpt.cli`; override on slow machines
+STARTUP_BUDGET = float(os.environ.get("MCPT_STARTUP_BUDGET", "1.0"))
+
+
+# Loads what typer and rich load on their own (click pulls in difflib, for
+# example), so the tests only see modules mcpt itself brings in
+_BASELINE = (
+    "import json, sys\n"
+    "import typer, rich.console\n"
+    "probe = typer.Typer()\n"
+    "@probe.callback(invoke_without_command=True)\n"
+    "def main(version: bool = typer.Option(False, '--version', is_eager=True)) -> None:\n"
+    "    pass\n"
+    "try:\n"
+    "    probe(['--version'])\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    "base = set(sys.modules)\n"
+)
+
+
+def _run(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def _heavy_loaded_by(code: str) -> list[str]:
+    """HEAVY_MODULES that ``code`` loads beyond what typer and rich load."""
+    return json.loads(
+        _run(
+            _BASELINE
+            + code
+            + f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules and m not in base]))"
+        )
+    )
+
+
+class TestStartup:
+    """Test that starting mcpt stays cheap."""
+
+    def test_heavy_modules_not_imported(self):
+        """Test importing the CLI does not load per-command dependencies."""
+        assert _heavy_loaded_by("import mcpt.cli\n") == []
+
+    def test_version_does_not_load_heavy_modules(self):
+        """Test `mcpt --version` runs without loading per-command dependencies."""
+        code = (
+            "from mcpt.cli import app\n"
+            "try:\n"
+            "    app(['--version'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+        )
+        assert _heavy_loaded_by(code) == []
+
+    def test_import_within_budget(self):
+        """Test the CLI imports within the startup budget (best of three runs)."""
+        code = (
+            "import time\n"
+            "start = time.perf_counter()\n"
+            "import mcpt.cli\n"
+            "print(time.perf_counter() - start)"
+        )
+        best = min(float(_run(code)) for _ in range(3))
+        assert best < STARTUP_BUDGET, f"import mcpt.cli took {best:.3f}s (budget {STARTUP_BUDGET}s)"
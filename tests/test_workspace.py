@@ -207,3 +207,145 @@ class TestRemoveTool:
         config = read_config(config_path)
         assert "tool-scan" in config["tools"]
         assert "file-compass" not in str(config["tools"])
+
+
+class TestRegistryConfig:
+    """Test reading the workspace registry configuration."""
+
+    def test_single_registry(self, tmp_path):
+        """Test the registry block selects one registry."""
+        from mcpt.registry import RegistryConfig
+        from mcpt.workspace import get_registry_config
+
+        path = tmp_path / MCP_YAML_FILENAME
+        write_default(path, "https://github.com/acme/registry", "main")
+        assert get_registry_config(path) == RegistryConfig("https://github.com/acme/registry", "main")
+        assert get_registry_config(tmp_path / "missing.yaml") == RegistryConfig()
+
+    def test_registries_list(self, tmp_path):
+        """Test a registries list becomes a priority-ordered RegistrySet."""
+        from mcpt.registry import RegistryConfig, RegistrySet
+        from mcpt.workspace import get_registry_config
+
+        path = tmp_path / MCP_YAML_FILENAME
+        write_config(path, {
+            "registry": {"source": "https://github.com/ignored/registry"},
+            "registries": [
+                {"source": "https://git.internal/mirror", "ref": "main"},
+                {"ref": "v0.3.0"},
+                {"source": "https://git.internal/mirror", "ref": "main"},
+            ],
+        })
+        assert get_registry_config(path) == RegistrySet((
+            RegistryConfig("https://git.internal/mirror", "main"),
+            RegistryConfig(ref="v0.3.0"),
+        ))
+
+
+class TestWorkspaceModel:
+    """Test the parsed workspace and batched edits."""
+
+    def test_parsed_once(self, tmp_path):
+        """Test grants, ui and registry lookups share one parse of mcp.yaml."""
+        from mcpt.workspace import config, get_grants, get_registry_config, get_ui_config, load_workspace
+
+        path = tmp_path / MCP_YAML_FILENAME
+        write_config(path, {"tools": [{"id": "a", "grants": ["network"]}, "b"], "ui": {"sigil": "ascii"}})
+        with patch("mcpt.workspace.config.read_config", wraps=config.read_config) as read:
+            assert get_grants(path, "a") == ["network"]
+            assert get_grants(path, "b") == []
+            assert get_ui_config(path) == {"sigil": "ascii"}
+            get_registry_config(path)
+            assert "a" in load_workspace(path) and "c" not in load_workspace(path)
+        assert read.call_count == 1
+
+    def test_batched_edit_writes_once(self, tmp_path):
+        """Test several mutations in one transaction produce one write."""
+        from mcpt.workspace import config, edit_workspace, load_workspace
+
+        path = tmp_path / MCP_YAML_FILENAME
+        write_default(path)
+        with patch("mcpt.workspace.config.write_config", wraps=config.write_config) as write:
+            with edit_workspace(path) as ws:
+                assert ws.add_tool("a")
+                assert ws.add_tool("b", ref="v1")
+                assert not ws.add_tool("a")
+                assert ws.grant("a", "network")
+                assert ws.grant("a", "filesystem_write")
+                assert ws.remove_tool("b")
+        assert write.call_count == 1
+        assert read_config(path)["tools"] == [{"id": "a", "grants": ["network", "filesystem_write"]}]
+        assert load_workspace(path).grants("a") == ["network", "filesystem_write"]
+
+    def test_failed_edit_writes_nothing(self, tmp_path):
+        """Test a transaction that raises, or changes nothing, leaves mcp.yaml alone."""
+        from mcpt.workspace import edit_workspace, load_workspace
+
+        path = tmp_path / MCP_YAML_FILENAME
+        write_config(path, {"tools": ["a"]})
+        before = path.read_bytes()
+        with pytest.raises(ValueError):
+            with edit_workspace(path) as ws:
+                ws.add_tool("b")
+                raise ValueError("abort")
+        with edit_workspace(path) as ws:
+            assert ws.revoke("a", "network")
+            assert not ws.revoke("missing", "network")
+        assert path.read_bytes() == before
+
+        with pytest.raises(RuntimeError):
+            load_workspace(path).add_tool("c")
+
+
+class TestYamlBackend:
+    """Test the libyaml fast path and its fallback."""
+
+    LOCK = {
+        "tools": {
+            f"tool-{i}": {"ref": "v1.0.0", "installed_at": "2025-01-01T00:00:00+00:00", "grants": ["network"]}
+            for i in range(50)
+        }
+    }
+
+    @pytest.fixture(autouse=True)
+    def fresh_backend(self):
+        from mcpt.workspace.yamlio import yaml_backend
+
+        yaml_backend.cache_clear()
+        yield
+        yaml_backend.cache_clear()
+
+    def test_uses_libyaml_when_available(self):
+        """Test the C loader and dumper are picked when PyYAML has them."""
+        from mcpt.workspace.yamlio import yaml_backend
+
+        if not yaml.__with_libyaml__:
+            pytest.skip("PyYAML built without libyaml")
+        assert yaml_backend() == (yaml.CSafeLoader, yaml.CSafeDumper)
+
+    def test_falls_back_without_libyaml(self, monkeypatch, tmp_path):
+        """Test the pure-Python classes are used without libyaml, with the same output."""
+        from mcpt.workspace import read_lock, write_lock_record
+        from mcpt.workspace.yamlio import dump_yaml, yaml_backend
+
+        fast = dump_yaml(self.LOCK)
+        yaml_backend.cache_clear()
+        monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+        assert yaml_backend() == (yaml.SafeLoader, yaml.SafeDumper)
+        assert dump_yaml(self.LOCK) == fast
+
+        path = tmp_path / MCP_YAML_FILENAME
+        write_lock_record(path, "tool-a", {"ref": "v1"})
+        assert read_lock(path) == {"tools": {"tool-a": {"ref": "v1"}}}
+
+    def test_falls_back_when_probe_differs(self, monkeypatch):
+        """Test a C loader that disagrees with the pure-Python one is not used."""
+        from mcpt.workspace.yamlio import yaml_backend
+
+        class BrokenLoader(yaml.SafeLoader):
+            def get_single_data(self):
+                return {}
+
+        monkeypatch.setattr(yaml, "CSafeLoader", BrokenLoader, raising=False)
+        monkeypatch.setattr(yaml, "CSafeDumper", yaml.SafeDumper, raising=False)
+        assert yaml_backend() == (yaml.SafeLoader, yaml.SafeDumper)